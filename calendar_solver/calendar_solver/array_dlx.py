@@ -0,0 +1,332 @@
+class ArrayDLX():
+    """ Dancing links exact cover solver that keeps the whole matrix in flat
+        integer buffers instead of a web of node objects.
+
+        Node n has its left, right, up and down links in L[n], R[n], U[n] and
+        D[n], its column in C[n] and its row in ROW[n]. The first nodes are
+        the column headers, followed by the root header, whose horizontal
+        ring links the primary columns that still have to be covered.
+        Secondary columns link only to themselves.
+
+        The search is Knuth's Algorithm X with the same column choice as
+        dlx.DLX (the primary column with the fewest rows), run as a loop over
+        an explicit stack of chosen nodes instead of recursive generators.
+        Every cover is undone on the way back, so after a search the matrix
+        is exactly as before and the same instance can be searched again,
+        e.g. with other rows forced by useRow or other columns excluded by
+        excludeColumns.
+
+        The buffers are plain lists: reading an item of an array("i") boxes
+        a new int for every node number past the small int cache, which
+        makes the search about three times slower than with lists, whose
+        items are already ints.
+
+        The public methods mirror dlx.DLX and BitboardDLX so CalenderSolver
+        can use any of them.
+    """
+
+    # These pertain to column types, same values as dlx.DLX.
+    # Primary columns must be covered.
+    # Secondary columns can be covered at most once.
+    PRIMARY = 0
+    SECONDARY = 1
+
+    def __init__(self, columns):
+        """ Initialize the problem.
+
+            :param columns: A list of (column name, PRIMARY/SECONDARY) pairs.
+        """
+        self.names = [name for name, _ in columns]
+        count = len(columns)
+        self.root = count
+
+        # headers link to themselves vertically and own no row
+        self.L = list(range(-1, count))
+        self.R = list(range(1, count + 2))
+        self.U = list(range(count + 1))
+        self.D = list(range(count + 1))
+        self.C = list(range(count + 1))
+        self.ROW = [-1] * (count + 1)
+        self.S = [0] * (count + 1)
+
+        # link the primary columns into the ring of the root
+        previous = self.root
+        primary = 0
+        for index, (_, column_type) in enumerate(columns):
+            if column_type == ArrayDLX.PRIMARY:
+                self.R[previous] = index
+                self.L[index] = previous
+                previous = index
+                primary += 1
+            else:
+                self.L[index] = self.R[index] = index
+        self.R[previous] = self.root
+        self.L[self.root] = previous
+
+        # a solution has at most one row per primary column
+        self._chosen = [0] * (primary + 1)
+
+        self.row_start = []
+        self.row_masks = []
+        self.row_names = []
+
+        self.covered = 0
+        self.partialsolution = []
+        self._excluded = []
+
+    def appendRow(self, row, rowName=None):
+        """ Append a row given as a list of column indices.
+
+            :param row: The column indices where the row has a 1.
+            :param rowName: An optional name of the row.
+            :return: The row identifier used in solutions.
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        identifier = len(self.row_start)
+        first = len(L)
+        mask = 0
+        for offset, index in enumerate(row):
+            node = first + offset
+            # append at the bottom of the column
+            U.append(U[index])
+            D.append(index)
+            D[U[index]] = node
+            U[index] = node
+            C.append(index)
+            S[index] += 1
+            self.ROW.append(identifier)
+            # and at the end of the row's ring
+            L.append(node - 1 if offset else node)
+            R.append(first)
+            if offset:
+                R[node - 1] = node
+                L[first] = node
+            mask |= 1 << index
+
+        self.row_start.append(first if row else -1)
+        self.row_masks.append(mask)
+        self.row_names.append(rowName)
+        return identifier
+
+    def getRowList(self, row):
+        """ Get a list of the column names corresponding to the row."""
+        names = []
+        node = self.row_start[row]
+        while node != -1:
+            names.append(self.names[self.C[node]])
+            node = self.R[node]
+            if node == self.row_start[row]:
+                break
+        return names
+
+    def getRowName(self, row):
+        """ Get the name the row was appended with."""
+        return self.row_names[row]
+
+    def _cover(self, column):
+        """ Unlink a column and every row crossing it.
+            INTERNAL USE ONLY.
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[column]] = R[column]
+        L[R[column]] = L[column]
+        i = D[column]
+        while i != column:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, column):
+        """ Undo _cover, in exactly the reverse order.
+            INTERNAL USE ONLY.
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[column]
+        while i != column:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[column]] = column
+        L[R[column]] = column
+
+    def useRow(self, row):
+        """ Force a row into every solution. Must be undone with unuseRow in
+            reverse order.
+        """
+        if self.row_masks[row] & self.covered:
+            raise ValueError("Row conflicts with the rows already in use.")
+        self.covered |= self.row_masks[row]
+        self.partialsolution.append(row)
+
+        first = self.row_start[row]
+        node = first
+        while node != -1:
+            self._cover(self.C[node])
+            node = self.R[node]
+            if node == first:
+                break
+
+    def unuseRow(self, row):
+        """ Undo the latest useRow call."""
+        assert self.partialsolution.pop() == row
+        self.covered &= ~self.row_masks[row]
+
+        first = self.row_start[row]
+        if first == -1:
+            return
+        node = self.L[first]
+        while True:
+            self._uncover(self.C[node])
+            if node == first:
+                break
+            node = self.L[node]
+
+    def excludeColumns(self, columns):
+        """ Remove columns and every row crossing them, e.g. the cells a date
+            keeps free. Must be undone with includeColumns before rows are
+            forced or appended.
+
+            :param columns: The column indices to remove.
+        """
+        for column in columns:
+            self._cover(column)
+            self.covered |= 1 << column
+        self._excluded.append(list(columns))
+
+    def includeColumns(self):
+        """ Undo the latest excludeColumns call."""
+        for column in reversed(self._excluded.pop()):
+            self._uncover(column)
+            self.covered &= ~(1 << column)
+
+    def solve(self, stats=None, pruner=None, cancel=None):
+        """ Yield every exact cover as a list of row identifiers.
+
+            :param stats: An optional SearchStats to record every node in.
+            :param pruner: An optional DeadRegionPruner to cut dead branches with.
+            :param cancel: An optional CancellationToken, the search ends
+                without an error once it says to stop, with the matrix
+                restored.
+        """
+        L, R, U, D, C, S, ROW = self.L, self.R, self.U, self.D, self.C, self.S, self.ROW
+        root = self.root
+        chosen = self._chosen
+        is_dead = pruner.is_dead if pruner is not None else None
+        row_masks = self.row_masks
+        prefix = list(self.partialsolution)
+        covered_stack = [self.covered]
+
+        # _cover and _uncover are inlined, they run for every node
+        def cover(column):
+            R[L[column]] = R[column]
+            L[R[column]] = L[column]
+            i = D[column]
+            while i != column:
+                j = R[i]
+                while j != i:
+                    U[D[j]] = U[j]
+                    D[U[j]] = D[j]
+                    S[C[j]] -= 1
+                    j = R[j]
+                i = D[i]
+
+        def uncover(column):
+            i = U[column]
+            while i != column:
+                j = L[i]
+                while j != i:
+                    S[C[j]] += 1
+                    U[D[j]] = j
+                    D[U[j]] = j
+                    j = L[j]
+                i = U[i]
+            R[L[column]] = column
+            L[R[column]] = column
+
+        def restore(depth):
+            # undo the rows chosen up to depth and the columns they branched on
+            for k in range(depth, -1, -1):
+                node = chosen[k]
+                j = L[node]
+                while j != node:
+                    uncover(C[j])
+                    j = L[j]
+                uncover(C[node])
+
+        if R[root] == root:
+            yield prefix
+            return
+
+        depth = 0
+        # node of the row to try next at the current depth, None to choose
+        # the column of a new level first
+        node = None
+        while True:
+            if node is None:
+                if cancel is not None and cancel.tick():
+                    restore(depth - 1)
+                    return
+                column = R[root]
+                smallest = S[column]
+                j = R[column]
+                while j != root and smallest:
+                    if S[j] < smallest:
+                        column = j
+                        smallest = S[j]
+                    j = R[j]
+                if stats is not None:
+                    stats.record_node(depth, smallest)
+                cover(column)
+                node = D[column]
+
+            column = C[node]
+            if node == column:
+                # every row of the column is tried, backtrack
+                uncover(column)
+                if not depth:
+                    return
+                depth -= 1
+                node = chosen[depth]
+                j = L[node]
+                while j != node:
+                    uncover(C[j])
+                    j = L[j]
+                if is_dead is not None:
+                    covered_stack.pop()
+                node = D[node]
+                continue
+
+            chosen[depth] = node
+            j = R[node]
+            while j != node:
+                cover(C[j])
+                j = R[j]
+
+            if R[root] == root:
+                try:
+                    yield prefix + [ROW[chosen[k]] for k in range(depth + 1)]
+                except GeneratorExit:
+                    # the caller stopped early, restore the matrix anyway
+                    restore(depth)
+                    raise
+            elif is_dead is None or not is_dead(covered_stack[-1] | row_masks[ROW[node]], row_masks[ROW[node]]):
+                if is_dead is not None:
+                    covered_stack.append(covered_stack[-1] | row_masks[ROW[node]])
+                depth += 1
+                node = None
+                continue
+
+            # a solution or a dead branch, undo the row and try the next one
+            j = L[node]
+            while j != node:
+                uncover(C[j])
+                j = L[j]
+            node = D[node]
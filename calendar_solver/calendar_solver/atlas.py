@@ -0,0 +1,261 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import dlx
+from calendar_solver.calendar_solver.bitboard import BitboardDLX
+from calendar_solver.calendar_solver.calendar_solver import (
+    CalenderGrid, get_placement_index)
+from calendar_solver.calendar_solver.solution_store import (
+    _piece_placements, encode_solution, id_width, index_fingerprint,
+    store_path, write_solution_store)
+from calendar_solver.calendar_solver.util import (DayOfWeek, Month,
+                                                  iter_hole_triples)
+from calendar_solver.calendar_solver.variant import load_variants
+
+CHECKPOINT_VERSION = 1
+
+# the three cells a date leaves free, one of each kind
+HOLE_KINDS = ("month", "day", "day_of_week")
+
+
+def hole_kind(label):
+    """
+    Classify the label of a board cell by the part of a date it shows.
+    :param label: A label of CalenderGrid.grid_values.
+    :return: One of HOLE_KINDS, or None for a cell no date leaves free.
+    """
+    if isinstance(label, int):
+        return "day"
+    if label in Month.__members__:
+        return "month"
+    if label in DayOfWeek.__members__:
+        return "day_of_week"
+    return None
+
+
+def build_atlas_problem(index, grid):
+    """
+    Build the exact cover problem of every date at once: cover every cell
+    with a piece, except for one month, one day and one weekday cell, which
+    are covered by a hole row instead.
+    :param index: The PlacementIndex of the board.
+    :param grid: The CalenderGrid of the board.
+    :return: A (columns, rows, holes) tuple. The first len(index) rows are
+        the placements of the index, every row after them is the hole of the
+        cell with the matching label in holes.
+    """
+    columns = [(f"cell_{i}_{j}", dlx.DLX.PRIMARY) for i, j in index.cells]
+    columns += [(f"piece_{name}", dlx.DLX.PRIMARY) for name in index.piece_names]
+    kind_column = {}
+    for kind in HOLE_KINDS:
+        kind_column[kind] = len(columns)
+        columns.append((f"hole_{kind}", dlx.DLX.PRIMARY))
+
+    rows = list(index.rows)
+    holes = []
+    for label, cell in grid.grid_values.items():
+        kind = hole_kind(label)
+        if kind is not None:
+            rows.append([index.cell_column[cell], kind_column[kind]])
+            holes.append(label)
+    return columns, rows, holes
+
+
+def search_order_key(index, placements):
+    """
+    Sort key that puts the solutions of a date in the order BitboardDLX
+    finds them, so ranks into an atlas are the ranks of BitboardDLX.unrank.
+    Its search always branches on the first free cell, and the placement
+    filling that cell is the one whose first cell it is, so the order only
+    depends on the placements sorted by their first cell.
+    :param index: The PlacementIndex of the board.
+    :param placements: The placement positions of a solution.
+    :return: A tuple of placement positions.
+    """
+    cells = len(index.cells)
+    return tuple(sorted(placements, key=lambda p: min(column for column in index.rows[p] if column < cells)))
+
+
+def _create_solver(columns, rows):
+    """ Load the atlas problem into a BitboardDLX, with the row labels as
+        row identifiers.
+        INTERNAL USE ONLY.
+    """
+    solver = BitboardDLX(columns)
+    for label, row in enumerate(rows):
+        solver.appendRow(row, label)
+    return solver
+
+
+# problem loaded once per worker process by _init_worker
+_worker_solver = None
+
+
+def _init_worker(variant):
+    """ Load the atlas problem into the solver of a worker process.
+        INTERNAL USE ONLY.
+    """
+    global _worker_solver
+    columns, rows, _ = build_atlas_problem(get_placement_index(variant=variant), CalenderGrid(variant))
+    _worker_solver = _create_solver(columns, rows)
+
+
+def _solve_subtree(task):
+    """ Enumerate the tilings of a single subtree in a worker process.
+        INTERNAL USE ONLY.
+
+        :param task: A (subtree number, forced row labels) pair.
+        :return: The subtree number and its tilings as sorted row labels.
+    """
+    subtree, prefix = task
+    solver = _worker_solver
+    for label in prefix:
+        solver.useRow(label)
+    solutions = [sorted(solution) for solution in solver.solve()]
+    for label in reversed(prefix):
+        solver.unuseRow(label)
+    return subtree, solutions
+
+
+def _checkpoint_line(subtree, solutions):
+    """ One line of the checkpoint file, the tilings of a finished subtree.
+        INTERNAL USE ONLY.
+    """
+    return json.dumps({"subtree": subtree, "solutions": solutions}, separators=(",", ":")) + "\n"
+
+
+def _load_checkpoint(path, header):
+    """ Read the subtrees an interrupted build finished.
+        INTERNAL USE ONLY.
+
+        :return: A dict of subtree number to tilings, empty if there is no
+            checkpoint of the same problem.
+    """
+    done = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            if json.loads(f.readline()) != header:
+                return {}
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # the build stopped while writing this line
+                    break
+                done[entry["subtree"]] = entry["solutions"]
+    except (OSError, ValueError):
+        return {}
+    return done
+
+
+def build_atlas(path: str = None, variant=None, workers: int = None, split_depth: int = 2,
+                checkpoint: str = None, progress=None):
+    """
+    Enumerate the tilings of every date in one search and write them to a
+    solution store, bucketed by the month, day and weekday cell they leave
+    free. Subtrees the dates have in common are only searched once.
+
+    Every finished subtree is appended to a checkpoint file, so an
+    interrupted build resumes where it stopped. The checkpoint is removed
+    once the store is written.
+    :param path: Where to write the store, defaults to store_path(variant).
+    :param variant: A Variant, or None for the built-in board.
+    :param workers: Number of worker processes, defaults to the CPU count.
+    :param split_depth: How many branching levels the search is split on,
+        every subtree is one unit of work and of checkpointing.
+    :param checkpoint: The checkpoint file, defaults to path + ".checkpoint".
+    :param progress: Optional function called with (done, total) subtrees,
+        once when starting and after every subtree.
+    :return: The number of solutions written.
+    """
+    path = path or store_path(variant)
+    checkpoint = checkpoint or f"{path}.checkpoint"
+    index = get_placement_index(variant=variant)
+    grid = CalenderGrid(variant)
+    columns, rows, holes = build_atlas_problem(index, grid)
+    # split like the search branches, on the first free cell, so the
+    # subtrees share everything a single search would
+    prefixes = _create_solver(columns, rows).split(split_depth)
+
+    header = {
+        "version": CHECKPOINT_VERSION,
+        "fingerprint": index_fingerprint(index).hex(),
+        "split_depth": split_depth,
+        "subtrees": len(prefixes),
+    }
+    # rewritten from what could be read, so a line cut off by the
+    # interruption is not continued by the next one
+    done = _load_checkpoint(checkpoint, header)
+    os.makedirs(os.path.dirname(os.path.abspath(checkpoint)), exist_ok=True)
+    tmp_path = f"{checkpoint}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(header) + "\n")
+        for subtree, solutions in done.items():
+            f.write(_checkpoint_line(subtree, solutions))
+    os.replace(tmp_path, checkpoint)
+    if progress is not None:
+        progress(len(done), len(prefixes))
+
+    tasks = [(subtree, prefix) for subtree, prefix in enumerate(prefixes) if subtree not in done]
+    if tasks:
+        with open(checkpoint, "a", encoding="utf-8") as f, \
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(variant,)) as executor:
+            for subtree, solutions in executor.map(_solve_subtree, tasks):
+                f.write(_checkpoint_line(subtree, solutions))
+                f.flush()
+                done[subtree] = solutions
+                if progress is not None:
+                    progress(len(done), len(prefixes))
+
+    # bucket the tilings by their free cells, dropping dates that do not exist
+    buckets = {
+        triple: [] for triple in iter_hole_triples()
+        if {triple[0].name, triple[1], triple[2].name} <= grid.grid_values.keys()
+    }
+    placement_count = len(index)
+    for solutions in done.values():
+        for solution in solutions:
+            free = {hole_kind(holes[row - placement_count]): holes[row - placement_count]
+                    for row in solution[len(solution) - len(HOLE_KINDS):]}
+            triple = (Month[free["month"]], free["day"], DayOfWeek[free["day_of_week"]])
+            if triple in buckets:
+                buckets[triple].append(solution[:len(solution) - len(HOLE_KINDS)])
+
+    local_ids, _ = _piece_placements(index)
+    width = id_width(index)
+
+    def results():
+        for triple, solutions in buckets.items():
+            encoded = bytearray()
+            for placements in sorted(solutions, key=lambda solution: search_order_key(index, solution)):
+                ids = [0] * len(index.piece_names)
+                for placement in placements:
+                    position, local_id = local_ids[placement]
+                    ids[position] = local_id
+                encoded += encode_solution(ids, width)
+            yield triple, len(solutions), bytes(encoded)
+
+    total = write_solution_store(path, index, results())
+    os.remove(checkpoint)
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Store every solution of every date from a single search.")
+    parser.add_argument("--variant", default=None, help="Name of a bundled variant, defaults to the built-in board.")
+    parser.add_argument("--output", default=None, help="Where to write the store.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--split-depth", type=int, default=2, help="Branching levels to split the search on.")
+    args = parser.parse_args()
+
+    variant = load_variants()[args.variant] if args.variant else None
+    output = args.output or store_path(variant)
+    count = build_atlas(
+        output, variant, args.workers, args.split_depth,
+        progress=lambda done, total: print(f"\r{done}/{total}", end="", file=sys.stderr, flush=True),
+    )
+    print(file=sys.stderr)
+    print(f"Wrote {count} solutions to {output}")
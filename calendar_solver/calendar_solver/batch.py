@@ -0,0 +1,115 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import timedelta
+
+from calendar_solver.calendar_solver.calendar_solver import (
+    CalenderSolver, get_placement_index)
+from calendar_solver.calendar_solver.snapshot import load_snapshot
+from calendar_solver.calendar_solver.util import get_hole_triple
+
+# upper bound on the number of dates of a single batch
+MAX_BATCH_DATES = 3660
+
+
+def expand_dates(start_date=None, end_date=None, dates=()):
+    """
+    Expand a batch request into the list of dates to solve.
+    :param start_date: First date of an inclusive range, or None.
+    :param end_date: Last date of an inclusive range, or None.
+    :param dates: Additional individual dates.
+    :return: The range followed by the individual dates.
+    """
+    expanded = []
+    if start_date is not None or end_date is not None:
+        if start_date is None or end_date is None:
+            raise ValueError("A date range needs both a start and an end date.")
+        if end_date < start_date:
+            raise ValueError("The end date is before the start date.")
+        days = (end_date - start_date).days + 1
+        if days > MAX_BATCH_DATES:
+            raise ValueError(f"A batch can contain at most {MAX_BATCH_DATES} dates.")
+        expanded.extend(start_date + timedelta(days=offset) for offset in range(days))
+
+    expanded.extend(dates)
+    if len(expanded) > MAX_BATCH_DATES:
+        raise ValueError(f"A batch can contain at most {MAX_BATCH_DATES} dates.")
+    return expanded
+
+
+def _init_worker():
+    """ Load the placement index from the startup snapshot, or build it, once
+        per worker process.
+        INTERNAL USE ONLY.
+    """
+    if load_snapshot() is None:
+        get_placement_index()
+
+
+def create_executor(workers: int = None) -> ProcessPoolExecutor:
+    """
+    Create a process pool for solve_dates whose workers set up the board and
+    placements once, when they start.
+    :param workers: Number of worker processes, defaults to the CPU count.
+    :return: The ProcessPoolExecutor.
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+
+def solve_first_solution(triple, engine: str = "bitboard", variant=None):
+    """
+    Solve a single hole triple.
+    :param triple: A (month, day, day_of_week) tuple.
+    :param engine: The exact cover engine to use.
+    :param variant: An optional Variant to solve instead of the built-in board.
+    :return: The first solution, formatted like solve_exact_cover.
+    """
+    month, day, day_of_week = triple
+    solver = CalenderSolver(2024, month, day, day_of_week, engine=engine, variant=variant)
+    solution, _ = solver.solve_exact_cover(first_solution_only=True)
+    return solution
+
+
+def solve_dates(dates, executor=None, solution_table=None, engine: str = "bitboard", variant=None):
+    """
+    Solve many dates, each distinct hole triple only once.
+
+    Triples found in the solution table are answered directly, the others
+    are submitted to the executor together so distinct dates are solved
+    concurrently. Solutions are yielded in the order of the dates as soon as
+    they are ready.
+
+    :param dates: The datetime.date objects to solve.
+    :param executor: A concurrent.futures executor, or None to solve in the
+        calling thread.
+    :param solution_table: An optional SolutionTable to look triples up in.
+    :param engine: The exact cover engine to use.
+    :param variant: An optional Variant to solve instead of the built-in
+        board. The solution table only holds the built-in board, so it is
+        not used for variants.
+    :return: A generator of (date, solution) pairs.
+    """
+    if variant is not None:
+        solution_table = None
+    triples = [get_hole_triple(date) for date in dates]
+
+    results = {}
+    for triple in dict.fromkeys(triples):
+        solution = solution_table.lookup(*triple) if solution_table is not None else None
+        if solution is not None:
+            results[triple] = solution
+        elif executor is not None:
+            results[triple] = executor.submit(solve_first_solution, triple, engine, variant)
+
+    try:
+        for date, triple in zip(dates, triples):
+            if triple not in results:
+                results[triple] = solve_first_solution(triple, engine, variant)
+            solution = results[triple]
+            if isinstance(solution, Future):
+                solution = results[triple] = solution.result()
+            yield date, solution
+    finally:
+        # the batch was abandoned, e.g. the client went away, so do not
+        # leave the remaining dates queued on the shared executor
+        for solution in results.values():
+            if isinstance(solution, Future):
+                solution.cancel()
@@ -0,0 +1,262 @@
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+from calendar_solver.calendar_solver.calendar_solver import (
+    CalenderGrid, CalenderSolver, create_tetrominos, get_placement_index)
+from calendar_solver.calendar_solver.engines import ENGINES
+from calendar_solver.calendar_solver.placement_index import PlacementIndex
+from calendar_solver.calendar_solver.solution_table import table_key
+from calendar_solver.calendar_solver.util import iter_hole_triples
+
+BENCHMARK_VERSION = 1
+
+# stages timed for every triple, in the order they run when serving a request
+STAGES = [
+    "grid_init",
+    "build_dlx_columns",
+    "build_dlx_rows",
+    "solver_construction",
+    "first_solution",
+    "full_enumeration",
+    "format_solution",
+    "build_placement",
+    "build_placement_compact",
+]
+
+
+def _timed(fn, *args):
+    """ Run a function once.
+        INTERNAL USE ONLY.
+
+        :return: A (seconds, result) pair.
+    """
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def benchmark_triple(month, day, day_of_week, engine="dlx", stages=STAGES, prune=False):
+    """
+    Time every stage of solving one hole triple separately.
+    :param engine: The exact cover engine to use.
+    :param stages: The stages to time, the others are skipped.
+    :param prune: Search with dead region pruning.
+    :return: A dict of stage name to seconds, plus the solution count when
+        the full enumeration ran.
+    """
+    # imported here so the solver package does not need grpc to be installed
+    from calendar_solver.server.grpc_server import build_placement
+
+    timings = {}
+    solver = CalenderSolver(2024, month, day, day_of_week, engine=engine, prune=prune)
+
+    if "grid_init" in stages:
+        timings["grid_init"], _ = _timed(CalenderGrid)
+    if "build_dlx_columns" in stages:
+        timings["build_dlx_columns"], _ = _timed(
+            solver._build_dlx_columns, solver.calender_grid, solver.empty_cells, solver.tetrominos.keys()
+        )
+    if "build_dlx_rows" in stages:
+        # time the filtering itself, not a hit of the per triple cache
+        solver.placement_index.available.cache_clear()
+        solver.placement_index.available_positions.cache_clear()
+        timings["build_dlx_rows"], _ = _timed(solver._build_dlx_rows, solver.placement_index, solver.empty_cells)
+
+    if "full_enumeration" in stages:
+        timings["full_enumeration"], solutions = _timed(lambda: list(solver._search(solver._create_solver())))
+        timings["solutions"] = len(solutions)
+
+    # the later stages need a solver and its first solution, so these two
+    # always run and are only left out of the result
+    timings["solver_construction"], exact_cover = _timed(solver._create_solver)
+    timings["first_solution"], solution = _timed(next, solver._search(exact_cover), None)
+
+    if solution is not None:
+        timings["format_solution"], formatted = _timed(solver._format_solution, exact_cover, solution)
+        if "build_placement" in stages:
+            timings["build_placement"], _ = _timed(build_placement, formatted)
+        if "build_placement_compact" in stages:
+            timings["build_placement_compact"], _ = _timed(build_placement, formatted, True)
+
+    return {key: value for key, value in timings.items() if key in stages or key == "solutions"}
+
+
+class SquareGrid():
+    """ A size x size board without cutouts, to time the placement index on
+        boards larger than the calendar.
+    """
+    def __init__(self, size: int):
+        self.rows = size
+        self.cols = size
+        self.grid = [[0] * size for _ in range(size)]
+
+
+def benchmark_placements(sizes=(8, 16, 32, 64), flips=True, repeat=3):
+    """
+    Time building the placement index with and without numpy on square boards.
+    :param sizes: The board sizes to time.
+    :param flips: Also place the mirror images of the pieces.
+    :param repeat: Keep the fastest of this many builds.
+    :return: A list of dicts with the size, the placement count and the
+        seconds of both builds.
+    """
+    tetrominos = create_tetrominos()
+    results = []
+    for size in sizes:
+        grid = SquareGrid(size)
+        result = {"size": size}
+        for key, vectorized in (("python", False), ("vectorized", True)):
+            seconds, index = min(
+                (_timed(PlacementIndex, grid, tetrominos, flips, vectorized) for _ in range(repeat)),
+                key=lambda timed: timed[0]
+            )
+            result[key] = seconds
+        result["placements"] = len(index)
+        results.append(result)
+    return results
+
+
+def summarize(values):
+    """
+    Summarize a list of timings.
+    :return: A dict with the count, min, median, p99, mean and max.
+    """
+    values = sorted(values)
+    count = len(values)
+    if count == 0:
+        return {"count": 0}
+
+    middle = count // 2
+    median = values[middle] if count % 2 else (values[middle - 1] + values[middle]) / 2
+    return {
+        "count": count,
+        "min": values[0],
+        "median": median,
+        "p99": values[min(count - 1, math.ceil(0.99 * count) - 1)],
+        "mean": sum(values) / count,
+        "max": values[-1],
+    }
+
+
+def run_benchmark(engine="dlx", stages=STAGES, limit=None, stride=1, progress=None, prune=False):
+    """
+    Benchmark every (month, day, weekday) triple.
+    :param engine: The exact cover engine to use.
+    :param stages: The stages to time.
+    :param limit: Stop after this many triples.
+    :param stride: Only benchmark every stride-th triple.
+    :param progress: Optional function called with (done, total) after every triple.
+    :param prune: Search with dead region pruning.
+    :return: A JSON serializable dict with the summary per stage and the raw
+        timings per triple.
+    """
+    triples = list(iter_hole_triples())[::stride][:limit]
+
+    # one-off costs, paid once per process
+    placement_index_seconds, _ = _timed(PlacementIndex, CalenderGrid(), create_tetrominos())
+    get_placement_index()
+
+    results = []
+    for done, (month, day, day_of_week) in enumerate(triples, 1):
+        timings = benchmark_triple(month, day, day_of_week, engine, stages, prune)
+        results.append({"triple": table_key(month, day, day_of_week), **timings})
+        if progress is not None:
+            progress(done, len(triples))
+
+    return {
+        "version": BENCHMARK_VERSION,
+        "engine": engine,
+        "prune": prune,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "triples": len(results),
+        "placement_index": placement_index_seconds,
+        "stages": {
+            stage: summarize([result[stage] for result in results if stage in result])
+            for stage in stages
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, statistic="median"):
+    """
+    Compare two benchmark results stage by stage.
+    :param current: A result of run_benchmark.
+    :param baseline: An earlier result of run_benchmark.
+    :param statistic: The summary value to compare.
+    :return: A dict of stage name to current / baseline ratio.
+    """
+    ratios = {}
+    for stage, summary in current["stages"].items():
+        previous = baseline.get("stages", {}).get(stage, {})
+        if summary.get(statistic) and previous.get(statistic):
+            ratios[stage] = summary[statistic] / previous[statistic]
+    return ratios
+
+
+def format_report(result):
+    """
+    Format the summary of a benchmark result as a table in milliseconds.
+    :return: The report as a string.
+    """
+    lines = [
+        f"engine={result['engine']} prune={result.get('prune', False)} triples={result['triples']} "
+        f"placement_index={result['placement_index'] * 1000:.1f}ms",
+        f"{'stage':<24}{'min':>12}{'median':>12}{'p99':>12}",
+    ]
+    for stage, summary in result["stages"].items():
+        if summary["count"]:
+            lines.append(
+                f"{stage:<24}{summary['min'] * 1000:>12.3f}{summary['median'] * 1000:>12.3f}"
+                f"{summary['p99'] * 1000:>12.3f}"
+            )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time every solving stage for every hole triple.")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="dlx", help="Exact cover engine.")
+    parser.add_argument("--output", default=None, help="Where to write the JSON results.")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON results to compare medians with.")
+    parser.add_argument("--limit", type=int, default=None, help="Only benchmark this many triples.")
+    parser.add_argument("--stride", type=int, default=1, help="Only benchmark every n-th triple.")
+    parser.add_argument("--skip", action="append", default=[], choices=STAGES, help="Stage to skip, repeatable.")
+    parser.add_argument("--prune", action="store_true", help="Search with dead region pruning.")
+    parser.add_argument("--placements", type=int, nargs="+", default=None, metavar="SIZE",
+                        help="Only time building the placement index on square boards of these sizes.")
+    args = parser.parse_args()
+
+    if args.placements:
+        print(f"{'size':>6}{'placements':>12}{'python':>12}{'vectorized':>12}")
+        for result in benchmark_placements(args.placements):
+            print(f"{result['size']:>6}{result['placements']:>12}"
+                  f"{result['python'] * 1000:>10.1f}ms{result['vectorized'] * 1000:>10.1f}ms")
+        sys.exit()
+
+    result = run_benchmark(
+        args.engine,
+        [stage for stage in STAGES if stage not in args.skip],
+        args.limit,
+        args.stride,
+        progress=lambda done, total: print(f"\r{done}/{total}", end="", file=sys.stderr, flush=True),
+        prune=args.prune,
+    )
+    print(file=sys.stderr)
+    print(format_report(result))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for stage, ratio in compare(result, baseline).items():
+            print(f"{stage:<24}{ratio:>8.2f}x baseline median")
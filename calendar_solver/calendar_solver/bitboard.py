@@ -0,0 +1,249 @@
+class BitboardDLX():
+    """ Exact cover solver that keeps every row as an integer bitmask.
+
+        The calendar board has fewer than 64 cells, so a whole partial cover
+        fits in one int and checking a placement is a single AND. The search
+        always branches on the lowest uncovered primary column, which for the
+        row-major cell columns is the first free cell of the board.
+
+        Rows with identical masks describe the same placement (e.g. a
+        symmetric piece rotated by 180 degrees), so only the first of them is
+        searched and every distinct cover is reported once.
+
+        The public methods mirror dlx.DLX so CalenderSolver can use either.
+    """
+
+    # These pertain to column types, same values as dlx.DLX.
+    # Primary columns must be covered.
+    # Secondary columns can be covered at most once.
+    PRIMARY = 0
+    SECONDARY = 1
+
+    def __init__(self, columns):
+        """ Initialize the problem.
+
+            :param columns: A list of (column name, PRIMARY/SECONDARY) pairs.
+        """
+        self.names = [name for name, _ in columns]
+        self.primary_mask = 0
+        for index, (_, column_type) in enumerate(columns):
+            if column_type == BitboardDLX.PRIMARY:
+                self.primary_mask |= 1 << index
+
+        self.row_masks = []
+        self.row_columns = []
+        # (mask, row) pairs keyed by their lowest primary column, the only
+        # rows that can fill that column once every column before it is covered
+        self.rows_by_column = [[] for _ in columns]
+        self.seen_masks = set()
+        self.row_names = []
+
+        self.covered = 0
+        self.partialsolution = []
+
+        # number of ways to finish a partial cover, keyed by the covered mask
+        self._counts = {}
+
+    def appendRow(self, row, rowName=None):
+        """ Append a row given as a list of column indices.
+
+            :param row: The column indices where the row has a 1.
+            :param rowName: An optional name of the row.
+            :return: The row identifier used in solutions.
+        """
+        identifier = len(self.row_masks)
+        mask = 0
+        for index in row:
+            mask |= 1 << index
+
+        primary = mask & self.primary_mask
+        if primary and mask not in self.seen_masks:
+            lowest = (primary & -primary).bit_length() - 1
+            self.rows_by_column[lowest].append((mask, identifier))
+            self.seen_masks.add(mask)
+
+        self.row_masks.append(mask)
+        self.row_columns.append(list(row))
+        self.row_names.append(rowName)
+        self._counts.clear()
+        return identifier
+
+    def getRowList(self, row):
+        """ Get a list of the column names corresponding to the row."""
+        return [self.names[index] for index in self.row_columns[row]]
+
+    def getRowName(self, row):
+        """ Get the name the row was appended with."""
+        return self.row_names[row]
+
+    def useRow(self, row):
+        """ Force a row into every solution. Must be undone with unuseRow in
+            reverse order.
+        """
+        if self.row_masks[row] & self.covered:
+            raise ValueError("Row conflicts with the rows already in use.")
+        self.covered |= self.row_masks[row]
+        self.partialsolution.append(row)
+
+    def unuseRow(self, row):
+        """ Undo the latest useRow call."""
+        assert self.partialsolution.pop() == row
+        self.covered &= ~self.row_masks[row]
+
+    def _candidates(self, covered):
+        """ Rows that cover the lowest free primary column without clashing
+            with the current partial cover.
+            INTERNAL USE ONLY.
+
+            :return: An iterator of (mask, row) pairs.
+        """
+        free = self.primary_mask & ~covered
+        column = (free & -free).bit_length() - 1
+        return iter([pair for pair in self.rows_by_column[column] if not pair[0] & covered])
+
+    def split(self, depth: int):
+        """ Split the search into the subtrees it branches into, down to a
+            depth. Searching every subtree with its rows forced by useRow
+            visits exactly the nodes of one search below that depth.
+
+            :param depth: The number of branching levels to split on.
+            :return: A list of subtrees, each a list of row identifiers to
+                force, in the order solve visits them. Subtrees of covers
+                finished above the depth are cut short.
+        """
+        target = self.primary_mask
+        subtrees = [([], self.covered)]
+        for _ in range(depth):
+            deeper = []
+            for rows, covered in subtrees:
+                if covered & target == target:
+                    deeper.append((rows, covered))
+                    continue
+                for mask, row in self._candidates(covered):
+                    deeper.append((rows + [row], covered | mask))
+            subtrees = deeper
+        return [rows for rows, _ in subtrees]
+
+    def _counter(self):
+        """ The memoized function counting the exact covers that finish a
+            partial cover.
+            INTERNAL USE ONLY.
+
+            :return: A function of the covered mask.
+        """
+        target = self.primary_mask
+        rows_by_column = self.rows_by_column
+        memo = self._counts
+
+        def count_from(covered):
+            if covered & target == target:
+                return 1
+
+            cached = memo.get(covered)
+            if cached is not None:
+                return cached
+
+            free = target & ~covered
+            column = (free & -free).bit_length() - 1
+            total = 0
+            for mask, _ in rows_by_column[column]:
+                if not mask & covered:
+                    total += count_from(covered | mask)
+
+            memo[covered] = total
+            return total
+
+        return count_from
+
+    def count(self):
+        """ Count the exact covers without building them.
+
+            The number of ways to finish a partial cover only depends on the
+            columns already covered, so counts are memoized on the covered
+            mask until the next row is appended, and later calls, as well as
+            unrank, reuse them.
+
+            :return: The number of distinct exact covers.
+        """
+        return self._counter()(self.covered)
+
+    def unrank(self, rank):
+        """ Build the exact cover at a position of the order solve yields
+            them in, descending one level per piece by skipping the covers
+            counted under the earlier candidates.
+
+            :param rank: The position, from 0 to count() - 1.
+            :return: The exact cover as a list of row identifiers.
+            :raises IndexError: If there is no exact cover at the position.
+        """
+        count_from = self._counter()
+        if not 0 <= rank < count_from(self.covered):
+            raise IndexError(f"No exact cover at position {rank}.")
+
+        target = self.primary_mask
+        covered = self.covered
+        solution = list(self.partialsolution)
+        while covered & target != target:
+            free = target & ~covered
+            column = (free & -free).bit_length() - 1
+            for mask, row in self.rows_by_column[column]:
+                if mask & covered:
+                    continue
+                count = count_from(covered | mask)
+                if rank < count:
+                    covered |= mask
+                    solution.append(row)
+                    break
+                rank -= count
+        return solution
+
+    def solve(self, stats=None, pruner=None, cancel=None):
+        """ Yield every exact cover as a list of row identifiers.
+
+            :param stats: An optional SearchStats to record every node in.
+            :param pruner: An optional DeadRegionPruner to cut dead branches with.
+            :param cancel: An optional CancellationToken, the search ends
+                without an error once it says to stop.
+        """
+        is_dead = pruner.is_dead if pruner is not None else None
+        target = self.primary_mask
+        candidates = self._candidates
+        solution = list(self.partialsolution)
+
+        if stats is not None:
+            base_depth = len(solution)
+
+            def candidates(covered):
+                pairs = list(self._candidates(covered))
+                stats.record_node(len(solution) - base_depth, len(pairs))
+                return iter(pairs)
+
+        if self.covered & target == target:
+            yield solution
+            return
+
+        covered_stack = [self.covered]
+        candidate_stack = [candidates(self.covered)]
+
+        while candidate_stack:
+            # resume the deepest level where it left off
+            for mask, row in candidate_stack[-1]:
+                covered = covered_stack[-1] | mask
+                if covered & target == target:
+                    yield solution + [row]
+                    continue
+                if is_dead is not None and is_dead(covered, mask):
+                    continue
+                if cancel is not None and cancel.tick():
+                    return
+
+                solution.append(row)
+                covered_stack.append(covered)
+                candidate_stack.append(candidates(covered))
+                break
+            else:
+                # this level is exhausted, backtrack
+                candidate_stack.pop()
+                covered_stack.pop()
+                if candidate_stack:
+                    solution.pop()
@@ -1,14 +1,36 @@
-import copy
+import threading
+import time
+from contextlib import nullcontext
 
 import dlx
+from calendar_solver.calendar_solver.array_dlx import ArrayDLX
+from calendar_solver.calendar_solver.bitboard import BitboardDLX
+from calendar_solver.calendar_solver.cancellation import SearchCancelled
+from calendar_solver.calendar_solver.engines import ENGINES, search
+from calendar_solver.calendar_solver.parallel import solve_parallel
+from calendar_solver.calendar_solver.placement_index import PlacementIndex
+from calendar_solver.calendar_solver.pruning import DeadRegionPruner
 from calendar_solver.calendar_solver.tetromino import Shape, Tetromino
 from calendar_solver.calendar_solver.util import (DayOfWeek, Month,
                                                   get_calender_order,
-                                                  get_today)
+                                                  get_today, sample_ranks)
+from calendar_solver.calendar_solver.variant import compile_variant
 
 
 class CalenderGrid():
-    def __init__(self):
+    def __init__(self, variant=None):
+        """ Initialize the board.
+
+            :param variant: An optional Variant to take the board and labels
+                from instead of the built-in calendar board.
+        """
+        if variant is not None:
+            self.rows = variant.rows
+            self.cols = variant.cols
+            self.grid = [list(row) for row in variant.grid]
+            self.grid_values = dict(variant.grid_values)
+            return
+
         self.rows = 8
         self.cols = 7
         self.grid = [[0] * self.cols for _ in range(self.rows)]
@@ -48,20 +70,127 @@ class CalenderGrid():
                     self.grid_values[calender_order[order_index]] = (i, j)
                     order_index += 1
 
+
+def create_tetrominos():
+    """ Create the puzzle pieces keyed by their name.
+
+        :return: A dict of piece name to Tetromino.
+    """
+    return {
+        "small_L_tetromino": Tetromino(Shape(2, 3, [[1, 0], [1, 0], [1, 1]]), "sL"),
+        "big_L_tetromino": Tetromino(Shape(2, 4, [[1, 0], [1, 0], [1, 0], [1, 1]]), "bL"),
+        "symmetrical_L_tetromino": Tetromino(Shape(3, 3, [[1, 0, 0], [1, 0, 0], [1, 1, 1]]), "symL"),
+        "lowercase_l_tetromino": Tetromino(Shape(1, 4, [[1], [1], [1], [1]]), "l"),
+        "u_tetromino": Tetromino(Shape(3, 2, [[1, 0, 1], [1, 1, 1]]), "U"),
+        "small_z_tetromino": Tetromino(Shape(3, 2, [[1, 1, 0], [0, 1, 1]]), "sZ"),
+        "big_z_tetromino": Tetromino(Shape(4, 2, [[0, 0, 1, 1], [1, 1, 1, 0]]), "bZ"),
+        "z_tetromino": Tetromino(Shape(3, 3, [[0, 1, 1], [0, 1, 0], [1, 1, 0]]), "Z"),
+        "t_tetromino": Tetromino(Shape(3, 3, [[1, 1, 1], [0, 1, 0], [0, 1, 0]]), "T"),
+        "p_tetromino": Tetromino(Shape(2, 3, [[1, 1], [1, 1], [1, 0]]), "P"),
+    }
+
+
+_placement_indexes = {}
+
+
+def get_placement_index(flips: bool = False, variant=None, index_dir: str = None) -> PlacementIndex:
+    """ Get the placement index of the calendar board, built on first use and
+        shared by every solver of the process.
+
+        :param flips: Also place the mirror images of the pieces.
+        :param variant: An optional Variant to get the index of instead, see
+            compile_variant. Its own flips rule applies.
+        :param index_dir: Where compile_variant keeps the compiled index of
+            the variant.
+
+        :return: The PlacementIndex of the default board and pieces.
+    """
+    key = flips if variant is None else variant.fingerprint
+    placement_index = _placement_indexes.get(key)
+    if placement_index is None:
+        if variant is None:
+            placement_index = PlacementIndex(CalenderGrid(), create_tetrominos(), flips)
+        else:
+            placement_index = compile_variant(variant, index_dir)
+        _placement_indexes[key] = placement_index
+    return placement_index
+
+
+def set_placement_index(placement_index: PlacementIndex, flips: bool = False):
+    """ Share a placement index of the calendar board that was loaded instead
+        of built, e.g. from a snapshot, with every later solver of the process.
+
+        :param placement_index: The PlacementIndex to share.
+        :param flips: Whether the index places the mirror images of the pieces.
+    """
+    _placement_indexes[flips] = placement_index
+
+
+# idle ArrayDLX solvers loaded with every placement of an index, keyed like
+# _placement_indexes. Each date only excludes its free cells and includes
+# them again afterwards, so the buffers are built once per concurrent search.
+_array_solvers = {}
+_array_solvers_lock = threading.Lock()
+
+
+def _checkout_array_solver(key, placement_index, columns):
+    """ Take an idle shared ArrayDLX of a placement index, or build one.
+        INTERNAL USE ONLY.
+
+        :param key: The key of the placement index.
+        :param placement_index: The PlacementIndex to load.
+        :param columns: The (name, type) columns of a date, every cell
+            column is loaded as primary.
+    """
+    with _array_solvers_lock:
+        idle = _array_solvers.setdefault(key, [])
+        if idle:
+            return idle.pop()
+
+    solver = ArrayDLX([(name, ArrayDLX.PRIMARY) for name, _ in columns])
+    for position, row in enumerate(placement_index.rows):
+        solver.appendRow(row, position)
+    return solver
+
+
+def _checkin_array_solver(key, solver):
+    """ Give back a solver of _checkout_array_solver, with every column
+        excluded for the date included again.
+        INTERNAL USE ONLY.
+    """
+    solver.includeColumns()
+    with _array_solvers_lock:
+        _array_solvers[key].append(solver)
+
+
 class CalenderSolver():
     """ Class to solve the calendar puzzle using DLX algorithm."""
-    def __init__(self, year: int, month: Month, day: int, day_of_week: DayOfWeek):
+    def __init__(self, year: int, month: Month, day: int, day_of_week: DayOfWeek, engine: str = "dlx",
+                 prune: bool = False, flips: bool = False, variant=None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {sorted(ENGINES)}.")
+        self.engine = engine
+        self.prune = prune
+        # None is the built-in calendar board, a Variant brings its own
+        # board, pieces and flips rule
+        self.variant = variant
+
         self.year = year
         self.days_in_month = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
         if self.is_leap_year(year):
             self.days_in_month[1] += 1
 
-        self.calender_grid = CalenderGrid()
+        self.calender_grid = CalenderGrid(variant)
         self._init_empty_cells(month, day, day_of_week)
         self._init_tetrominos()
+        self.flips = flips if variant is None else variant.flips
+        self.placement_index = get_placement_index(self.flips, variant)
 
+        start = time.perf_counter()
         self._build_dlx_columns(self.calender_grid, self.empty_cells, self.tetrominos.keys())
-        self._build_dlx_rows(self.tetrominos, self.calender_grid, self.empty_cells)
+        self._build_dlx_rows(self.placement_index, self.empty_cells)
+        self.pruner = self._create_pruner() if prune else None
+        self.build_seconds = time.perf_counter() - start
 
     def is_leap_year(self, year: int) -> bool:
         """Check if a year is a leap year.
@@ -75,18 +204,7 @@ class CalenderSolver():
         """ Initialize the tetrominos with their shapes and names.
             INTERNAL USE ONLY.
         """
-        self.tetrominos = {
-            "small_L_tetromino": Tetromino(Shape(2, 3, [[1, 0], [1, 0], [1, 1]]), "sL"),
-            "big_L_tetromino": Tetromino(Shape(2, 4, [[1, 0], [1, 0], [1, 0], [1, 1]]), "bL"),
-            "symmetrical_L_tetromino": Tetromino(Shape(3, 3, [[1, 0, 0], [1, 0, 0], [1, 1, 1]]), "symL"),
-            "lowercase_l_tetromino": Tetromino(Shape(1, 4, [[1], [1], [1], [1]]), "l"),
-            "u_tetromino": Tetromino(Shape(3, 2, [[1, 0, 1], [1, 1, 1]]), "U"),
-            "small_z_tetromino": Tetromino(Shape(3, 2, [[1, 1, 0], [0, 1, 1]]), "sZ"),
-            "big_z_tetromino": Tetromino(Shape(4, 2, [[0, 0, 1, 1], [1, 1, 1, 0]]), "bZ"),
-            "z_tetromino": Tetromino(Shape(3, 3, [[0, 1, 1], [0, 1, 0], [1, 1, 0]]), "Z"),
-            "t_tetromino": Tetromino(Shape(3, 3, [[1, 1, 1], [0, 1, 0], [0, 1, 0]]), "T"),
-            "p_tetromino": Tetromino(Shape(2, 3, [[1, 1], [1, 1], [1, 0]]), "P"),
-        }
+        self.tetrominos = create_tetrominos() if self.variant is None else self.variant.create_tetrominos()
 
     
     def _init_empty_cells(self, month, day, day_of_week):
@@ -98,11 +216,11 @@ class CalenderSolver():
             :param day: The day to set.
             :param day_of_week: The day of the week to set.
         """
-        self.empty_cells = [
-            self.calender_grid.grid_values[month.name],
-            self.calender_grid.grid_values[day],
-            self.calender_grid.grid_values[day_of_week.name]
-        ]
+        self.empty_cells = []
+        for label in (month.name, day, day_of_week.name):
+            if label not in self.calender_grid.grid_values:
+                raise ValueError(f"The board has no cell labelled {label!r}.")
+            self.empty_cells.append(self.calender_grid.grid_values[label])
     
     def _build_dlx_columns(self, grid, empty_cells, tetromino_keys):
         """ Build the columns for the DLX algorithm.
@@ -129,93 +247,283 @@ class CalenderSolver():
         # index the cells and the pieces to an indexable metadata format
         self.col_index = {col[0]: idx for idx, col in enumerate(self.columns)}
             
-    def _build_dlx_rows(self, tetrominos, grid, empty_cells):
-        """ Build the rows for the DLX algorithm.
+    def _build_dlx_rows(self, placement_index, empty_cells):
+        """ Build the rows for the DLX algorithm from the date independent
+            placement index, dropping placements that cover an empty cell.
             INTERNAL USE ONLY.
             
-            :param tetrominos: The tetrominos to use.
-            :param grid: The grid to use.
+            :param placement_index: The PlacementIndex of the board.
             :param empty_cells: The empty cells in the grid.
         """
-        self.rows = []
-        self.row_metadata = []
-        
-        for name, tetromino in tetrominos.items():
-            for rotation in range(4):
-                rotated_tetromino = copy.deepcopy(tetromino)
-                rotated_tetromino.rotate_clockwise(90 * rotation)
-
-                shape_matrix = rotated_tetromino.shape.shape
-                expected_cells = sum(cell for row in shape_matrix for cell in row)
-                    
-                # print(f"[DEBUG] {name} rotation {rotation}: {shape_matrix}")
-
-                for row in range(grid.rows):
-                    for col in range(grid.cols):
-                        cells = []
-                        valid = True
-
-                        for i, shape_row in enumerate(shape_matrix):
-                            for j, cell in enumerate(shape_row):
-                                if cell:
-                                    r = row + i
-                                    c = col + j
-                                    if (
-                                        r >= grid.rows or c >= grid.cols or
-                                        grid.grid[r][c] is None or
-                                        (r, c) in empty_cells
-                                    ):
-                                        valid = False
-                                        break
-                                    cells.append((r, c))
-                            if not valid:
-                                break
-
-                        if valid and len(cells) == expected_cells:                            
-                            # A possible iteration of the tetromino in an
-                            # indexed Intermediate Representation form 
-                            dlx_row = [self.col_index[f"piece_{name}"]] + \
-                                [self.col_index[f"cell_{r}_{c}"] for (r,c) in \
-                                    cells]
-                            self.rows.append(dlx_row)
-                            self.row_metadata.append((name, rotation, cells))
+        rows, row_metadata = placement_index.available(frozenset(empty_cells))
+        self.rows = list(rows)
+        self.row_metadata = list(row_metadata)
     
-    def solve_exact_cover(self, first_solution_only=False):
+    def _create_pruner(self):
+        """ Create the dead region pruner of the date.
+            INTERNAL USE ONLY.
+        """
+        piece_sizes = {
+            self.placement_index.piece_column[name]: len(tetromino.shape.offsets)
+            for name, tetromino in self.tetrominos.items()
+        }
+        return DeadRegionPruner(self.placement_index.cell_column, piece_sizes, self.empty_cells)
+
+    def _create_solver(self, stats=None, labels=None):
+        """ Create the exact cover solver of the selected engine and load the
+            rows into it.
+            INTERNAL USE ONLY.
+
+            :param stats: An optional SearchStats to add the placement count
+                and the build and construct phases to.
+            :param labels: Indices into self.rows to load, defaults to all of them.
+        """
+        start = time.perf_counter()
+        if self.engine == "array" and labels is None:
+            solver = self._checkout_array_solver()
+        else:
+            solver = ENGINES[self.engine](self.columns)
+            self.row_identifiers = {}
+            for i in range(len(self.rows)) if labels is None else labels:
+                self.row_identifiers[i] = solver.appendRow(self.rows[i], i)  # <-- append with label `i`
+
+        if stats is not None:
+            stats.placements += len(self.row_identifiers)
+            stats.add_phase("build", self.build_seconds)
+            stats.add_phase("construct", time.perf_counter() - start)
+        return solver
+
+    def _checkout_array_solver(self):
+        """ Take a shared ArrayDLX and set it up for the date: exclude the
+            free cells, which drops every placement covering them, and name
+            the rows after their index in self.rows. _search gives it back.
+            INTERNAL USE ONLY.
+        """
+        key = self.flips if self.variant is None else self.variant.fingerprint
+        solver = _checkout_array_solver(key, self.placement_index, self.columns)
+        solver.excludeColumns([self.placement_index.cell_column[cell] for cell in self.empty_cells])
+
+        positions = self.placement_index.available_positions(frozenset(self.empty_cells))
+        solver.row_names = [None] * len(self.placement_index)
+        for label, position in enumerate(positions):
+            solver.row_names[position] = label
+        self.row_identifiers = dict(enumerate(positions))
+        self._array_solver = (key, solver)
+        return solver
+
+    def _search(self, solver, stats=None, cancel=None):
+        """ Yield the raw solutions of the solver, adding the time spent
+            searching to the "search" phase of stats.
+            INTERNAL USE ONLY.
+        """
+        solutions = search(solver, stats, self.pruner, cancel)
+        try:
+            if stats is None:
+                yield from solutions
+                return
+
+            while True:
+                with stats.phase("search"):
+                    solution = next(solutions, None)
+                if solution is None:
+                    return
+                yield solution
+        finally:
+            # a shared solver goes back once its covers are undone
+            if getattr(self, "_array_solver", (None, None))[1] is solver:
+                solutions.close()
+                _checkin_array_solver(*self._array_solver)
+                del self._array_solver
+
+    def iter_solutions(self, forced_rows=(), stats=None, cancel=None):
+        """ Yield every distinct solution as soon as the search finds it,
+            instead of collecting all of them first.
+
+            :param forced_rows: Indices into self.rows that every solution
+                must contain, e.g. a prefix from parallel.split_search.
+            :param stats: An optional SearchStats to record the search in.
+            :param cancel: An optional CancellationToken. The generator ends
+                early once it says to stop, see cancel.cancelled.
+            :return: A generator of solutions formatted like the ones of
+                solve_exact_cover.
+        """
+        # rows are unique, so the search never finds the same cover twice.
+        # Rows clashing with the forced ones can never be used, so only the
+        # residual problem is loaded.
+        labels = None
+        if forced_rows:
+            covered = set().union(*(self.rows[label] for label in forced_rows))
+            labels = [
+                i for i, row in enumerate(self.rows)
+                if i in forced_rows or covered.isdisjoint(row)
+            ]
+
+        solver = self._create_solver(stats, labels)
+        for label in forced_rows:
+            solver.useRow(self.row_identifiers[label])
+
+        for solution in self._search(solver, stats, cancel):
+            yield self._format_solution(solver, solution, stats)
+
+    def solve_exact_cover(self, first_solution_only=False, workers=None, split_depth=2, stats=None, cancel=None):
         """ Solve the exact cover problem using the DLX algorithm.
             :return: The solution to the exact cover problem.
             
             :param first_solution_only: If True, return only the first solution.
+            :param workers: If more than 1, enumerate all solutions in that
+                many worker processes.
+            :param split_depth: Number of branching levels the search tree is
+                split on when running in worker processes.
+            :param stats: An optional SearchStats to record the search in.
+                Searches running in worker processes only add their wall time.
+            :param cancel: An optional CancellationToken checked while
+                searching. Not used by searches in worker processes.
+            :raises SearchCancelled: If the token stopped the search, with
+                the solutions found until then.
         """
+        if workers is not None and workers > 1 and not first_solution_only:
+            return self._solve_exact_cover_parallel(workers, split_depth, stats)
+
         # print("[DEBUG] DLX columns:", self.columns)
         # # print("[DEBUG] DLX column index:", self.col_index)
         # print("[DEBUG] DLX rows:", self.rows)
         
         # print("[DEBUG] Number of rows:", len(self.rows))
         # print("[DEBUG] Number of columns:", len(self.columns))
-        solver = dlx.DLX(self.columns)
-        for i, row in enumerate(self.rows):
-            solver.appendRow(row, i)  # <-- append with label `i`
+        solver = self._create_solver(stats)
         
         if first_solution_only:
-            solution = next(solver.solve(), None)
-            return self._format_solution(solver, solution) if solution else [], []
-        else:
-            solutions = solver.solve()
-        
-        # get all unique solutions
-        solutions = set(tuple(sorted(solution)) for solution in solutions)
-        
-        solution = list(solutions)[0]
-        # print("[DEBUG] Solution rows:", solution)
-        if solution is None:
+            solution = next(self._search(solver, stats, cancel), None)
+            if solution is None and cancel is not None and cancel.cancelled:
+                raise SearchCancelled(cancel.reason)
+            return self._format_solution(solver, solution, stats) if solution else [], []
+
+        # every row is a distinct placement, so every solution is unique
+        all_solutions = [
+            self._format_solution(solver, solution, stats) for solution in self._search(solver, stats, cancel)
+        ]
+        if cancel is not None and cancel.cancelled:
+            raise SearchCancelled(cancel.reason, all_solutions)
+
+        if not all_solutions:
             return [], []
-        else:
-            all_solutions = []
-            for solution in solutions:
-                solution_rows = self._format_solution(solver, solution)
-                if solution_rows not in all_solutions:
-                    all_solutions.append(solution_rows)
-            return solution_rows, all_solutions
+        return all_solutions[0], all_solutions
+
+    def complete(self, placed_pieces, first_solution_only=False, stats=None):
+        """ Complete a partially solved board by searching only the pieces
+            and cells that are still free.
+
+            :param placed_pieces: The pieces already on the board, as
+                (piece name, cells) pairs. The piece name is a key of
+                self.tetrominos, with or without the "piece_" prefix, and the
+                cells are (row, col) pairs.
+            :param first_solution_only: If True, return only the first completion.
+            :param stats: An optional SearchStats to record the search in.
+            :return: The first completion and all completions, formatted like
+                the results of solve_exact_cover and including the placed pieces.
+            :raises ValueError: If a piece is unknown or placed twice, if its
+                cells are not a placement of the piece on the free cells of
+                the date, or if two pieces overlap.
+        """
+        solutions = self.iter_solutions(self._placed_rows(placed_pieces), stats)
+
+        if first_solution_only:
+            solution = next(solutions, None)
+            return solution or [], []
+
+        all_solutions = list(solutions)
+        if not all_solutions:
+            return [], []
+        return all_solutions[0], all_solutions
+
+    def _placed_rows(self, placed_pieces):
+        """ Find the rows of placed pieces.
+            INTERNAL USE ONLY.
+
+            :param placed_pieces: (piece name, cells) pairs, see complete.
+            :return: The indices into self.rows.
+            :raises ValueError: If the pieces are not a valid partial cover.
+        """
+        if not hasattr(self, "_row_of_placement"):
+            self._row_of_placement = {
+                (name, frozenset(cells)): i for i, (name, _, cells) in enumerate(self.row_metadata)
+            }
+
+        labels = []
+        covered = set()
+        for name, cells in placed_pieces:
+            name = name[len("piece_"):] if name.startswith("piece_") else name
+            if name not in self.tetrominos:
+                raise ValueError(f"Unknown piece {name!r}.")
+
+            cells = frozenset(tuple(cell) for cell in cells)
+            label = self._row_of_placement.get((name, cells))
+            if label is None:
+                raise ValueError(f"The cells {sorted(cells)} are not a placement of {name!r} on the free cells.")
+            if not covered.isdisjoint(self.rows[label]):
+                raise ValueError(f"{name!r} is placed twice or overlaps another piece.")
+
+            covered.update(self.rows[label])
+            labels.append(label)
+        return labels
+
+    def count_solutions(self) -> int:
+        """ Count the distinct solutions without materializing them. Always
+            runs on the bitboard engine.
+
+            :return: The number of solutions, same as the length of the
+                second value returned by solve_exact_cover.
+        """
+        return self._get_counting_solver().count()
+
+    def sample_solutions(self, k: int, seed: int = None):
+        """ Draw distinct solutions uniformly at random without enumerating
+            them. Every solution has a position in the search order, the
+            positions are drawn and each solution is built by descending
+            the search tree along the subtree counts. The counts are kept on
+            this solver, so once they are warm a draw costs k descents of
+            one step per piece.
+
+            :param k: The number of solutions to draw.
+            :param seed: Seed of the draw, the same seed draws the same
+                solutions, None draws a fresh seed.
+            :return: min(k, count_solutions()) solutions in random order,
+                formatted like the ones of solve_exact_cover.
+        """
+        solver = self._get_counting_solver()
+        ranks = sample_ranks(solver.count(), k, seed)
+        return [self._format_solution(solver, solver.unrank(rank)) for rank in ranks]
+
+    def _get_counting_solver(self):
+        """ The bitboard solver that counts and samples, built on first use
+            so its memoized counts are shared by every later call.
+            INTERNAL USE ONLY.
+        """
+        if not hasattr(self, "_counting_solver"):
+            self._counting_solver = BitboardDLX(self.columns)
+            for i, row in enumerate(self.rows):
+                self._counting_solver.appendRow(row, i)
+        return self._counting_solver
+
+    def _solve_exact_cover_parallel(self, workers, split_depth, stats=None):
+        """ Enumerate all solutions across a process pool.
+            INTERNAL USE ONLY.
+
+            :param workers: Number of worker processes.
+            :param split_depth: Number of branching levels to split on.
+            :param stats: An optional SearchStats to add the wall time to.
+        """
+        with stats.phase("search") if stats is not None else nullcontext():
+            solutions = solve_parallel(ENGINES[self.engine], self.columns, self.rows, workers, split_depth)
+
+        all_solutions = [
+            [set(self.columns[col][0] for col in self.rows[label]) for label in solution]
+            for solution in solutions
+        ]
+
+        if not all_solutions:
+            return [], []
+        return all_solutions[0], all_solutions
 
     def apply_solution_to_grid(self, solution_rows):
         """
@@ -246,16 +554,18 @@ class CalenderSolver():
 
         return self.calender_grid.grid
     
-    def _format_solution(self, solver, solution):
+    def _format_solution(self, solver, solution, stats=None):
         """ Format the solution to be more readable.
         
             :param solver: The DLX solver to use.
             :param solution: The solution to format.
+            :param stats: An optional SearchStats to add the format time to.
             :return: The formatted solution.
         """
-        _solutions = []
-        for i in solution:
-            _solutions.append(set(solver.getRowList(i)))
+        with stats.phase("format") if stats is not None else nullcontext():
+            _solutions = []
+            for i in solution:
+                _solutions.append(set(solver.getRowList(i)))
             
         return _solutions
         
@@ -0,0 +1,91 @@
+import time
+
+
+class SearchCancelled(Exception):
+    """ Raised when a search was stopped by its CancellationToken.
+
+        Carries the solutions found before the stop, so a caller can still
+        answer with a partial result.
+    """
+    def __init__(self, reason: str, solutions=()):
+        super().__init__(f"Search stopped: {reason}.")
+        self.reason = reason
+        self.solutions = list(solutions)
+
+
+class CancellationToken():
+    """ Tells a running search to stop: when cancel is called, when the
+        deadline passes or when the is_active callback returns False, e.g.
+        because the client of the request went away.
+
+        The engines call tick at every search node. Only every check_every
+        nodes it looks at the clock and the callback, so a search node stays
+        cheap while a stop is noticed within a few milliseconds.
+    """
+    CANCELLED = "cancelled"
+    DEADLINE = "deadline"
+
+    def __init__(self, deadline: float = None, is_active=None, check_every: int = 16, clock=time.monotonic):
+        """ Initialize the token.
+
+            :param deadline: A clock() value to stop at, None for no deadline.
+            :param is_active: Optional function returning False once the
+                result is no longer wanted.
+            :param check_every: The number of nodes between two checks.
+            :param clock: Function returning the current time in seconds.
+        """
+        self.deadline = deadline
+        self.is_active = is_active
+        self.check_every = check_every
+        self.clock = clock
+        self.nodes = 0
+        self._countdown = check_every
+
+        # None while the search may go on, else why it has to stop
+        self.reason = None
+
+    @classmethod
+    def with_timeout(cls, seconds: float, **kwargs):
+        """ Create a token whose deadline is seconds from now.
+
+            :param seconds: The time the search may take, None for no deadline.
+            :return: The CancellationToken.
+        """
+        clock = kwargs.get("clock", time.monotonic)
+        return cls(None if seconds is None else clock() + seconds, **kwargs)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def cancel(self, reason: str = CANCELLED):
+        """ Stop the search at its next check. Safe to call from another thread.
+
+            :param reason: Why the search is stopped, kept if it already was.
+        """
+        if self.reason is None:
+            self.reason = reason
+
+    def check(self) -> bool:
+        """ Look at the deadline and the callback now.
+
+            :return: True if the search has to stop.
+        """
+        if self.reason is None:
+            if self.deadline is not None and self.clock() >= self.deadline:
+                self.cancel(CancellationToken.DEADLINE)
+            elif self.is_active is not None and not self.is_active():
+                self.cancel(CancellationToken.CANCELLED)
+        return self.reason is not None
+
+    def tick(self) -> bool:
+        """ Count a search node, checking every check_every nodes.
+
+            :return: True if the search has to stop.
+        """
+        self.nodes += 1
+        self._countdown -= 1
+        if self._countdown:
+            return False
+        self._countdown = self.check_every
+        return self.check()
@@ -0,0 +1,128 @@
+import dlx
+from calendar_solver.calendar_solver.array_dlx import ArrayDLX
+from calendar_solver.calendar_solver.bitboard import BitboardDLX
+
+# exact cover engines selectable with CalenderSolver(engine=...)
+ENGINES = {
+    "dlx": dlx.DLX,
+    "bitboard": BitboardDLX,
+    "array": ArrayDLX,
+}
+
+
+def row_label(solver, identifier):
+    """
+    Get the label a row was appended with from any of its identifiers.
+    dlx.DLX reports the node the search branched on, not the first node of
+    the row, so its identifiers cannot be used as labels directly.
+    :param solver: The engine instance that produced the identifier.
+    :param identifier: A row identifier from one of its solutions.
+    :return: The rowName given to appendRow.
+    """
+    if isinstance(solver, dlx.DLX):
+        return solver.N[identifier]
+    return solver.getRowName(identifier)
+
+
+def solution_key(solver, solution) -> tuple:
+    """
+    Reduce a solution to a canonical hashable key.
+    :param solver: The engine instance that produced the solution.
+    :param solution: The row identifiers of the solution.
+    :return: The sorted tuple of the row labels.
+    """
+    return tuple(sorted(row_label(solver, identifier) for identifier in solution))
+
+
+def _row_mask(solver, node, masks):
+    """ Column mask of the dlx.DLX row a node belongs to, memoized per node.
+        INTERNAL USE ONLY.
+    """
+    mask = masks.get(node)
+    if mask is None:
+        mask = 0
+        i = node
+        while True:
+            mask |= 1 << solver.C[i]
+            i = solver.R[i]
+            if i == node:
+                break
+        masks[node] = mask
+    return mask
+
+
+def _column_selector(solver, userdata):
+    """ dlx.DLX column selector that rejects dead branches, records every
+        node in a SearchStats and stops at a CancellationToken, then picks
+        the same column as the default selector. Returning the header makes the search backtrack.
+        INTERNAL USE ONLY.
+    """
+    stats, base_depth, pruner, masks, cancel = userdata
+    depth = len(solver.partialsolution) - base_depth
+
+    # dlx.DLX cannot be stopped from inside, so once the token says to stop
+    # every node backtracks and the search unwinds without visiting more
+    if cancel is not None and (cancel.cancelled or cancel.tick()):
+        return solver.header
+
+    if pruner is not None and depth:
+        covered = 0
+        for node in solver.partialsolution:
+            covered |= _row_mask(solver, node, masks)
+        if pruner.is_dead(covered, _row_mask(solver, solver.partialsolution[-1], masks)):
+            return solver.header
+
+    column = dlx.DLX.smallestColumnSelector(solver, None)
+    if stats is not None:
+        stats.record_node(depth, solver.S[column] if column != solver.header else 0)
+    return column
+
+
+def search(solver, stats=None, pruner=None, cancel=None):
+    """
+    Run the search of any engine.
+    :param solver: The engine instance to search.
+    :param stats: An optional SearchStats to record the search tree metrics in.
+    :param pruner: An optional DeadRegionPruner to cut dead branches with.
+    :param cancel: An optional CancellationToken. The generator ends early
+        once it says to stop, check cancel.cancelled to tell it apart from a
+        finished search.
+    :return: A generator of solutions as lists of row identifiers.
+    """
+    if stats is None and pruner is None and cancel is None:
+        return solver.solve()
+
+    if isinstance(solver, dlx.DLX):
+        solutions = solver.solve(
+            columnselector=_column_selector,
+            columnselectoruserdata=(stats, len(solver.partialsolution), pruner, {}, cancel),
+        )
+        if cancel is not None:
+            solutions = _until_cancelled(solutions, cancel)
+    else:
+        solutions = solver.solve(stats=stats, pruner=pruner, cancel=cancel)
+
+    if stats is None:
+        return solutions
+    stats.searches += 1
+    return _count_solutions(solutions, stats)
+
+
+def _count_solutions(solutions, stats):
+    """ Pass solutions through while counting them.
+        INTERNAL USE ONLY.
+    """
+    for solution in solutions:
+        stats.solutions += 1
+        yield solution
+
+
+def _until_cancelled(solutions, cancel):
+    """ Pass dlx.DLX solutions through until the token says to stop. The
+        search may still complete a cover while it unwinds, which is dropped.
+        INTERNAL USE ONLY.
+    """
+    for solution in solutions:
+        if cancel.cancelled:
+            return
+        yield solution
@@ -0,0 +1,99 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import dlx
+from calendar_solver.calendar_solver.engines import solution_key
+
+
+def split_search(columns, rows, split_depth: int = 2):
+    """
+    Split the exact cover search tree into independent subtrees.
+
+    Every solution covers the most constrained primary column with exactly
+    one row, so forcing each of those rows partitions the solutions without
+    overlap. Repeating this split_depth times gives the subtree prefixes.
+
+    :param columns: The (name, type) columns of the problem.
+    :param rows: The rows as lists of column indices.
+    :param split_depth: How many branching levels to split on.
+    :return: A list of prefixes, each a list of forced row labels.
+    """
+    row_columns = [set(row) for row in rows]
+    primary = {index for index, (_, column_type) in enumerate(columns) if column_type == dlx.DLX.PRIMARY}
+
+    prefixes = [([], set(), list(range(len(rows))))]
+    for _ in range(split_depth):
+        next_prefixes = []
+        for prefix, covered, candidates in prefixes:
+            open_columns = primary - covered
+            if not open_columns:
+                next_prefixes.append((prefix, covered, candidates))
+                continue
+
+            # branch on the open column with the fewest candidate rows
+            counts = {column: 0 for column in open_columns}
+            for label in candidates:
+                for column in row_columns[label] & open_columns:
+                    counts[column] += 1
+            column = min(open_columns, key=lambda c: (counts[c], c))
+
+            for label in candidates:
+                if column not in row_columns[label]:
+                    continue
+                now_covered = covered | row_columns[label]
+                remaining = [other for other in candidates if row_columns[other].isdisjoint(now_covered)]
+                next_prefixes.append((prefix + [label], now_covered, remaining))
+        prefixes = next_prefixes
+
+    return [prefix for prefix, _, _ in prefixes]
+
+
+# solver loaded once per worker process by _init_worker
+_worker_solver = None
+_worker_identifiers = None
+
+
+def _init_worker(engine, columns, rows):
+    """ Load the problem into the solver of a worker process.
+        INTERNAL USE ONLY.
+    """
+    global _worker_solver, _worker_identifiers
+    _worker_solver = engine(columns)
+    _worker_identifiers = [_worker_solver.appendRow(row, label) for label, row in enumerate(rows)]
+
+
+def _solve_subtree(prefix):
+    """ Enumerate the solutions of a single subtree in a worker process.
+        INTERNAL USE ONLY.
+
+        :param prefix: The row labels forced into the subtree.
+        :return: The solutions as sorted tuples of row labels.
+    """
+    solver = _worker_solver
+    for label in prefix:
+        solver.useRow(_worker_identifiers[label])
+
+    solutions = [solution_key(solver, solution) for solution in solver.solve()]
+
+    for label in reversed(prefix):
+        solver.unuseRow(_worker_identifiers[label])
+    return solutions
+
+
+def solve_parallel(engine, columns, rows, workers: int = None, split_depth: int = 2):
+    """
+    Enumerate every exact cover by fanning subtrees out to a process pool.
+    :param engine: The exact cover engine class, e.g. dlx.DLX.
+    :param columns: The (name, type) columns of the problem.
+    :param rows: The rows as lists of column indices.
+    :param workers: Number of worker processes, defaults to the CPU count.
+    :param split_depth: How many branching levels to split on.
+    :return: The solutions as sorted tuples of row labels.
+    """
+    prefixes = split_search(columns, rows, split_depth)
+
+    solutions = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(engine, columns, rows)) as executor:
+        for subtree_solutions in executor.map(_solve_subtree, prefixes):
+            solutions.extend(subtree_solutions)
+    return solutions
@@ -0,0 +1,214 @@
+from functools import lru_cache
+from itertools import repeat
+
+
+class PlacementIndex():
+    """ Every placement of every piece on the empty board.
+
+        Placements only depend on the board geometry and the pieces, never on
+        the date, so the index is built once and each request only drops the
+        placements that overlap its reserved cells.
+    """
+    def __init__(self, grid, tetrominos: dict, flips: bool = False, vectorized: bool = False,
+                 rotations: bool = True):
+        """ Build the index.
+
+            :param grid: The CalenderGrid to place pieces on.
+            :param tetrominos: The tetrominos keyed by piece name.
+            :param flips: Also place the mirror images of the pieces.
+            :param vectorized: Find the anchors of every orientation with
+                numpy instead of checking them one by one. Both build the
+                same rows in the same order.
+            :param rotations: Also place the rotations of the pieces.
+        """
+        self.piece_names = list(tetrominos.keys())
+        self.flips = flips
+        self.rotations = rotations
+
+        self._init_columns([
+            (i, j) for i in range(grid.rows) for j in range(grid.cols)
+            if grid.grid[i][j] is not None
+        ])
+        if vectorized:
+            self._build_placements_vectorized(grid, tetrominos)
+        else:
+            self._build_placements(grid, tetrominos)
+
+        self.available = lru_cache(maxsize=None)(self._available)
+        self.available_positions = lru_cache(maxsize=None)(self._available_positions)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """ Restore an index saved with to_dict, without placing any piece.
+
+            :param data: A dict returned by to_dict, e.g. loaded from JSON.
+            :return: The PlacementIndex.
+        """
+        index = cls.__new__(cls)
+        index.piece_names = list(data["piece_names"])
+        index.flips = data["flips"]
+        index.rotations = data["rotations"]
+        index._init_columns([tuple(cell) for cell in data["cells"]])
+
+        for row, (name, orientation, cells) in zip(data["rows"], data["metadata"]):
+            placement = len(index.rows)
+            cells = [tuple(cell) for cell in cells]
+            index.rows.append(row)
+            index.metadata.append((name, orientation, cells))
+            for cell in cells:
+                index.cell_placements[cell].add(placement)
+
+        index.available = lru_cache(maxsize=None)(index._available)
+        index.available_positions = lru_cache(maxsize=None)(index._available_positions)
+        return index
+
+    def to_dict(self) -> dict:
+        """ The placements as a JSON serializable dict, see from_dict."""
+        return {
+            "piece_names": self.piece_names,
+            "flips": self.flips,
+            "rotations": self.rotations,
+            "cells": self.cells,
+            "rows": self.rows,
+            "metadata": self.metadata,
+        }
+
+    def _init_columns(self, cells):
+        """ Set up the column layout shared by every date: one column per
+            usable cell in row-major order, then one column per piece.
+            INTERNAL USE ONLY.
+
+            :param cells: The usable (row, col) cells in row-major order.
+        """
+        self.cells = cells
+        self.cell_column = {cell: idx for idx, cell in enumerate(self.cells)}
+        self.piece_column = {
+            name: len(self.cells) + idx for idx, name in enumerate(self.piece_names)
+        }
+
+        self.rows = []
+        self.metadata = []
+        self.cell_placements = {cell: set() for cell in self.cells}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _build_placements(self, grid, tetrominos):
+        """ Place every distinct orientation of every piece at every anchor of
+            the board. Symmetric pieces have fewer orientations, so no two
+            rows ever cover the same cells with the same piece.
+            INTERNAL USE ONLY.
+        """
+        for name, tetromino in tetrominos.items():
+            for orientation, shape in enumerate(tetromino.orientations(self.flips, self.rotations)):
+                offsets = shape.cells()
+                height = max(i for i, _ in offsets) + 1
+                width = max(j for _, j in offsets) + 1
+
+                for row in range(grid.rows - height + 1):
+                    for col in range(grid.cols - width + 1):
+                        cells = [(row + i, col + j) for i, j in offsets]
+                        if any(cell not in self.cell_column for cell in cells):
+                            continue
+
+                        placement = len(self.rows)
+                        self.rows.append(
+                            [self.piece_column[name]] + [self.cell_column[cell] for cell in cells]
+                        )
+                        self.metadata.append((name, orientation, cells))
+                        for cell in cells:
+                            self.cell_placements[cell].add(placement)
+
+    def _build_placements_vectorized(self, grid, tetrominos):
+        """ Same placements as _build_placements, with the anchors of every
+            orientation found by anchor_columns and the per placement
+            bookkeeping done on whole arrays.
+            INTERNAL USE ONLY.
+        """
+        # imported here, numpy takes longer to import than the calendar
+        # board takes to build without it
+        import numpy as np
+
+        column_ids = np.full((grid.rows, grid.cols), -1, dtype=np.intp)
+        for (i, j), column in self.cell_column.items():
+            column_ids[i, j] = column
+
+        covered = []
+        for name, tetromino in tetrominos.items():
+            for orientation, shape in enumerate(tetromino.orientations(self.flips, self.rotations)):
+                offsets = shape.cells()
+                anchors, columns = anchor_columns(column_ids, offsets)
+
+                rows = np.empty((len(columns), len(offsets) + 1), dtype=np.intp)
+                rows[:, 0] = self.piece_column[name]
+                rows[:, 1:] = columns
+                self.rows.extend(rows.tolist())
+
+                # one list of (row, col) tuples per offset, zipped into the
+                # cells of every placement
+                cells = [
+                    zip((anchors[:, 0] + i).tolist(), (anchors[:, 1] + j).tolist())
+                    for i, j in offsets
+                ]
+                self.metadata.extend(zip(repeat(name), repeat(orientation), map(list, zip(*cells))))
+                covered.append(columns.ravel())
+
+        covered = np.concatenate(covered) if covered else np.empty(0, dtype=np.intp)
+        placements = np.repeat(np.arange(len(self.rows)), [len(row) - 1 for row in self.rows])
+        order = np.argsort(covered, kind="stable")
+        bounds = np.cumsum(np.bincount(covered, minlength=len(self.cells)))
+        for cell, placement_ids in zip(self.cells, np.split(placements[order], bounds[:-1])):
+            self.cell_placements[cell] = set(placement_ids.tolist())
+
+    def _available_positions(self, reserved_cells: frozenset):
+        """ Positions of the placements that avoid the reserved cells, in
+            index order. Cached per set of reserved cells through
+            self.available_positions.
+            INTERNAL USE ONLY.
+
+            :param reserved_cells: A frozenset of (row, col) cells to keep free.
+            :return: A tuple of positions into self.rows.
+        """
+        blocked = set()
+        for cell in reserved_cells:
+            blocked |= self.cell_placements.get(cell, set())
+        return tuple(p for p in range(len(self.rows)) if p not in blocked)
+
+    def _available(self, reserved_cells: frozenset):
+        """ Rows and metadata of the placements that avoid the reserved cells.
+            Cached per set of reserved cells through self.available.
+            INTERNAL USE ONLY.
+
+            :param reserved_cells: A frozenset of (row, col) cells to keep free.
+            :return: A (rows, metadata) pair of tuples.
+        """
+        placements = self.available_positions(reserved_cells)
+        return (
+            tuple(self.rows[p] for p in placements),
+            tuple(self.metadata[p] for p in placements),
+        )
+
+
+def anchor_columns(column_ids, offsets):
+    """
+    Find every anchor a shape fits at in one pass over a sliding window view
+    of the board.
+    :param column_ids: A 2D integer array of the column of every usable cell
+        of the board, -1 for the cells outside of it.
+    :param offsets: The (row, col) offsets of the shape's cells.
+    :return: An (anchors, columns) pair of integer arrays. anchors holds the
+        (row, col) of every anchor the shape fits at in row-major order, and
+        columns the columns of the covered cells, one row per anchor.
+    """
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    offsets = np.asarray(offsets, dtype=np.intp)
+    height, width = offsets.max(axis=0) + 1
+    if height > column_ids.shape[0] or width > column_ids.shape[1]:
+        return np.empty((0, 2), dtype=np.intp), np.empty((0, len(offsets)), dtype=column_ids.dtype)
+
+    # columns[r, c, k] is the column under cell k of the shape anchored at (r, c)
+    columns = sliding_window_view(column_ids, (height, width))[:, :, offsets[:, 0], offsets[:, 1]]
+    fits = (columns >= 0).all(axis=2)
+    return np.argwhere(fits), columns[fits]
@@ -0,0 +1,144 @@
+class DeadRegionPruner():
+    """ Rejects partial covers that leave a pocket of free cells no
+        combination of the remaining pieces can fill.
+
+        After a placement, the free cells around the placed piece are flood
+        filled into connected regions. A region is dead if its size is not a
+        sum of remaining piece sizes, which includes every region smaller
+        than the smallest remaining piece. Only regions touching the placed
+        piece can have changed shape, so the others are not filled again.
+
+        The flood fill runs on a row-major bitboard of the board, where a
+        neighbour step is a shift masked against wrapping into the next row.
+        Dead regions are small pockets in practice, so a region growing past
+        the largest unfillable size up to half the free cells is accepted
+        without filling it completely, and so is any region it touches.
+    """
+    def __init__(self, cell_columns: dict, piece_sizes: dict, reserved_cells=()):
+        """ Initialize the pruner.
+
+            :param cell_columns: The column index of every cell of the board,
+                keyed by (row, col).
+            :param piece_sizes: The number of cells of every piece, keyed by
+                the piece column index.
+            :param reserved_cells: Cells that stay uncovered and never count
+                as free.
+        """
+        self.width = max(col for _, col in cell_columns) + 1
+        self.piece_sizes = piece_sizes
+
+        self.cell_mask = 0
+        for cell, column in cell_columns.items():
+            if cell not in reserved_cells:
+                self.cell_mask |= 1 << column
+        self.piece_mask = 0
+        for column in piece_sizes:
+            self.piece_mask |= 1 << column
+
+        # runs of consecutive columns that map to consecutive board bits,
+        # translated with one mask and shift each
+        self.segments = []
+        for (row, col), column in sorted(cell_columns.items(), key=lambda item: item[1]):
+            shift = row * self.width + col - column
+            if self.segments and self.segments[-1][1] == shift and self.segments[-1][2] == column:
+                mask, _, _ = self.segments[-1]
+                self.segments[-1] = (mask | 1 << column, shift, column + 1)
+            else:
+                self.segments.append((1 << column, shift, column + 1))
+        self.segments = [(mask, shift) for mask, shift, _ in self.segments]
+
+        # board cells that can step left, resp. right, without wrapping
+        self.not_first_col = 0
+        self.not_last_col = 0
+        for row, col in cell_columns:
+            if col > 0:
+                self.not_first_col |= 1 << (row * self.width + col)
+            if col < self.width - 1:
+                self.not_last_col |= 1 << (row * self.width + col)
+
+        self._piece_limits = {}
+        self._row_borders = {}
+
+    def to_board(self, columns: int) -> int:
+        """ Translate a column mask to the padded board bitboard.
+
+            :param columns: A mask of column indices.
+            :return: The mask of the cells on the board.
+        """
+        board = 0
+        for mask, shift in self.segments:
+            board |= (columns & mask) << shift
+        return board
+
+    def _limits(self, remaining: int):
+        """ Sizes the remaining pieces can fill, memoized on the remaining
+            pieces in self._piece_limits.
+            INTERNAL USE ONLY.
+
+            :param remaining: The mask of the uncovered piece columns.
+            :return: A (sums, cap) pair where bit n of sums is set if n
+                cells can be filled exactly and cap is the largest region
+                size that is checked.
+        """
+        limits = self._piece_limits.get(remaining)
+        if limits is None:
+            sizes = [size for column, size in self.piece_sizes.items() if remaining >> column & 1]
+            sums = 1
+            for size in sizes:
+                sums |= sums << size
+
+            total = sum(sizes)
+            # 0 when the pieces can fill every size, e.g. with a monomino
+            cap = max((n for n in range(total // 2 + 1) if not sums >> n & 1), default=0)
+            limits = self._piece_limits[remaining] = (sums, cap)
+        return limits
+
+    def is_dead(self, covered: int, placed: int) -> bool:
+        """ Check if placing a row left a region no remaining pieces can fill.
+
+            :param covered: The mask of every column covered so far,
+                including the placed row.
+            :param placed: The mask of the placed row.
+            :return: True if the branch cannot lead to a solution.
+        """
+        remaining = self.piece_mask & ~covered
+        if not remaining:
+            return False
+        # the helpers are inlined, this runs for every candidate placement
+        limits = self._piece_limits.get(remaining)
+        sums, cap = limits if limits is not None else self._limits(remaining)
+
+        width = self.width
+        not_first_col = self.not_first_col
+        not_last_col = self.not_last_col
+        columns = self.cell_mask & ~covered
+        free = 0
+        for mask, shift in self.segments:
+            free |= (columns & mask) << shift
+
+        border = self._row_borders.get(placed)
+        if border is None:
+            piece = self.to_board(placed)
+            border = self._row_borders[placed] = (
+                ((piece & not_first_col) >> 1) | ((piece & not_last_col) << 1) | (piece << width) | (piece >> width)
+            )
+        seeds = border & free
+
+        large = 0
+        while seeds:
+            region = seeds & -seeds
+            size = 1
+            while True:
+                grown = (region | ((region & not_first_col) >> 1) | ((region & not_last_col) << 1)
+                         | (region << width) | (region >> width)) & free
+                if grown == region:
+                    if not sums >> size & 1:
+                        return True
+                    break
+                region = grown
+                size = region.bit_count()
+                if size > cap or region & large:
+                    large |= region
+                    break
+            seeds &= ~region
+        return False
@@ -0,0 +1,98 @@
+import time
+from contextlib import contextmanager
+
+
+class SearchStats():
+    """ Search tree metrics of one or more exact cover searches.
+
+        A node is a partial cover the search branches from. A backtrack is a
+        node without any row that fits the column it branches on, the dead
+        ends that make a date slow. Branching is tracked per depth, counted
+        from the rows that were already in use when the search started.
+    """
+    def __init__(self):
+        self.searches = 0
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.solutions = 0
+        self.placements = 0
+        self.level_nodes = []
+        self.level_branches = []
+        self.phases = {}
+
+    def record_node(self, depth: int, branches: int):
+        """ Record a search node.
+
+            :param depth: The number of rows placed by the search so far.
+            :param branches: The number of rows the node branches into.
+        """
+        self.nodes += 1
+        if branches == 0:
+            self.backtracks += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+        while len(self.level_nodes) <= depth:
+            self.level_nodes.append(0)
+            self.level_branches.append(0)
+        self.level_nodes[depth] += 1
+        self.level_branches[depth] += branches
+
+    @property
+    def branching_factor(self) -> list:
+        """ The average number of rows a node branches into, per depth."""
+        return [
+            branches / nodes if nodes else 0.0
+            for nodes, branches in zip(self.level_nodes, self.level_branches)
+        ]
+
+    @contextmanager
+    def phase(self, name: str):
+        """ Add the wall time of a block to a phase.
+
+            :param name: The phase name, e.g. "search".
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - start)
+
+    def add_phase(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def merge(self, other):
+        """ Add the metrics of another SearchStats to this one.
+
+            :param other: The SearchStats to add.
+        """
+        self.searches += other.searches
+        self.nodes += other.nodes
+        self.backtracks += other.backtracks
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.solutions += other.solutions
+        self.placements += other.placements
+
+        for depth, (nodes, branches) in enumerate(zip(other.level_nodes, other.level_branches)):
+            if depth == len(self.level_nodes):
+                self.level_nodes.append(0)
+                self.level_branches.append(0)
+            self.level_nodes[depth] += nodes
+            self.level_branches[depth] += branches
+
+        for name, seconds in other.phases.items():
+            self.add_phase(name, seconds)
+
+    def to_dict(self) -> dict:
+        """ The metrics as a JSON serializable dict."""
+        return {
+            "searches": self.searches,
+            "nodes": self.nodes,
+            "backtracks": self.backtracks,
+            "max_depth": self.max_depth,
+            "solutions": self.solutions,
+            "placements": self.placements,
+            "branching_factor": [round(value, 3) for value in self.branching_factor],
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+        }
@@ -0,0 +1,109 @@
+import argparse
+import os
+import pickle
+from datetime import date, timedelta
+
+from calendar_solver.calendar_solver.calendar_solver import (
+    CalenderSolver, get_placement_index, set_placement_index)
+from calendar_solver.calendar_solver.placement_index import PlacementIndex
+from calendar_solver.calendar_solver.solution_table import (puzzle_fingerprint,
+                                                            table_key)
+from calendar_solver.calendar_solver.util import get_hole_triple
+
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data", "startup_snapshot.pickle"
+)
+
+
+def _all_solutions(triple):
+    """ Solve a single hole triple for the snapshot builder.
+        INTERNAL USE ONLY.
+
+        :return: Every solution as sorted column names, in search order.
+    """
+    month, day, day_of_week = triple
+    solver = CalenderSolver(2024, month, day, day_of_week, engine="bitboard")
+    _, all_solutions = solver.solve_exact_cover()
+    return [sorted(sorted(step) for step in solution) for solution in all_solutions]
+
+
+def build_snapshot(path: str = DEFAULT_SNAPSHOT_PATH, start: date = None, days: int = 2):
+    """
+    Write the placement index of the calendar board and every solution of a
+    few dates to a file the servers load at startup.
+    :param path: Where to write the snapshot.
+    :param start: The first date to solve, defaults to today.
+    :param days: The number of dates to solve from start on.
+    :return: The number of hole triples written.
+    """
+    start = start or date.today()
+    triples = dict.fromkeys(get_hole_triple(start + timedelta(days=offset)) for offset in range(days))
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "fingerprint": puzzle_fingerprint(),
+        "index": get_placement_index().to_dict(),
+        "answers": {table_key(*triple): _all_solutions(triple) for triple in triples},
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return len(triples)
+
+
+class Snapshot():
+    """ The placement index of the calendar board and the solutions of the
+        dates it was built for.
+    """
+    def __init__(self, index: PlacementIndex, answers: dict):
+        self.index = index
+        self.answers = answers
+
+    def __len__(self):
+        return len(self.answers)
+
+    def lookup(self, month, day, day_of_week):
+        """ Look up every solution of a hole triple.
+
+            :return: The solutions in search order, so the first one is the
+                first solution of solve_exact_cover, or None if the triple is
+                not in the snapshot.
+        """
+        return self.answers.get(table_key(month, day, day_of_week))
+
+
+def load_snapshot(path: str = DEFAULT_SNAPSHOT_PATH):
+    """
+    Load a snapshot written by build_snapshot and share its placement index
+    with every later solver of the process, so nothing is built.
+    :param path: The path of the snapshot.
+    :return: A Snapshot, or None if the snapshot is missing or stale.
+    """
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    if snapshot.get("fingerprint") != puzzle_fingerprint():
+        return None
+
+    index = PlacementIndex.from_dict(snapshot["index"])
+    set_placement_index(index)
+    return Snapshot(index, snapshot["answers"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snapshot the placements and the solutions of the next dates.")
+    parser.add_argument("--output", default=DEFAULT_SNAPSHOT_PATH, help="Where to write the snapshot.")
+    parser.add_argument("--days", type=int, default=2, help="Number of dates from today to solve.")
+    args = parser.parse_args()
+
+    count = build_snapshot(args.output, days=args.days)
+    print(f"Wrote the placements and the solutions of {count} dates to {args.output}")
@@ -0,0 +1,343 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from calendar_solver.calendar_solver.calendar_solver import (
+    CalenderGrid, CalenderSolver, get_placement_index)
+from calendar_solver.calendar_solver.engines import row_label
+from calendar_solver.calendar_solver.util import iter_hole_triples
+from calendar_solver.calendar_solver.variant import load_variants
+
+STORE_VERSION = 1
+STORE_MAGIC = b"CTSS"
+DEFAULT_STORE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"
+)
+
+# file layout, little-endian:
+#   header:       magic, version, id width, piece count, triple count and the
+#                 fingerprint of the placement index the ids refer to
+#   offset table: (first solution, solution count) per hole triple, in the
+#                 order of iter_hole_triples
+#   solutions:    piece count ids per solution, the i-th being the position
+#                 of the placement among the placements of the i-th piece
+_HEADER = struct.Struct("<4sHBBI32s")
+_ENTRY = struct.Struct("<II")
+
+# solution count of a triple the builder skipped
+NOT_STORED = 0xFFFFFFFF
+
+_triple_positions = {}
+
+
+def triple_position(month, day, day_of_week) -> int:
+    """
+    Get the position of a hole triple in the offset table.
+    :return: The index of the triple in iter_hole_triples.
+    """
+    if not _triple_positions:
+        _triple_positions.update((triple, i) for i, triple in enumerate(iter_hole_triples()))
+    return _triple_positions[(month, day, day_of_week)]
+
+
+def store_path(variant=None, directory: str = DEFAULT_STORE_DIR) -> str:
+    """
+    Get the default path of the store of a variant.
+    :param variant: A Variant, or None for the built-in board.
+    :param directory: The directory of the stores.
+    :return: The path of the store file.
+    """
+    name = "all_solutions.bin" if variant is None else f"all_solutions-{variant.name}.bin"
+    return os.path.join(directory, name)
+
+
+def index_fingerprint(index) -> bytes:
+    """
+    Hash the pieces, cells and rows of a placement index. The ids of a store
+    only mean something for the exact index they were written with.
+    :param index: A PlacementIndex.
+    :return: The 32 byte SHA-256 digest.
+    """
+    encoded = json.dumps([index.piece_names, index.cells, index.rows]).encode("utf-8")
+    return hashlib.sha256(encoded).digest()
+
+
+def _piece_placements(index):
+    """ Split the placements of an index by piece.
+        INTERNAL USE ONLY.
+
+        :return: A (local_ids, placements) pair. local_ids maps every
+            placement to its (piece position, id among the piece's
+            placements), placements lists the placements of every piece.
+    """
+    positions = {name: position for position, name in enumerate(index.piece_names)}
+    placements = [[] for _ in index.piece_names]
+    local_ids = []
+    for placement, (name, _, _) in enumerate(index.metadata):
+        position = positions[name]
+        local_ids.append((position, len(placements[position])))
+        placements[position].append(placement)
+    return local_ids, placements
+
+
+_worker_indexes = {}
+
+
+def _solve_triple(task):
+    """ Enumerate and encode every solution of a hole triple for the builder.
+        INTERNAL USE ONLY.
+
+        :param task: A (triple, variant, id width) tuple.
+        :return: The triple, its solution count and the encoded solutions.
+    """
+    (month, day, day_of_week), variant, width = task
+    key = None if variant is None else variant.fingerprint
+    if key not in _worker_indexes:
+        index = get_placement_index(variant=variant)
+        placement_of_row = {tuple(row): placement for placement, row in enumerate(index.rows)}
+        _worker_indexes[key] = (placement_of_row, _piece_placements(index)[0])
+    placement_of_row, local_ids = _worker_indexes[key]
+
+    solver = CalenderSolver(2024, month, day, day_of_week, engine="bitboard", variant=variant)
+    exact_cover = solver._create_solver()
+
+    encoded = bytearray()
+    count = 0
+    for solution in solver._search(exact_cover):
+        ids = [0] * len(solver.tetrominos)
+        for identifier in solution:
+            position, local_id = local_ids[placement_of_row[tuple(solver.rows[row_label(exact_cover, identifier)])]]
+            ids[position] = local_id
+        encoded += encode_solution(ids, width)
+        count += 1
+    return (month, day, day_of_week), count, bytes(encoded)
+
+
+def id_width(index) -> int:
+    """
+    Get the bytes a store takes per placement id.
+    :param index: A PlacementIndex.
+    :return: 1 if no piece has more than 256 placements, else 2.
+    """
+    _, placements = _piece_placements(index)
+    return 1 if max(map(len, placements)) <= 256 else 2
+
+
+def encode_solution(ids, width: int) -> bytes:
+    """
+    Encode the placement ids of a solution like a store does.
+    :param ids: The id of every piece's placement among that piece's placements.
+    :param width: The bytes per id, see id_width.
+    :return: The encoded solution.
+    """
+    return b"".join(local_id.to_bytes(width, "little") for local_id in ids)
+
+
+def write_solution_store(path: str, index, results) -> int:
+    """
+    Write encoded solutions to a store.
+    :param path: Where to write the store.
+    :param index: The PlacementIndex the solutions were found with.
+    :param results: An iterable of (triple, solution count, encoded
+        solutions) tuples in any order. Triples it leaves out are marked as
+        not stored.
+    :return: The number of solutions written.
+    """
+    all_triples = list(iter_hole_triples())
+    table = [(0, NOT_STORED)] * len(all_triples)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    total = 0
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(STORE_MAGIC, STORE_VERSION, id_width(index), len(index.piece_names), len(all_triples),
+                             index_fingerprint(index)))
+        table_offset = f.tell()
+        f.write(bytes(_ENTRY.size * len(all_triples)))
+
+        for triple, count, encoded in results:
+            table[triple_position(*triple)] = (total, count)
+            f.write(encoded)
+            total += count
+
+        f.seek(table_offset)
+        f.write(b"".join(_ENTRY.pack(*entry) for entry in table))
+    os.replace(tmp_path, path)
+    return total
+
+
+def build_solution_store(path: str = None, variant=None, workers: int = None, triples=None, progress=None):
+    """
+    Enumerate every solution of every hole triple and write them to a store.
+    :param path: Where to write the store, defaults to store_path(variant).
+    :param variant: A Variant, or None for the built-in board.
+    :param workers: Number of worker processes, defaults to the CPU count.
+    :param triples: Only store these (month, day, day_of_week) triples, the
+        others are marked as not stored. Triples the board has no cells for
+        are never stored.
+    :param progress: Optional function called with (done, total) after every triple.
+    :return: The number of solutions written.
+    """
+    index = get_placement_index(variant=variant)
+    width = id_width(index)
+    labels = CalenderGrid(variant).grid_values.keys()
+    triples = [
+        triple for triple in (iter_hole_triples() if triples is None else triples)
+        if {triple[0].name, triple[1], triple[2].name} <= labels
+    ]
+
+    def results(executor):
+        tasks = [(triple, variant, width) for triple in triples]
+        for done, result in enumerate(executor.map(_solve_triple, tasks, chunksize=8), 1):
+            yield result
+            if progress is not None:
+                progress(done, len(tasks))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return write_solution_store(path or store_path(variant), index, results(executor))
+
+
+class SolutionStore():
+    """ Every solution of every hole triple, memory mapped read-only.
+
+        Lookups slice the mapping without reading or parsing anything else,
+        and processes mapping the same file share its pages.
+    """
+    def __init__(self, path: str, index):
+        """ Map a store written by build_solution_store.
+
+            :param path: The path of the store.
+            :param index: The PlacementIndex the store was built with.
+            :raises ValueError: If the file is not a store of this version
+                and placement index.
+        """
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, self.id_width, self.pieces, self.triples, fingerprint = \
+                _HEADER.unpack_from(self._mmap)
+        except struct.error as e:
+            self.close()
+            raise ValueError(f"{path} is not a solution store.") from e
+        if magic != STORE_MAGIC or version != STORE_VERSION or fingerprint != index_fingerprint(index):
+            self.close()
+            raise ValueError(f"{path} is not a solution store of this version and placement index.")
+
+        self.index = index
+        self.solution_size = self.pieces * self.id_width
+        self._data_offset = _HEADER.size + self.triples * _ENTRY.size
+        _, self._placements = _piece_placements(index)
+
+    def __len__(self):
+        """ The number of stored triples."""
+        return sum(
+            _ENTRY.unpack_from(self._mmap, _HEADER.size + i * _ENTRY.size)[1] != NOT_STORED
+            for i in range(self.triples)
+        )
+
+    def close(self):
+        self._mmap.close()
+
+    def _entry(self, month, day, day_of_week):
+        """ The (first solution, solution count) of a triple.
+            INTERNAL USE ONLY.
+        """
+        return _ENTRY.unpack_from(self._mmap, _HEADER.size + triple_position(month, day, day_of_week) * _ENTRY.size)
+
+    def count(self, month, day, day_of_week):
+        """ Count the solutions of a triple.
+
+            :return: The number of solutions, or None if the triple is not stored.
+        """
+        _, count = self._entry(month, day, day_of_week)
+        return None if count == NOT_STORED else count
+
+    def solutions(self, month, day, day_of_week):
+        """ The encoded solutions of a triple, without copying them.
+
+            :return: A memoryview of count * solution_size bytes, or None if
+                the triple is not stored.
+        """
+        first, count = self._entry(month, day, day_of_week)
+        if count == NOT_STORED:
+            return None
+        start = self._data_offset + first * self.solution_size
+        return memoryview(self._mmap)[start:start + count * self.solution_size]
+
+    def iter_placements(self, month, day, day_of_week, ranks=None):
+        """ Yield the solutions of a triple as placement index rows.
+
+            :param ranks: Only yield the solutions at these positions, in
+                this order. The positions are the same as the ones of
+                BitboardDLX.unrank.
+            :return: A generator of lists with one placement per piece, or
+                None if the triple is not stored.
+        """
+        encoded = self.solutions(month, day, day_of_week)
+        if encoded is None:
+            return None
+        return self._iter_placements(encoded, ranks)
+
+    def _iter_placements(self, encoded, ranks=None):
+        placements = self._placements
+        if self.id_width == 1:
+            # one byte per id, iterating the view yields them directly
+            ids = encoded
+        else:
+            ids = encoded.cast("H") if sys.byteorder == "little" else struct.unpack(f"<{len(encoded) // 2}H", encoded)
+        starts = range(0, len(ids), self.pieces) if ranks is None else (rank * self.pieces for rank in ranks)
+        for start in starts:
+            yield [placements[position][ids[start + position]] for position in range(self.pieces)]
+
+    def lookup(self, month, day, day_of_week):
+        """ Look up every solution of a triple.
+
+            :return: The solutions in the same format as the second value of
+                CalenderSolver.solve_exact_cover, or None if the triple is
+                not stored.
+        """
+        placements = self.iter_placements(month, day, day_of_week)
+        if placements is None:
+            return None
+
+        metadata = self.index.metadata
+        return [
+            [{f"piece_{metadata[p][0]}"} | {f"cell_{row}_{col}" for row, col in metadata[p][2]} for p in solution]
+            for solution in placements
+        ]
+
+
+def load_solution_store(path: str = None, variant=None):
+    """
+    Map the store of a variant.
+    :param path: The path of the store, defaults to store_path(variant).
+    :param variant: A Variant, or None for the built-in board.
+    :return: A SolutionStore, or None if the store is missing or stale.
+    """
+    try:
+        return SolutionStore(path or store_path(variant), get_placement_index(variant=variant))
+    except (OSError, ValueError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Store every solution of every hole triple.")
+    parser.add_argument("--variant", default=None, help="Name of a bundled variant, defaults to the built-in board.")
+    parser.add_argument("--output", default=None, help="Where to write the store.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    args = parser.parse_args()
+
+    variant = load_variants()[args.variant] if args.variant else None
+    output = args.output or store_path(variant)
+    count = build_solution_store(
+        output, variant, args.workers,
+        progress=lambda done, total: print(f"\r{done}/{total}", end="", file=sys.stderr, flush=True),
+    )
+    print(file=sys.stderr)
+    print(f"Wrote {count} solutions to {output}")
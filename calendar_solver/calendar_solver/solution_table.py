@@ -0,0 +1,130 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from calendar_solver.calendar_solver.calendar_solver import (
+    CalenderGrid, CalenderSolver, create_tetrominos)
+from calendar_solver.calendar_solver.util import (DayOfWeek, Month,
+                                                  get_calender_order,
+                                                  iter_hole_triples)
+
+TABLE_VERSION = 1
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data", "first_solutions.json"
+)
+
+
+def table_key(month: Month, day: int, day_of_week: DayOfWeek) -> str:
+    """
+    Get the key of a hole triple in the solution table.
+    :return: A string such as "APR-25-FRI".
+    """
+    return f"{month.name}-{day}-{day_of_week.name}"
+
+
+def puzzle_fingerprint() -> str:
+    """
+    Hash the board layout, cell labels and pieces. A table built for a
+    different puzzle definition is stale and must not be served.
+    :return: A hex digest identifying the current puzzle definition.
+    """
+    # only the definition, without building the placements of a solver
+    definition = {
+        "grid": [[cell is None for cell in row] for row in CalenderGrid().grid],
+        "order": [str(label) for label in get_calender_order()],
+        "tetrominos": {
+            name: [tetromino.name, tetromino.shape.shape]
+            for name, tetromino in create_tetrominos().items()
+        },
+    }
+    encoded = json.dumps(definition, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _solve_triple(triple):
+    """ Solve a single hole triple for the table builder.
+        INTERNAL USE ONLY.
+
+        :param triple: A (month, day, day_of_week) tuple.
+        :return: The table key and the first solution as sorted column names.
+    """
+    month, day, day_of_week = triple
+    solver = CalenderSolver(2024, month, day, day_of_week, engine="bitboard")
+    solution, _ = solver.solve_exact_cover(first_solution_only=True)
+    rows = sorted(sorted(step) for step in solution)
+    return table_key(month, day, day_of_week), rows
+
+
+def build_solution_table(path: str = DEFAULT_TABLE_PATH, workers: int = None):
+    """
+    Solve every valid hole triple once and write the first solutions to disk.
+    :param path: Where to write the table.
+    :param workers: Number of worker processes, defaults to the CPU count.
+    :return: The number of triples written.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        solutions = dict(executor.map(_solve_triple, iter_hole_triples(), chunksize=16))
+
+    table = {
+        "version": TABLE_VERSION,
+        "fingerprint": puzzle_fingerprint(),
+        "solutions": solutions,
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(table, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return len(solutions)
+
+
+class SolutionTable():
+    """ Precomputed first solutions for every hole triple."""
+    def __init__(self, solutions: dict):
+        self.solutions = solutions
+
+    def __len__(self):
+        return len(self.solutions)
+
+    def lookup(self, month: Month, day: int, day_of_week: DayOfWeek):
+        """ Look up the first solution of a hole triple.
+
+            :return: The solution rows in the same format as
+                CalenderSolver.solve_exact_cover, an empty list if the triple
+                has no solution, or None if the triple is not in the table.
+        """
+        return self.solutions.get(table_key(month, day, day_of_week))
+
+
+def load_solution_table(path: str = DEFAULT_TABLE_PATH):
+    """
+    Load a solution table written by build_solution_table.
+    :param path: The path of the table.
+    :return: A SolutionTable, or None if the table is missing or stale.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            table = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if table.get("version") != TABLE_VERSION:
+        return None
+    if table.get("fingerprint") != puzzle_fingerprint():
+        return None
+
+    return SolutionTable(table["solutions"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the first solution of every hole triple.")
+    parser.add_argument("--output", default=DEFAULT_TABLE_PATH, help="Where to write the table.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    args = parser.parse_args()
+
+    count = build_solution_table(args.output, args.workers)
+    print(f"Wrote {count} solutions to {args.output}")
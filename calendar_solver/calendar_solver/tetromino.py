@@ -8,8 +8,12 @@ class InvalidShapeError(Exception):
 
 class Shape:
     """
-    Class representing a shape in the Tetris game.
+    Immutable shape of a piece, stored as the filled (row, col) offsets of
+    its width x height bounding box. The four rotations of a shape are built
+    once and cached, so rotating never allocates again.
     """
+    __slots__ = ("width", "height", "offsets", "_rotated", "_cells")
+
     def __init__(self, width, height, shape):
         """
         Initialize a Shape object.
@@ -17,30 +21,134 @@ class Shape:
         :param height: The height of the shape.
         :param shape: A 2D list representing the shape.
         """
-        self.width = width
-        self.height = height
-        self.shape = shape
-        if not self.validate():
+        if len(shape) != height or any(len(row) != width for row in shape):
             raise InvalidShapeError("Shape does not match the given dimensions.")
+        offsets = tuple((i, j) for i, row in enumerate(shape) for j, cell in enumerate(row) if cell)
+        self._init(width, height, offsets)
+
+    def _init(self, width, height, offsets):
+        """
+        Set the slots, bypassing the immutability guard.
+        INTERNAL USE ONLY.
+        """
+        object.__setattr__(self, "width", width)
+        object.__setattr__(self, "height", height)
+        object.__setattr__(self, "offsets", offsets)
+        object.__setattr__(self, "_rotated", None)
+        object.__setattr__(self, "_cells", None)
+
+    @classmethod
+    def from_offsets(cls, width, height, offsets):
+        """
+        Create a Shape object from its filled cells.
+        :param width: The width of the shape.
+        :param height: The height of the shape.
+        :param offsets: The filled (row, col) offsets.
+        :return: The Shape object.
+        """
+        shape = cls.__new__(cls)
+        shape._init(width, height, tuple(sorted(offsets)))
+        return shape
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return Shape.from_offsets, (self.width, self.height, self.offsets)
+
+    def __eq__(self, other):
+        if not isinstance(other, Shape):
+            return NotImplemented
+        return (self.width, self.height, self.offsets) == (other.width, other.height, other.offsets)
+
+    def __hash__(self):
+        return hash((self.width, self.height, self.offsets))
+
+    @property
+    def shape(self) -> list:
+        """
+        Get the shape as a new 2D list of 0 and 1.
+        """
+        grid = [[0] * self.width for _ in range(self.height)]
+        for i, j in self.offsets:
+            grid[i][j] = 1
+        return grid
+
+    @property
+    def mask(self) -> int:
+        """
+        Get the shape as an integer with bit i * width + j set for every filled cell.
+        """
+        mask = 0
+        for i, j in self.offsets:
+            mask |= 1 << (i * self.width + j)
+        return mask
 
     def validate(self) -> bool:
         """
         Validate the Tetromino piece.
         :return: True if valid, False otherwise.
         """
-        if len(self.shape) != self.height:
-            return False
-        for row in self.shape:
-            if len(row) != self.width:
-                return False
-        return True
+        return all(0 <= i < self.height and 0 <= j < self.width for i, j in self.offsets)
 
     def rotate(self):
         """
-        Return a new Shape object rotated 90 degrees clockwise.
+        Return the Shape object rotated 90 degrees clockwise.
+        """
+        if self._rotated is None:
+            # build the whole cycle at once, so the fourth rotation is this
+            # shape again and every shape of the cycle shares the cache
+            cycle = [self]
+            for _ in range(3):
+                shape = cycle[-1]
+                cycle.append(Shape.from_offsets(
+                    shape.height, shape.width,
+                    [(j, shape.height - 1 - i) for i, j in shape.offsets]
+                ))
+            for shape, rotated in zip(cycle, cycle[1:] + cycle[:1]):
+                object.__setattr__(shape, "_rotated", rotated)
+        return self._rotated
+
+    def mirror(self):
+        """
+        Return a new Shape object mirrored left to right.
+        """
+        return Shape.from_offsets(self.width, self.height, [(i, self.width - 1 - j) for i, j in self.offsets])
+
+    def cells(self) -> tuple:
+        """
+        Get the normalized cells of the shape, which identify an orientation
+        regardless of empty border rows and columns.
+        :return: A sorted tuple of (row, col) offsets from the top left filled cell bounds.
+        """
+        if self._cells is None:
+            top = min(i for i, _ in self.offsets)
+            left = min(j for _, j in self.offsets)
+            object.__setattr__(self, "_cells", tuple(sorted((i - top, j - left) for i, j in self.offsets)))
+        return self._cells
+
+    def orientations(self, flips: bool = False, rotations: bool = True) -> list:
+        """
+        Get the distinct orientations of the shape.
+        :param flips: Also include the mirror images, for pieces that may be
+            turned over.
+        :param rotations: Include the rotations, False keeps the shape (and
+            its mirror image) as drawn.
+        :return: A list of Shape objects in rotation order, starting with this
+            shape, without two of them covering the same cells.
         """
-        rotated_shape = [list(row) for row in zip(*self.shape[::-1])]
-        return Shape(self.height, self.width, rotated_shape)
+        orientations = []
+        seen = set()
+        for shape in [self, self.mirror()] if flips else [self]:
+            for _ in range(4 if rotations else 1):
+                if shape.cells() not in seen:
+                    seen.add(shape.cells())
+                    orientations.append(shape)
+                shape = shape.rotate()
+        return orientations
 
     def __repr__(self):
         return f"Shape(width={self.width}, height={self.height}, shape={self.shape})"
@@ -49,24 +157,83 @@ class Shape:
 class Tetromino:
     """
     General class for Tetromino pieces.
+
+    A Tetromino is immutable apart from its current orientation, which
+    rotate_clockwise still turns in place. Equality and the hash only depend
+    on the name and the set of orientations, so turning a piece never
+    changes its identity as a key.
     """
+    __slots__ = ("shape", "name", "_key")
+
     def __init__(self, shape: Shape, name: str):
         """
         Initialize a Tetromino piece.
         :param shape: A Shape object representing the piece.
         :param name: A string name for the piece (e.g., "L", "T").
         """
-        self.shape = shape
-        self.name = name
+        object.__setattr__(self, "shape", shape)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "_key", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _identity(self):
+        """
+        Get the name and the orientations, cached.
+        INTERNAL USE ONLY.
+        """
+        if self._key is None:
+            orientations = frozenset(shape.cells() for shape in self.shape.orientations())
+            object.__setattr__(self, "_key", (self.name, orientations))
+        return self._key
+
+    def __reduce__(self):
+        return Tetromino, (self.shape, self.name)
+
+    def __eq__(self, other):
+        if not isinstance(other, Tetromino):
+            return NotImplemented
+        return self._identity() == other._identity()
+
+    def __hash__(self):
+        return hash(self._identity())
 
     def rotate_clockwise(self, degrees: int = 90):
         """
         Rotate the Tetromino piece by rotating its shape.
         """
+        object.__setattr__(self, "shape", self._rotate(degrees))
+
+    def rotated(self, degrees: int = 90):
+        """
+        Return a new Tetromino piece rotated clockwise, leaving this one as it is.
+        """
+        return Tetromino(self._rotate(degrees), self.name)
+
+    def _rotate(self, degrees):
+        """
+        Get the shape rotated clockwise by a multiple of 90 degrees.
+        INTERNAL USE ONLY.
+        """
         if degrees % 90 != 0:
             raise ValueError("Rotation degrees must be a multiple of 90.")
-        for _ in range(degrees // 90):
-            self.shape = self.shape.rotate()
+        shape = self.shape
+        for _ in range(degrees // 90 % 4):
+            shape = shape.rotate()
+        return shape
+
+    def orientations(self, flips: bool = False, rotations: bool = True) -> list:
+        """
+        Get the distinct orientations of the Tetromino piece.
+        :param flips: Also include the mirror images.
+        :param rotations: Include the rotations.
+        :return: A list of Shape objects, see Shape.orientations.
+        """
+        return self.shape.orientations(flips, rotations)
 
     def get_dimensions(self):
         """
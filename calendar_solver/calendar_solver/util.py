@@ -1,3 +1,4 @@
+import random
 from enum import Enum
 
 calender_order = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG",
@@ -6,6 +7,8 @@ calender_order = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG",
                   26, 27, 28, 29, 30, 31, "SUN", "MON", "TUE", "WED", "THU",
                   "FRI", "SAT"]
 
+max_days_in_month = [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
 class Month(Enum):
     """
     Enum for the months of the year.
@@ -42,12 +45,32 @@ def get_calender_order():
     """
     return calender_order
 
+def iter_hole_triples():
+    """
+    Iterate over every (month, day, day_of_week) combination the puzzle can
+    be asked to solve. February 29th is included since the board does not
+    depend on the year.
+    :return: A generator of (Month, int, DayOfWeek) tuples.
+    """
+    for month in Month:
+        for day in range(1, max_days_in_month[month.value - 1] + 1):
+            for day_of_week in DayOfWeek:
+                yield month, day, day_of_week
+
 def format_month(month: int) -> Month:
     return Month(month)
 
 def format_day_of_week(weekday: int) -> DayOfWeek:
     return DayOfWeek((weekday + 1) % 7)
 
+def get_hole_triple(date):
+    """
+    Get the cells a date leaves uncovered on the board.
+    :param date: A datetime.date or datetime.datetime.
+    :return: A tuple of (month, day, day_of_week).
+    """
+    return format_month(date.month), date.day, format_day_of_week(date.weekday())
+
 def get_today(days_forward: int = 0):
     """
     Get today's date.
@@ -67,3 +90,13 @@ def get_today(days_forward: int = 0):
     month = format_month(_month)
     
     return year, month, day, day_of_week
+
+def sample_ranks(total: int, k: int, seed: int = None):
+    """
+    Draw distinct solution positions uniformly at random.
+    :param total: The number of solutions.
+    :param k: The number of positions to draw, all of them if there are fewer.
+    :param seed: Seed of the draw, the same seed draws the same positions.
+    :return: A list of min(k, total) positions in random order.
+    """
+    return random.Random(seed).sample(range(total), min(k, total))
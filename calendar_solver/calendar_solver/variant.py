@@ -0,0 +1,198 @@
+import argparse
+import hashlib
+import json
+import os
+
+from calendar_solver.calendar_solver.placement_index import PlacementIndex
+from calendar_solver.calendar_solver.tetromino import (InvalidShapeError,
+                                                       Shape, Tetromino)
+
+INDEX_VERSION = 1
+DEFAULT_VARIANTS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "variants"
+)
+DEFAULT_INDEX_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data", "placement_indexes"
+)
+
+# boards with at least this many cells build their index with numpy
+VECTORIZED_MIN_CELLS = 100
+
+
+class Variant():
+    """ A puzzle definition: the board, the label of every cell, the pieces
+        and whether pieces may be rotated or turned over.
+
+        A variant has the rows, cols, grid and grid_values of a CalenderGrid,
+        so a PlacementIndex can be built on it directly.
+    """
+    def __init__(self, name: str, board: list, pieces: dict, flips: bool = False, rotations: bool = True):
+        """ Initialize and validate a variant.
+
+            :param name: The name requests select the variant by.
+            :param board: The rows of the board, each a list with the label
+                of every cell and None for the cells cut out of the board.
+            :param pieces: The pieces keyed by piece name, each a dict with
+                the short "name" and the "shape" as a 2D list of 0 and 1.
+            :param flips: Pieces may be turned over.
+            :param rotations: Pieces may be rotated.
+            :raises ValueError: If the definition is not a valid puzzle.
+        """
+        if not board or not board[0] or any(len(row) != len(board[0]) for row in board):
+            raise ValueError(f"Variant {name!r}: the board must be a non-empty rectangle.")
+
+        self.name = name
+        self.board = [list(row) for row in board]
+        self.rows = len(board)
+        self.cols = len(board[0])
+        self.grid = [[None if label is None else 0 for label in row] for row in self.board]
+
+        self.grid_values = {}
+        for i, row in enumerate(self.board):
+            for j, label in enumerate(row):
+                if label is None:
+                    continue
+                if label in self.grid_values:
+                    raise ValueError(f"Variant {name!r}: the label {label!r} is used twice.")
+                self.grid_values[label] = (i, j)
+
+        self.pieces = {
+            key: {"name": piece["name"], "shape": [list(row) for row in piece["shape"]]}
+            for key, piece in pieces.items()
+        }
+        self.flips = flips
+        self.rotations = rotations
+
+        # build the pieces once, so invalid shapes are rejected here
+        tetrominos = self.create_tetrominos()
+        if sum(len(tetromino.shape.offsets) for tetromino in tetrominos.values()) > len(self.grid_values):
+            raise ValueError(f"Variant {name!r}: the pieces cover more cells than the board has.")
+
+        encoded = json.dumps(self.to_dict(), sort_keys=True).encode("utf-8")
+        self.fingerprint = hashlib.sha256(encoded).hexdigest()
+
+    def __repr__(self):
+        return f"Variant(name={self.name}, rows={self.rows}, cols={self.cols}, pieces={len(self.pieces)})"
+
+    def create_tetrominos(self) -> dict:
+        """ Create the pieces of the variant.
+
+            :return: A dict of piece name to Tetromino.
+        """
+        tetrominos = {}
+        for key, piece in self.pieces.items():
+            shape = piece["shape"]
+            try:
+                if not shape or not any(map(any, shape)):
+                    raise InvalidShapeError("A piece must cover at least one cell.")
+                tetrominos[key] = Tetromino(Shape(len(shape[0]), len(shape), shape), piece["name"])
+            except InvalidShapeError as e:
+                raise ValueError(f"Variant {self.name!r}: piece {key!r}: {e}") from e
+        return tetrominos
+
+    def to_dict(self) -> dict:
+        """ The definition as a JSON serializable dict, without the name, so
+            renaming a variant does not change its fingerprint.
+        """
+        return {
+            "board": self.board,
+            "pieces": self.pieces,
+            "flips": self.flips,
+            "rotations": self.rotations,
+        }
+
+
+def load_variant(path: str) -> Variant:
+    """
+    Load a variant definition from a JSON file.
+    :param path: The path of the file.
+    :return: The Variant, named after the "name" of the file or its file name.
+    :raises ValueError: If the file is not a valid variant definition.
+    """
+    with open(path, encoding="utf-8") as f:
+        definition = json.load(f)
+
+    name = definition.get("name", os.path.splitext(os.path.basename(path))[0])
+    try:
+        return Variant(
+            name,
+            definition["board"],
+            definition["pieces"],
+            definition.get("flips", False),
+            definition.get("rotations", True),
+        )
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Variant {name!r}: invalid definition in {path}: {e!r}") from e
+
+
+def load_variants(directory: str = DEFAULT_VARIANTS_DIR) -> dict:
+    """
+    Load every variant definition of a directory.
+    :param directory: The directory with the *.json definitions.
+    :return: A dict of variant name to Variant.
+    :raises ValueError: If a definition is invalid or two share a name.
+    """
+    variants = {}
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith(".json"):
+            continue
+        variant = load_variant(os.path.join(directory, file_name))
+        if variant.name in variants:
+            raise ValueError(f"Variant {variant.name!r} is defined twice in {directory}.")
+        variants[variant.name] = variant
+    return variants
+
+
+def compile_variant(variant: Variant, index_dir: str = None) -> PlacementIndex:
+    """
+    Get the placement index of a variant, built once and kept on disk under
+    the variant's fingerprint.
+    :param variant: The Variant to compile.
+    :param index_dir: The directory of the compiled indexes, defaults to
+        SOLVER_INDEX_DIR or DEFAULT_INDEX_DIR.
+    :return: The PlacementIndex of the variant.
+    """
+    index_dir = index_dir or os.environ.get("SOLVER_INDEX_DIR") or DEFAULT_INDEX_DIR
+    path = os.path.join(index_dir, f"{variant.fingerprint}.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            compiled = json.load(f)
+        if compiled.get("version") == INDEX_VERSION and compiled.get("fingerprint") == variant.fingerprint:
+            return PlacementIndex.from_dict(compiled["index"])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    index = PlacementIndex(
+        variant, variant.create_tetrominos(), variant.flips,
+        vectorized=len(variant.grid_values) >= VECTORIZED_MIN_CELLS,
+        rotations=variant.rotations,
+    )
+    compiled = {
+        "version": INDEX_VERSION,
+        "fingerprint": variant.fingerprint,
+        "index": index.to_dict(),
+    }
+
+    # the compiled index only saves time, a read-only disk is not an error
+    try:
+        os.makedirs(index_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(compiled, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile the placement index of every puzzle variant.")
+    parser.add_argument("--variants", default=DEFAULT_VARIANTS_DIR, help="Directory of the variant definitions.")
+    parser.add_argument("--output", default=None,
+                        help="Where to write the compiled indexes, defaults to SOLVER_INDEX_DIR or the package data.")
+    args = parser.parse_args()
+
+    for variant in load_variants(args.variants).values():
+        index = compile_variant(variant, args.output)
+        print(f"{variant.name}: {len(index)} placements, {variant.fingerprint[:12]}")
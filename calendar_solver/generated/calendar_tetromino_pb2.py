@@ -25,23 +25,43 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18\x63\x61lendar_tetromino.proto\x12\x11\x63\x61lendartetromino\x1a\x1fgoogle/protobuf/timestamp.proto\"9\n\rPuzzleRequest\x12(\n\x04\x64\x61te\x18\x01 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"C\n\x0ePuzzleSolution\x12\x31\n\x0fsolution_pieces\x18\x01 \x03(\x0b\x32\x18.calendartetromino.Piece\"G\n\x0fPuzzleSolutions\x12\x34\n\tsolutions\x18\x01 \x03(\x0b\x32!.calendartetromino.PuzzleSolution\"G\n\x05Piece\x12\x16\n\x0etetromino_name\x18\x01 \x01(\t\x12&\n\x05\x63\x65lls\x18\x02 \x03(\x0b\x32\x17.calendartetromino.Cell\" \n\x04\x43\x65ll\x12\x0b\n\x03row\x18\x01 \x01(\t\x12\x0b\n\x03\x63ol\x18\x02 \x01(\t2\xc6\x01\n\x0fTetrominoSolver\x12R\n\x0bSolvePuzzle\x12 .calendartetromino.PuzzleRequest\x1a!.calendartetromino.PuzzleSolution\x12_\n\x17SolvePuzzleAllSolutions\x12 .calendartetromino.PuzzleRequest\x1a\".calendartetromino.PuzzleSolutionsb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18\x63\x61lendar_tetromino.proto\x12\x11\x63\x61lendartetromino\x1a\x1fgoogle/protobuf/timestamp.proto\"[\n\rPuzzleRequest\x12(\n\x04\x64\x61te\x18\x01 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x0f\n\x07\x63ompact\x18\x02 \x01(\x08\x12\x0f\n\x07variant\x18\x03 \x01(\t\"\xbf\x01\n\x12PuzzleBatchRequest\x12.\n\nstart_date\x18\x01 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12,\n\x08\x65nd_date\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12)\n\x05\x64\x61tes\x18\x03 \x03(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x0f\n\x07\x63ompact\x18\x04 \x01(\x08\x12\x0f\n\x07variant\x18\x05 \x01(\t\"\xa7\x01\n\x11\x43ompletionRequest\x12(\n\x04\x64\x61te\x18\x01 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12/\n\rplaced_pieces\x18\x02 \x03(\x0b\x32\x18.calendartetromino.Piece\x12\x15\n\rall_solutions\x18\x03 \x01(\x08\x12\x0f\n\x07\x63ompact\x18\x04 \x01(\x08\x12\x0f\n\x07variant\x18\x05 \x01(\t\"\x86\x01\n\rSampleRequest\x12(\n\x04\x64\x61te\x18\x01 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\r\n\x05\x63ount\x18\x02 \x01(\r\x12\x11\n\x04seed\x18\x03 \x01(\x04H\x00\x88\x01\x01\x12\x0f\n\x07\x63ompact\x18\x04 \x01(\x08\x12\x0f\n\x07variant\x18\x05 \x01(\tB\x07\n\x05_seed\"j\n\x0ePuzzleSolution\x12\x31\n\x0fsolution_pieces\x18\x01 \x03(\x0b\x32\x18.calendartetromino.Piece\x12\x11\n\tpiece_ids\x18\x02 \x03(\r\x12\x12\n\ncell_masks\x18\x03 \x03(\x04\"X\n\x0fPuzzleSolutions\x12\x34\n\tsolutions\x18\x01 \x03(\x0b\x32!.calendartetromino.PuzzleSolution\x12\x0f\n\x07partial\x18\x02 \x01(\x08\"t\n\x13\x44\x61tedPuzzleSolution\x12(\n\x04\x64\x61te\x18\x01 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x33\n\x08solution\x18\x02 \x01(\x0b\x32!.calendartetromino.PuzzleSolution\"\x1e\n\rSolutionCount\x12\r\n\x05\x63ount\x18\x01 \x01(\x04\"\x0e\n\x0cStatsRequest\"\xc2\x02\n\x0bSolverStats\x12\x10\n\x08searches\x18\x01 \x01(\x04\x12\r\n\x05nodes\x18\x02 \x01(\x04\x12\x12\n\nbacktracks\x18\x03 \x01(\x04\x12\x11\n\tmax_depth\x18\x04 \x01(\r\x12\x11\n\tsolutions\x18\x05 \x01(\x04\x12\x12\n\nplacements\x18\x06 \x01(\x04\x12\x18\n\x10\x62ranching_factor\x18\x07 \x03(\x01\x12G\n\rphase_seconds\x18\x08 \x03(\x0b\x32\x30.calendartetromino.SolverStats.PhaseSecondsEntry\x12,\n\x05\x63\x61\x63he\x18\t \x01(\x0b\x32\x1d.calendartetromino.CacheStats\x1a\x33\n\x11PhaseSecondsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"s\n\nCacheStats\x12\x0c\n\x04size\x18\x01 \x01(\x04\x12\x0c\n\x04hits\x18\x02 \x01(\x04\x12\x0e\n\x06misses\x18\x03 \x01(\x04\x12\x11\n\tcoalesced\x18\x04 \x01(\x04\x12\x11\n\tevictions\x18\x05 \x01(\x04\x12\x13\n\x0b\x65xpirations\x18\x06 \x01(\x04\"G\n\x05Piece\x12\x16\n\x0etetromino_name\x18\x01 \x01(\t\x12&\n\x05\x63\x65lls\x18\x02 \x03(\x0b\x32\x17.calendartetromino.Cell\" \n\x04\x43\x65ll\x12\x0b\n\x03row\x18\x01 \x01(\t\x12\x0b\n\x03\x63ol\x18\x02 \x01(\t2\xe3\x05\n\x0fTetrominoSolver\x12R\n\x0bSolvePuzzle\x12 .calendartetromino.PuzzleRequest\x1a!.calendartetromino.PuzzleSolution\x12_\n\x17SolvePuzzleAllSolutions\x12 .calendartetromino.PuzzleRequest\x1a\".calendartetromino.PuzzleSolutions\x12^\n\x15StreamPuzzleSolutions\x12 .calendartetromino.PuzzleRequest\x1a!.calendartetromino.PuzzleSolution0\x01\x12T\n\x0e\x43ountSolutions\x12 .calendartetromino.PuzzleRequest\x1a .calendartetromino.SolutionCount\x12\x63\n\x10SolvePuzzleBatch\x12%.calendartetromino.PuzzleBatchRequest\x1a&.calendartetromino.DatedPuzzleSolution0\x01\x12K\n\x08GetStats\x12\x1f.calendartetromino.StatsRequest\x1a\x1e.calendartetromino.SolverStats\x12Z\n\x0e\x43ompletePuzzle\x12$.calendartetromino.CompletionRequest\x1a\".calendartetromino.PuzzleSolutions\x12W\n\x0fSampleSolutions\x12 .calendartetromino.SampleRequest\x1a\".calendartetromino.PuzzleSolutionsb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'calendar_tetromino_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_SOLVERSTATS_PHASESECONDSENTRY']._loaded_options = None
+  _globals['_SOLVERSTATS_PHASESECONDSENTRY']._serialized_options = b'8\001'
   _globals['_PUZZLEREQUEST']._serialized_start=80
-  _globals['_PUZZLEREQUEST']._serialized_end=137
-  _globals['_PUZZLESOLUTION']._serialized_start=139
-  _globals['_PUZZLESOLUTION']._serialized_end=206
-  _globals['_PUZZLESOLUTIONS']._serialized_start=208
-  _globals['_PUZZLESOLUTIONS']._serialized_end=279
-  _globals['_PIECE']._serialized_start=281
-  _globals['_PIECE']._serialized_end=352
-  _globals['_CELL']._serialized_start=354
-  _globals['_CELL']._serialized_end=386
-  _globals['_TETROMINOSOLVER']._serialized_start=389
-  _globals['_TETROMINOSOLVER']._serialized_end=587
+  _globals['_PUZZLEREQUEST']._serialized_end=171
+  _globals['_PUZZLEBATCHREQUEST']._serialized_start=174
+  _globals['_PUZZLEBATCHREQUEST']._serialized_end=365
+  _globals['_COMPLETIONREQUEST']._serialized_start=368
+  _globals['_COMPLETIONREQUEST']._serialized_end=535
+  _globals['_SAMPLEREQUEST']._serialized_start=538
+  _globals['_SAMPLEREQUEST']._serialized_end=672
+  _globals['_PUZZLESOLUTION']._serialized_start=674
+  _globals['_PUZZLESOLUTION']._serialized_end=780
+  _globals['_PUZZLESOLUTIONS']._serialized_start=782
+  _globals['_PUZZLESOLUTIONS']._serialized_end=870
+  _globals['_DATEDPUZZLESOLUTION']._serialized_start=872
+  _globals['_DATEDPUZZLESOLUTION']._serialized_end=988
+  _globals['_SOLUTIONCOUNT']._serialized_start=990
+  _globals['_SOLUTIONCOUNT']._serialized_end=1020
+  _globals['_STATSREQUEST']._serialized_start=1022
+  _globals['_STATSREQUEST']._serialized_end=1036
+  _globals['_SOLVERSTATS']._serialized_start=1039
+  _globals['_SOLVERSTATS']._serialized_end=1361
+  _globals['_SOLVERSTATS_PHASESECONDSENTRY']._serialized_start=1310
+  _globals['_SOLVERSTATS_PHASESECONDSENTRY']._serialized_end=1361
+  _globals['_CACHESTATS']._serialized_start=1363
+  _globals['_CACHESTATS']._serialized_end=1478
+  _globals['_PIECE']._serialized_start=1480
+  _globals['_PIECE']._serialized_end=1551
+  _globals['_CELL']._serialized_start=1553
+  _globals['_CELL']._serialized_end=1585
+  _globals['_TETROMINOSOLVER']._serialized_start=1588
+  _globals['_TETROMINOSOLVER']._serialized_end=2327
 # @@protoc_insertion_point(module_scope)
@@ -7,22 +7,137 @@ from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Map
 DESCRIPTOR: _descriptor.FileDescriptor
 
 class PuzzleRequest(_message.Message):
-    __slots__ = ("date",)
+    __slots__ = ("date", "compact", "variant")
     DATE_FIELD_NUMBER: _ClassVar[int]
+    COMPACT_FIELD_NUMBER: _ClassVar[int]
+    VARIANT_FIELD_NUMBER: _ClassVar[int]
     date: _timestamp_pb2.Timestamp
-    def __init__(self, date: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ...) -> None: ...
+    compact: bool
+    variant: str
+    def __init__(self, date: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., compact: bool = ..., variant: _Optional[str] = ...) -> None: ...
+
+class PuzzleBatchRequest(_message.Message):
+    __slots__ = ("start_date", "end_date", "dates", "compact", "variant")
+    START_DATE_FIELD_NUMBER: _ClassVar[int]
+    END_DATE_FIELD_NUMBER: _ClassVar[int]
+    DATES_FIELD_NUMBER: _ClassVar[int]
+    COMPACT_FIELD_NUMBER: _ClassVar[int]
+    VARIANT_FIELD_NUMBER: _ClassVar[int]
+    start_date: _timestamp_pb2.Timestamp
+    end_date: _timestamp_pb2.Timestamp
+    dates: _containers.RepeatedCompositeFieldContainer[_timestamp_pb2.Timestamp]
+    compact: bool
+    variant: str
+    def __init__(self, start_date: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., end_date: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., dates: _Optional[_Iterable[_Union[_timestamp_pb2.Timestamp, _Mapping]]] = ..., compact: bool = ..., variant: _Optional[str] = ...) -> None: ...
+
+class CompletionRequest(_message.Message):
+    __slots__ = ("date", "placed_pieces", "all_solutions", "compact", "variant")
+    DATE_FIELD_NUMBER: _ClassVar[int]
+    PLACED_PIECES_FIELD_NUMBER: _ClassVar[int]
+    ALL_SOLUTIONS_FIELD_NUMBER: _ClassVar[int]
+    COMPACT_FIELD_NUMBER: _ClassVar[int]
+    VARIANT_FIELD_NUMBER: _ClassVar[int]
+    date: _timestamp_pb2.Timestamp
+    placed_pieces: _containers.RepeatedCompositeFieldContainer[Piece]
+    all_solutions: bool
+    compact: bool
+    variant: str
+    def __init__(self, date: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., placed_pieces: _Optional[_Iterable[_Union[Piece, _Mapping]]] = ..., all_solutions: bool = ..., compact: bool = ..., variant: _Optional[str] = ...) -> None: ...
+
+class SampleRequest(_message.Message):
+    __slots__ = ("date", "count", "seed", "compact", "variant")
+    DATE_FIELD_NUMBER: _ClassVar[int]
+    COUNT_FIELD_NUMBER: _ClassVar[int]
+    SEED_FIELD_NUMBER: _ClassVar[int]
+    COMPACT_FIELD_NUMBER: _ClassVar[int]
+    VARIANT_FIELD_NUMBER: _ClassVar[int]
+    date: _timestamp_pb2.Timestamp
+    count: int
+    seed: int
+    compact: bool
+    variant: str
+    def __init__(self, date: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., count: _Optional[int] = ..., seed: _Optional[int] = ..., compact: bool = ..., variant: _Optional[str] = ...) -> None: ...
 
 class PuzzleSolution(_message.Message):
-    __slots__ = ("solution_pieces",)
+    __slots__ = ("solution_pieces", "piece_ids", "cell_masks")
     SOLUTION_PIECES_FIELD_NUMBER: _ClassVar[int]
+    PIECE_IDS_FIELD_NUMBER: _ClassVar[int]
+    CELL_MASKS_FIELD_NUMBER: _ClassVar[int]
     solution_pieces: _containers.RepeatedCompositeFieldContainer[Piece]
-    def __init__(self, solution_pieces: _Optional[_Iterable[_Union[Piece, _Mapping]]] = ...) -> None: ...
+    piece_ids: _containers.RepeatedScalarFieldContainer[int]
+    cell_masks: _containers.RepeatedScalarFieldContainer[int]
+    def __init__(self, solution_pieces: _Optional[_Iterable[_Union[Piece, _Mapping]]] = ..., piece_ids: _Optional[_Iterable[int]] = ..., cell_masks: _Optional[_Iterable[int]] = ...) -> None: ...
 
 class PuzzleSolutions(_message.Message):
-    __slots__ = ("solutions",)
+    __slots__ = ("solutions", "partial")
     SOLUTIONS_FIELD_NUMBER: _ClassVar[int]
+    PARTIAL_FIELD_NUMBER: _ClassVar[int]
     solutions: _containers.RepeatedCompositeFieldContainer[PuzzleSolution]
-    def __init__(self, solutions: _Optional[_Iterable[_Union[PuzzleSolution, _Mapping]]] = ...) -> None: ...
+    partial: bool
+    def __init__(self, solutions: _Optional[_Iterable[_Union[PuzzleSolution, _Mapping]]] = ..., partial: bool = ...) -> None: ...
+
+class DatedPuzzleSolution(_message.Message):
+    __slots__ = ("date", "solution")
+    DATE_FIELD_NUMBER: _ClassVar[int]
+    SOLUTION_FIELD_NUMBER: _ClassVar[int]
+    date: _timestamp_pb2.Timestamp
+    solution: PuzzleSolution
+    def __init__(self, date: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., solution: _Optional[_Union[PuzzleSolution, _Mapping]] = ...) -> None: ...
+
+class SolutionCount(_message.Message):
+    __slots__ = ("count",)
+    COUNT_FIELD_NUMBER: _ClassVar[int]
+    count: int
+    def __init__(self, count: _Optional[int] = ...) -> None: ...
+
+class StatsRequest(_message.Message):
+    __slots__ = ()
+    def __init__(self) -> None: ...
+
+class SolverStats(_message.Message):
+    __slots__ = ("searches", "nodes", "backtracks", "max_depth", "solutions", "placements", "branching_factor", "phase_seconds", "cache")
+    class PhaseSecondsEntry(_message.Message):
+        __slots__ = ("key", "value")
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: float
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[float] = ...) -> None: ...
+    SEARCHES_FIELD_NUMBER: _ClassVar[int]
+    NODES_FIELD_NUMBER: _ClassVar[int]
+    BACKTRACKS_FIELD_NUMBER: _ClassVar[int]
+    MAX_DEPTH_FIELD_NUMBER: _ClassVar[int]
+    SOLUTIONS_FIELD_NUMBER: _ClassVar[int]
+    PLACEMENTS_FIELD_NUMBER: _ClassVar[int]
+    BRANCHING_FACTOR_FIELD_NUMBER: _ClassVar[int]
+    PHASE_SECONDS_FIELD_NUMBER: _ClassVar[int]
+    CACHE_FIELD_NUMBER: _ClassVar[int]
+    searches: int
+    nodes: int
+    backtracks: int
+    max_depth: int
+    solutions: int
+    placements: int
+    branching_factor: _containers.RepeatedScalarFieldContainer[float]
+    phase_seconds: _containers.ScalarMap[str, float]
+    cache: CacheStats
+    def __init__(self, searches: _Optional[int] = ..., nodes: _Optional[int] = ..., backtracks: _Optional[int] = ..., max_depth: _Optional[int] = ..., solutions: _Optional[int] = ..., placements: _Optional[int] = ..., branching_factor: _Optional[_Iterable[float]] = ..., phase_seconds: _Optional[_Mapping[str, float]] = ..., cache: _Optional[_Union[CacheStats, _Mapping]] = ...) -> None: ...
+
+class CacheStats(_message.Message):
+    __slots__ = ("size", "hits", "misses", "coalesced", "evictions", "expirations")
+    SIZE_FIELD_NUMBER: _ClassVar[int]
+    HITS_FIELD_NUMBER: _ClassVar[int]
+    MISSES_FIELD_NUMBER: _ClassVar[int]
+    COALESCED_FIELD_NUMBER: _ClassVar[int]
+    EVICTIONS_FIELD_NUMBER: _ClassVar[int]
+    EXPIRATIONS_FIELD_NUMBER: _ClassVar[int]
+    size: int
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    expirations: int
+    def __init__(self, size: _Optional[int] = ..., hits: _Optional[int] = ..., misses: _Optional[int] = ..., coalesced: _Optional[int] = ..., evictions: _Optional[int] = ..., expirations: _Optional[int] = ...) -> None: ...
 
 class Piece(_message.Message):
     __slots__ = ("tetromino_name", "cells")
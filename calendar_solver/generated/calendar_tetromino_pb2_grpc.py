@@ -44,6 +44,36 @@ class TetrominoSolverStub(object):
                 request_serializer=calendar__tetromino__pb2.PuzzleRequest.SerializeToString,
                 response_deserializer=calendar__tetromino__pb2.PuzzleSolutions.FromString,
                 _registered_method=True)
+        self.StreamPuzzleSolutions = channel.unary_stream(
+                '/calendartetromino.TetrominoSolver/StreamPuzzleSolutions',
+                request_serializer=calendar__tetromino__pb2.PuzzleRequest.SerializeToString,
+                response_deserializer=calendar__tetromino__pb2.PuzzleSolution.FromString,
+                _registered_method=True)
+        self.CountSolutions = channel.unary_unary(
+                '/calendartetromino.TetrominoSolver/CountSolutions',
+                request_serializer=calendar__tetromino__pb2.PuzzleRequest.SerializeToString,
+                response_deserializer=calendar__tetromino__pb2.SolutionCount.FromString,
+                _registered_method=True)
+        self.SolvePuzzleBatch = channel.unary_stream(
+                '/calendartetromino.TetrominoSolver/SolvePuzzleBatch',
+                request_serializer=calendar__tetromino__pb2.PuzzleBatchRequest.SerializeToString,
+                response_deserializer=calendar__tetromino__pb2.DatedPuzzleSolution.FromString,
+                _registered_method=True)
+        self.GetStats = channel.unary_unary(
+                '/calendartetromino.TetrominoSolver/GetStats',
+                request_serializer=calendar__tetromino__pb2.StatsRequest.SerializeToString,
+                response_deserializer=calendar__tetromino__pb2.SolverStats.FromString,
+                _registered_method=True)
+        self.CompletePuzzle = channel.unary_unary(
+                '/calendartetromino.TetrominoSolver/CompletePuzzle',
+                request_serializer=calendar__tetromino__pb2.CompletionRequest.SerializeToString,
+                response_deserializer=calendar__tetromino__pb2.PuzzleSolutions.FromString,
+                _registered_method=True)
+        self.SampleSolutions = channel.unary_unary(
+                '/calendartetromino.TetrominoSolver/SampleSolutions',
+                request_serializer=calendar__tetromino__pb2.SampleRequest.SerializeToString,
+                response_deserializer=calendar__tetromino__pb2.PuzzleSolutions.FromString,
+                _registered_method=True)
 
 
 class TetrominoSolverServicer(object):
@@ -61,6 +91,51 @@ class TetrominoSolverServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamPuzzleSolutions(self, request, context):
+        """Same solutions as SolvePuzzleAllSolutions, sent one by one as they are found
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CountSolutions(self, request, context):
+        """Number of solutions of SolvePuzzleAllSolutions without building them
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SolvePuzzleBatch(self, request, context):
+        """One solution per date of a range and/or list, streamed in request order
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetStats(self, request, context):
+        """Search metrics summed over every request served so far. The solving
+        RPCs also send the metrics of their own search as "search-stats"
+        trailing metadata (JSON).
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CompletePuzzle(self, request, context):
+        """Completions of a partially solved board. Fails with INVALID_ARGUMENT if
+        the placed pieces are not a valid partial cover of the date.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SampleSolutions(self, request, context):
+        """Distinct solutions drawn uniformly at random, without enumerating them.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_TetrominoSolverServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -74,6 +149,36 @@ def add_TetrominoSolverServicer_to_server(servicer, server):
                     request_deserializer=calendar__tetromino__pb2.PuzzleRequest.FromString,
                     response_serializer=calendar__tetromino__pb2.PuzzleSolutions.SerializeToString,
             ),
+            'StreamPuzzleSolutions': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamPuzzleSolutions,
+                    request_deserializer=calendar__tetromino__pb2.PuzzleRequest.FromString,
+                    response_serializer=calendar__tetromino__pb2.PuzzleSolution.SerializeToString,
+            ),
+            'CountSolutions': grpc.unary_unary_rpc_method_handler(
+                    servicer.CountSolutions,
+                    request_deserializer=calendar__tetromino__pb2.PuzzleRequest.FromString,
+                    response_serializer=calendar__tetromino__pb2.SolutionCount.SerializeToString,
+            ),
+            'SolvePuzzleBatch': grpc.unary_stream_rpc_method_handler(
+                    servicer.SolvePuzzleBatch,
+                    request_deserializer=calendar__tetromino__pb2.PuzzleBatchRequest.FromString,
+                    response_serializer=calendar__tetromino__pb2.DatedPuzzleSolution.SerializeToString,
+            ),
+            'GetStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetStats,
+                    request_deserializer=calendar__tetromino__pb2.StatsRequest.FromString,
+                    response_serializer=calendar__tetromino__pb2.SolverStats.SerializeToString,
+            ),
+            'CompletePuzzle': grpc.unary_unary_rpc_method_handler(
+                    servicer.CompletePuzzle,
+                    request_deserializer=calendar__tetromino__pb2.CompletionRequest.FromString,
+                    response_serializer=calendar__tetromino__pb2.PuzzleSolutions.SerializeToString,
+            ),
+            'SampleSolutions': grpc.unary_unary_rpc_method_handler(
+                    servicer.SampleSolutions,
+                    request_deserializer=calendar__tetromino__pb2.SampleRequest.FromString,
+                    response_serializer=calendar__tetromino__pb2.PuzzleSolutions.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'calendartetromino.TetrominoSolver', rpc_method_handlers)
@@ -138,3 +243,165 @@ class TetrominoSolver(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamPuzzleSolutions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/calendartetromino.TetrominoSolver/StreamPuzzleSolutions',
+            calendar__tetromino__pb2.PuzzleRequest.SerializeToString,
+            calendar__tetromino__pb2.PuzzleSolution.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CountSolutions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/calendartetromino.TetrominoSolver/CountSolutions',
+            calendar__tetromino__pb2.PuzzleRequest.SerializeToString,
+            calendar__tetromino__pb2.SolutionCount.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SolvePuzzleBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/calendartetromino.TetrominoSolver/SolvePuzzleBatch',
+            calendar__tetromino__pb2.PuzzleBatchRequest.SerializeToString,
+            calendar__tetromino__pb2.DatedPuzzleSolution.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/calendartetromino.TetrominoSolver/GetStats',
+            calendar__tetromino__pb2.StatsRequest.SerializeToString,
+            calendar__tetromino__pb2.SolverStats.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CompletePuzzle(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/calendartetromino.TetrominoSolver/CompletePuzzle',
+            calendar__tetromino__pb2.CompletionRequest.SerializeToString,
+            calendar__tetromino__pb2.PuzzleSolutions.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SampleSolutions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/calendartetromino.TetrominoSolver/SampleSolutions',
+            calendar__tetromino__pb2.SampleRequest.SerializeToString,
+            calendar__tetromino__pb2.PuzzleSolutions.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,427 @@
+import argparse
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+
+import calendar_solver.generated.calendar_tetromino_pb2 as calendar_tetromino_pb2
+import calendar_solver.generated.calendar_tetromino_pb2_grpc as calendar_tetromino_pb2_grpc
+import grpc
+from calendar_solver.calendar_solver.batch import (create_executor,
+                                                   expand_dates,
+                                                   solve_first_solution)
+from calendar_solver.calendar_solver.calendar_solver import CalenderSolver
+from calendar_solver.calendar_solver.cancellation import (CancellationToken,
+                                                          SearchCancelled)
+from calendar_solver.calendar_solver.parallel import split_search
+from calendar_solver.calendar_solver.snapshot import load_snapshot
+from calendar_solver.calendar_solver.solution_table import load_solution_table
+from calendar_solver.calendar_solver.util import (get_hole_triple,
+                                                  sample_ranks)
+from calendar_solver.server.grpc_server import (DEADLINE_MARGIN,
+                                                build_placement,
+                                                build_stored_solutions,
+                                                load_hosted_stores,
+                                                load_hosted_variants,
+                                                parse_placed_pieces,
+                                                resolve_variant)
+from calendar_solver.server.health import (add_aio_health_service,
+                                           set_aio_serving,
+                                           start_readiness_endpoint)
+from google.protobuf.timestamp_pb2 import Timestamp
+
+# Everything below up to the servicer runs inside the worker processes. The
+# generated message classes cannot be pickled, so results are sent back in
+# their wire format and parsed again on the event loop.
+
+
+def _solve_puzzle(triple, engine, compact=False, variant=None):
+    return build_placement(solve_first_solution(triple, engine, variant), compact, variant).SerializeToString()
+
+
+def _solve_all_solutions(triple, engine, compact=False, variant=None, deadline=None):
+    month, day, day_of_week = triple
+    solver = CalenderSolver(2024, month, day, day_of_week, engine=engine, variant=variant)
+    # the deadline is wall clock time, the monotonic clock is per process
+    cancel = None if deadline is None else CancellationToken(deadline, clock=time.time)
+    partial = False
+    try:
+        _, all_solutions = solver.solve_exact_cover(cancel=cancel)
+    except SearchCancelled as e:
+        all_solutions, partial = e.solutions, True
+    return calendar_tetromino_pb2.PuzzleSolutions(
+        solutions=[build_placement(solution, compact, variant) for solution in all_solutions],
+        partial=partial,
+    ).SerializeToString()
+
+
+def _count_solutions(triple, variant=None):
+    month, day, day_of_week = triple
+    solver = CalenderSolver(2024, month, day, day_of_week, variant=variant)
+    return calendar_tetromino_pb2.SolutionCount(count=solver.count_solutions()).SerializeToString()
+
+
+def _split_subtrees(triple, split_depth, variant=None):
+    month, day, day_of_week = triple
+    solver = CalenderSolver(2024, month, day, day_of_week, variant=variant)
+    return split_search(solver.columns, solver.rows, split_depth)
+
+
+def _solve_subtree(triple, engine, prefix, compact=False, variant=None):
+    month, day, day_of_week = triple
+    solver = CalenderSolver(2024, month, day, day_of_week, engine=engine, variant=variant)
+    return [
+        build_placement(solution, compact, variant).SerializeToString()
+        for solution in solver.iter_solutions(prefix)
+    ]
+
+
+def _complete(triple, engine, placed_pieces, all_solutions, compact=False, variant=None):
+    month, day, day_of_week = triple
+    solver = CalenderSolver(2024, month, day, day_of_week, engine=engine, variant=variant)
+    solution, solutions = solver.complete(placed_pieces, first_solution_only=not all_solutions)
+    if not all_solutions:
+        solutions = [solution] if solution else []
+    return calendar_tetromino_pb2.PuzzleSolutions(
+        solutions=[build_placement(solution, compact, variant) for solution in solutions]
+    ).SerializeToString()
+
+
+# solvers with warm subtree counts of this worker, least recently used first
+SAMPLER_CACHE_SIZE = 8
+_samplers = OrderedDict()
+
+
+def _sample(triple, k, seed=None, compact=False, variant=None):
+    key = (triple, None if variant is None else variant.fingerprint)
+    solver = _samplers.pop(key, None)
+    if solver is None:
+        month, day, day_of_week = triple
+        solver = CalenderSolver(2024, month, day, day_of_week, variant=variant)
+    _samplers[key] = solver
+    if len(_samplers) > SAMPLER_CACHE_SIZE:
+        _samplers.popitem(last=False)
+
+    return calendar_tetromino_pb2.PuzzleSolutions(
+        solutions=[build_placement(solution, compact, variant) for solution in solver.sample_solutions(k, seed)]
+    ).SerializeToString()
+
+
+class AsyncTetrominoSolverServicer(calendar_tetromino_pb2_grpc.TetrominoSolverServicer):
+    """ asyncio servicer that keeps the event loop free by running every
+        search in a process pool.
+
+        Requests go through one of two lanes. The light lane serves single
+        solutions and the heavy lane serves enumeration, counting and
+        batches, so heavy requests can never take every worker. A request
+        that has to wait for a lane slot is queued, and once max_queue
+        requests are waiting new ones fail fast with RESOURCE_EXHAUSTED.
+    """
+    def __init__(self, executor, solution_table=None, engine="bitboard",
+                 max_concurrency=4, max_heavy=None, max_queue=64, split_depth=1, variants=None,
+                 solution_stores=None):
+        """ Initialize the servicer.
+
+            :param executor: The ProcessPoolExecutor running the searches.
+            :param solution_table: An optional SolutionTable for SolvePuzzle.
+            :param engine: The exact cover engine to use.
+            :param max_concurrency: Searches running at once in the light lane.
+            :param max_heavy: Searches running at once in the heavy lane,
+                defaults to one less than max_concurrency.
+            :param max_queue: Requests allowed to wait for a slot.
+            :param split_depth: Branching levels streamed enumeration is split on.
+            :param variants: Puzzle variants requests can select, keyed by name.
+            :param solution_stores: SolutionStores answering enumeration and
+                counting without a search, keyed by variant name with "" for
+                the built-in board.
+        """
+        self.executor = executor
+        self.solution_table = solution_table
+        self.engine = engine
+        self.variants = variants or {}
+        self.solution_stores = solution_stores or {}
+        self.max_queue = max_queue
+        self.split_depth = split_depth
+
+        self.max_heavy = max_heavy or max(1, max_concurrency - 1)
+        self._light = asyncio.Semaphore(max_concurrency)
+        self._heavy = asyncio.Semaphore(self.max_heavy)
+        self._queued = 0
+
+    async def warm_up(self, days=2):
+        """ Solve today and the following dates in the pool at once, which
+            starts a worker process per date and loads every code path on
+            the way.
+
+            :param days: The number of dates from today on to solve.
+        """
+        loop = asyncio.get_running_loop()
+        today = datetime.now()
+        solutions = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, _solve_puzzle, get_hole_triple(today + timedelta(days=offset)),
+                                 self.engine)
+            for offset in range(days)
+        ))
+        for solution in solutions:
+            calendar_tetromino_pb2.PuzzleSolution.FromString(solution)
+
+    async def _acquire(self, lane, context, check=True):
+        """ Take a slot of a lane, queueing if none is free.
+            INTERNAL USE ONLY.
+
+            :param check: False to queue even when the queue is full, for a
+                request that already holds slots and only waits for more.
+        """
+        if check:
+            await self._check_queue(lane, context)
+
+        self._queued += 1
+        try:
+            await lane.acquire()
+        finally:
+            self._queued -= 1
+
+    async def _check_queue(self, lane, context):
+        """ Fail the request with RESOURCE_EXHAUSTED if it would have to wait
+            for a slot of a lane while the queue is full.
+            INTERNAL USE ONLY.
+        """
+        if lane.locked() and self._queued >= self.max_queue:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Solver queue is full, retry later.")
+
+    async def _run(self, lane, context, fn, *args):
+        """ Run a function in the process pool while holding a lane slot.
+            INTERNAL USE ONLY.
+        """
+        await self._acquire(lane, context)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        finally:
+            lane.release()
+
+    async def _get_variant(self, request, context, dates=None):
+        """ Look up the variant a request asks for, aborting the request if
+            resolve_variant rejects it.
+            INTERNAL USE ONLY.
+
+            :param dates: The dates of the request, see resolve_variant.
+        """
+        variant, error = resolve_variant(self.variants, request, dates)
+        if error is not None:
+            await context.abort(*error)
+        return variant
+
+    async def SolvePuzzle(self, request, context):
+        triple = get_hole_triple(request.date.ToDatetime())
+        variant = await self._get_variant(request, context)
+
+        if self.solution_table is not None and variant is None:
+            solution = self.solution_table.lookup(*triple)
+            if solution is not None:
+                return build_placement(solution, request.compact)
+
+        solution = await self._run(self._light, context, _solve_puzzle, triple, self.engine, request.compact,
+                                   variant)
+        return calendar_tetromino_pb2.PuzzleSolution.FromString(solution)
+
+    async def SolvePuzzleAllSolutions(self, request, context):
+        triple = get_hole_triple(request.date.ToDatetime())
+        variant = await self._get_variant(request, context)
+
+        # a store lookup only slices the mapped file, no need for the pool
+        store = self.solution_stores.get(request.variant)
+        if store is not None:
+            response = build_stored_solutions(store, *triple, request.compact, variant)
+            if response is not None:
+                return response
+
+        # a worker process cannot see the client go away, but it can stop
+        # at the deadline and answer with what it found
+        remaining = context.time_remaining()
+        deadline = None if remaining is None else time.time() + remaining - DEADLINE_MARGIN
+        solutions = await self._run(self._heavy, context, _solve_all_solutions, triple, self.engine,
+                                   request.compact, variant, deadline)
+        return calendar_tetromino_pb2.PuzzleSolutions.FromString(solutions)
+
+    async def CountSolutions(self, request, context):
+        triple = get_hole_triple(request.date.ToDatetime())
+        variant = await self._get_variant(request, context)
+
+        store = self.solution_stores.get(request.variant)
+        count = store.count(*triple) if store is not None else None
+        if count is not None:
+            return calendar_tetromino_pb2.SolutionCount(count=count)
+
+        count = await self._run(self._heavy, context, _count_solutions, triple, variant)
+        return calendar_tetromino_pb2.SolutionCount.FromString(count)
+
+    async def StreamPuzzleSolutions(self, request, context):
+        triple = get_hole_triple(request.date.ToDatetime())
+        variant = await self._get_variant(request, context)
+        loop = asyncio.get_running_loop()
+
+        await self._acquire(self._heavy, context)
+        try:
+            prefixes = await loop.run_in_executor(self.executor, _split_subtrees, triple, self.split_depth,
+                                                  variant)
+
+            # one slot per request, so subtrees are solved one after the other
+            # and each subtree's solutions are sent as soon as it finishes
+            for prefix in prefixes:
+                solutions = await loop.run_in_executor(
+                    self.executor, _solve_subtree, triple, self.engine, prefix, request.compact, variant
+                )
+                for solution in solutions:
+                    yield calendar_tetromino_pb2.PuzzleSolution.FromString(solution)
+        finally:
+            self._heavy.release()
+
+    async def CompletePuzzle(self, request, context):
+        triple = get_hole_triple(request.date.ToDatetime())
+        variant = await self._get_variant(request, context)
+        # a completion of an almost empty board can be a full enumeration
+        lane = self._heavy if request.all_solutions else self._light
+        try:
+            solutions = await self._run(lane, context, _complete, triple, self.engine,
+                                        parse_placed_pieces(request.placed_pieces), request.all_solutions,
+                                        request.compact, variant)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        return calendar_tetromino_pb2.PuzzleSolutions.FromString(solutions)
+
+    async def SampleSolutions(self, request, context):
+        triple = get_hole_triple(request.date.ToDatetime())
+        variant = await self._get_variant(request, context)
+        seed = request.seed if request.HasField("seed") else None
+
+        store = self.solution_stores.get(request.variant)
+        count = store.count(*triple) if store is not None else None
+        if count is not None:
+            return build_stored_solutions(store, *triple, request.compact, variant,
+                                          sample_ranks(count, request.count, seed))
+
+        # the first draw of a date counts every solution, like CountSolutions
+        solutions = await self._run(self._heavy, context, _sample, triple, request.count, seed, request.compact,
+                                    variant)
+        return calendar_tetromino_pb2.PuzzleSolutions.FromString(solutions)
+
+    async def SolvePuzzleBatch(self, request, context):
+        start_date = request.start_date.ToDatetime().date() if request.HasField("start_date") else None
+        end_date = request.end_date.ToDatetime().date() if request.HasField("end_date") else None
+        try:
+            dates = expand_dates(start_date, end_date, [date.ToDatetime().date() for date in request.dates])
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        variant = await self._get_variant(request, context, dates)
+        # the solution table only holds the built-in board
+        solution_table = self.solution_table if variant is None else None
+
+        triples = [get_hole_triple(date) for date in dates]
+        loop = asyncio.get_running_loop()
+
+        results = {}
+        for triple in dict.fromkeys(triples):
+            solution = solution_table.lookup(*triple) if solution_table is not None else None
+            if solution is not None:
+                results[triple] = build_placement(solution, request.compact)
+        pending = deque(triple for triple in dict.fromkeys(triples) if triple not in results)
+        running = set()
+
+        # every date in the pool takes a heavy slot, so batches share the
+        # heavy lane with every other heavy request and never crowd the
+        # light lane out of the workers. Only the next date of a batch waits
+        # in the queue, so other heavy requests queue in between its dates.
+        async def submit():
+            triple = pending.popleft()
+            await self._acquire(self._heavy, context, check=not running)
+            future = loop.run_in_executor(self.executor, _solve_puzzle, triple, self.engine, request.compact,
+                                          variant)
+            future.add_done_callback(lambda _: self._heavy.release())
+            future.add_done_callback(running.discard)
+            running.add(future)
+            results[triple] = future
+
+        try:
+            for date, triple in zip(dates, triples):
+                while triple not in results:
+                    await submit()
+                # fill free slots without queueing ahead of other requests
+                while pending and not self._heavy.locked():
+                    await submit()
+
+                solution = results[triple]
+                if isinstance(solution, asyncio.Future):
+                    solution = results[triple] = calendar_tetromino_pb2.PuzzleSolution.FromString(await solution)
+
+                timestamp = Timestamp()
+                timestamp.FromDatetime(datetime(date.year, date.month, date.day))
+                yield calendar_tetromino_pb2.DatedPuzzleSolution(date=timestamp, solution=solution)
+        finally:
+            for future in list(running):
+                future.cancel()
+
+
+async def serve(port=50051, workers=None, max_concurrency=None, max_heavy=None, max_queue=64):
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if load_snapshot() is None:
+        print("🟡 No up-to-date startup snapshot found, building the placements")
+    executor = create_executor(workers)
+
+    solution_table = load_solution_table()
+    if solution_table is None:
+        print("🟡 No up-to-date solution table found, solving every request live")
+    else:
+        print(f"🟢 Loaded {len(solution_table)} precomputed solutions")
+
+    variants = load_hosted_variants()
+    print(f"🟢 Hosting puzzle variants: {', '.join(variants) or 'none'}")
+    solution_stores = load_hosted_stores(variants)
+    print(f"🟢 Mapped all-solutions stores: {', '.join(name or 'calendar (built-in)' for name in solution_stores) or 'none'}")
+
+    servicer = AsyncTetrominoSolverServicer(
+        executor, solution_table,
+        max_concurrency=max_concurrency or workers,
+        max_heavy=max_heavy,
+        max_queue=max_queue,
+        variants=variants,
+        solution_stores=solution_stores,
+    )
+
+    server = grpc.aio.server()
+    calendar_tetromino_pb2_grpc.add_TetrominoSolverServicer_to_server(servicer, server)
+    health = await add_aio_health_service(server)
+    ready = threading.Event()
+    if os.environ.get("SOLVER_READINESS_PORT"):
+        start_readiness_endpoint(int(os.environ["SOLVER_READINESS_PORT"]), ready)
+    try:
+        # the gRPC port only opens once the workers have started, one date
+        # per worker so none of them starts on a request
+        await servicer.warm_up(max(2, workers))
+        await set_aio_serving(health)
+        server.add_insecure_port(f"[::]:{port}")
+        await server.start()
+        ready.set()
+        print(f"🟢 asyncio gRPC server listening at [::]:{port} with {workers} solver processes after "
+              f"{(time.perf_counter() - start) * 1000:.0f}ms")
+        await server.wait_for_termination()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the asyncio gRPC solver server.")
+    parser.add_argument("--port", type=int, default=50051)
+    parser.add_argument("--workers", type=int, default=None, help="Solver processes, defaults to the CPU count.")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Light searches running at once.")
+    parser.add_argument("--max-heavy", type=int, default=None, help="Heavy searches running at once.")
+    parser.add_argument("--max-queue", type=int, default=64, help="Requests allowed to wait for a slot.")
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.port, args.workers, args.max_concurrency, args.max_heavy, args.max_queue))
+
+
+if __name__ == "__main__":
+    main()
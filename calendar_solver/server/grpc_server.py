@@ -1,71 +1,652 @@
 import json
+import os
+import threading
+import time
 from concurrent import futures
+from datetime import datetime, timedelta
 
 import calendar_solver.generated.calendar_tetromino_pb2 as calendar_tetromino_pb2
 import calendar_solver.generated.calendar_tetromino_pb2_grpc as calendar_tetromino_pb2_grpc
 import grpc
-from calendar_solver.calendar_solver.calendar_solver import \
-    CalenderSolver  # your logic here
+from calendar_solver.calendar_solver.batch import (create_executor,
+                                                   expand_dates, solve_dates)
+from calendar_solver.calendar_solver.calendar_solver import (  # your logic here
+    CalenderGrid, CalenderSolver, get_placement_index)
+from calendar_solver.calendar_solver.cancellation import (CancellationToken,
+                                                          SearchCancelled)
+from calendar_solver.calendar_solver.search_stats import SearchStats
+from calendar_solver.calendar_solver.snapshot import load_snapshot
+from calendar_solver.calendar_solver.solution_store import load_solution_store
+from calendar_solver.calendar_solver.solution_table import load_solution_table
 from calendar_solver.calendar_solver.util import (format_day_of_week,
-                                                  format_month)
+                                                  format_month,
+                                                  get_hole_triple,
+                                                  sample_ranks)
+from calendar_solver.calendar_solver.variant import (DEFAULT_VARIANTS_DIR,
+                                                     load_variants)
+from calendar_solver.server.health import (add_health_service,
+                                           set_serving,
+                                           start_readiness_endpoint)
+from calendar_solver.server.result_cache import ResultCache
+from google.protobuf.timestamp_pb2 import Timestamp
+
+# searches stop this many seconds before the deadline of their request, so a
+# partial answer still reaches the client in time
+DEADLINE_MARGIN = 0.05
+
+# seconds a request waiting on the search of another request sleeps between
+# two looks at its own CancellationToken
+WAIT_POLL_INTERVAL = 0.01
 
 
 class TetrominoSolverServicer(calendar_tetromino_pb2_grpc.TetrominoSolverServicer):
+    def __init__(self, solution_table=None, engine="bitboard", batch_workers=None,
+                 cache_size=128, cache_ttl=None, collect_stats=True, variants=None, solution_stores=None,
+                 sampler_cache_size=8):
+        # precomputed first solutions, None means every request is solved live
+        self.solution_table = solution_table
+        self.engine = engine
+
+        # precomputed solutions of every triple, keyed by variant name with
+        # "" for the built-in board
+        self.solution_stores = solution_stores or {}
+
+        # puzzle variants requests can select by name, next to the built-in board
+        self.variants = variants or {}
+
+        # search metrics of every request, served by GetStats
+        self.collect_stats = collect_stats
+        self.search_stats = SearchStats()
+        self._stats_lock = threading.Lock()
+
+        # responses keyed by hole triple and mode, most traffic asks for today
+        self.cache = ResultCache(cache_size, cache_ttl)
+
+        # solvers with warm subtree counts, so repeated draws for a date
+        # skip counting, see CalenderSolver.sample_solutions
+        self.samplers = ResultCache(sampler_cache_size)
+
+        # process pool shared by every batch, started on the first batch
+        self.batch_workers = batch_workers
+        self._batch_executor = None
+        self._batch_executor_lock = threading.Lock()
+
     def SolvePuzzle(self, request, context):
         date = request.date.ToDatetime()  # Convert protobuf Timestamp to datetime.datetime
+        triple = get_hole_triple(date)
+        variant = self._get_variant(request, context)
+        stats = self._new_stats()
+        response = self.cache.get_or_compute(
+            (triple, "first", request.compact, request.variant),
+            lambda: self._solve_puzzle(date.year, *triple, compact=request.compact, stats=stats, variant=variant)
+        )
+        self._record_stats(context, stats)
+        return response
+
+    def _solve_puzzle(self, year, month, day, day_of_week, compact=False, stats=None, variant=None):
+        solution = None
+        if self.solution_table is not None and variant is None:
+            solution = self.solution_table.lookup(month, day, day_of_week)
 
-        solver = CalenderSolver(date.year, format_month(date.month), date.day, format_day_of_week(date.weekday()))
-        solution, _ = solver.solve_exact_cover(first_solution_only=True)
+        if solution is None:
+            solver = CalenderSolver(year, month, day, day_of_week, engine=self.engine, variant=variant)
+            solution, _ = solver.solve_exact_cover(first_solution_only=True, stats=stats)
 
-        return self._build_placement(solution)
+        return self._build_placement(solution, compact, variant)
 
     def SolvePuzzleAllSolutions(self, request, context):
         date = request.date.ToDatetime()  # Convert protobuf Timestamp to datetime.datetime
+        triple = get_hole_triple(date)
+        variant = self._get_variant(request, context)
+        stats = self._new_stats()
+        cancel = self._new_cancellation(context)
+        try:
+            response = self._get_or_compute(
+                (triple, "all", request.compact, request.variant),
+                lambda: self._solve_all_solutions(date.year, *triple, compact=request.compact, stats=stats,
+                                                  variant=variant, cancel=cancel),
+                cancel
+            )
+        except SearchCancelled as e:
+            # never cached, the next request searches again
+            response = calendar_tetromino_pb2.PuzzleSolutions(
+                solutions=[self._build_placement(solution, request.compact, variant) for solution in e.solutions],
+                partial=True,
+            )
+        self._record_stats(context, stats)
+        return response
+
+    def _solve_all_solutions(self, year, month, day, day_of_week, compact=False, stats=None, variant=None,
+                             cancel=None):
+        store = self.solution_stores.get("" if variant is None else variant.name)
+        if store is not None:
+            response = build_stored_solutions(store, month, day, day_of_week, compact, variant)
+            if response is not None:
+                return response
 
-        solver = CalenderSolver(date.year, format_month(date.month), date.day, format_day_of_week(date.weekday()))
-        solution, all_solutions = solver.solve_exact_cover()
+        solver = CalenderSolver(year, month, day, day_of_week, engine=self.engine, variant=variant)
+        solution, all_solutions = solver.solve_exact_cover(stats=stats, cancel=cancel)
 
-        # some solutions are exactly the same, so we need to remove duplicates
         solutions = []
         for solution in all_solutions:
-            solutions.append(self._build_placement(solution))
+            solutions.append(self._build_placement(solution, compact, variant))
         
         return calendar_tetromino_pb2.PuzzleSolutions(
             solutions=solutions
         )
 
-    def _build_placement(self, solution):
-        pieces = []
-        transformed_solution = {}
-        
-        for step in solution:
-            cells = []
-            for item in step:
-                if "piece" in item:
-                    piece_name = item
-                    transformed_solution[piece_name] = []
-                else:
-                    row, col = map(int, item.split("_")[1:])
-                    cells.append(calendar_tetromino_pb2.Cell(row=str(row), col=str(col)))
-                    
-            piece = calendar_tetromino_pb2.Piece(
-                tetromino_name=piece_name,
-                cells=cells
+    def StreamPuzzleSolutions(self, request, context):
+        date = request.date.ToDatetime()  # Convert protobuf Timestamp to datetime.datetime
+
+        variant = self._get_variant(request, context)
+        solver = CalenderSolver(date.year, format_month(date.month), date.day, format_day_of_week(date.weekday()),
+                                engine=self.engine, variant=variant)
+        stats = self._new_stats()
+        cancel = self._new_cancellation(context)
+        for solution in solver.iter_solutions(stats=stats, cancel=cancel):
+            yield self._build_placement(solution, request.compact, variant)
+        self._record_stats(context, stats)
+
+        # the stream has no room for a partial flag, so a stopped search
+        # must not look like a finished one
+        if cancel.cancelled:
+            code = grpc.StatusCode.DEADLINE_EXCEEDED if cancel.reason == CancellationToken.DEADLINE \
+                else grpc.StatusCode.CANCELLED
+            context.abort(code, "The search was stopped before it finished.")
+
+    def CountSolutions(self, request, context):
+        date = request.date.ToDatetime()  # Convert protobuf Timestamp to datetime.datetime
+
+        variant = self._get_variant(request, context)
+        store = self.solution_stores.get(request.variant)
+        count = store.count(*get_hole_triple(date)) if store is not None else None
+        if count is None:
+            solver = CalenderSolver(date.year, format_month(date.month), date.day, format_day_of_week(date.weekday()),
+                                    variant=variant)
+            count = solver.count_solutions()
+        return calendar_tetromino_pb2.SolutionCount(count=count)
+
+    def SolvePuzzleBatch(self, request, context):
+        start_date = request.start_date.ToDatetime().date() if request.HasField("start_date") else None
+        end_date = request.end_date.ToDatetime().date() if request.HasField("end_date") else None
+        try:
+            dates = expand_dates(start_date, end_date, [date.ToDatetime().date() for date in request.dates])
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        variant = self._get_variant(request, context, dates)
+
+        for date, solution in solve_dates(dates, self._get_batch_executor(), self.solution_table, self.engine,
+                                          variant):
+            timestamp = Timestamp()
+            timestamp.FromDatetime(datetime(date.year, date.month, date.day))
+            yield calendar_tetromino_pb2.DatedPuzzleSolution(
+                date=timestamp,
+                solution=self._build_placement(solution, request.compact, variant)
+            )
+
+    def CompletePuzzle(self, request, context):
+        date = request.date.ToDatetime()  # Convert protobuf Timestamp to datetime.datetime
+        variant = self._get_variant(request, context)
+        stats = self._new_stats()
+        try:
+            placed_pieces = parse_placed_pieces(request.placed_pieces)
+            solver = CalenderSolver(date.year, *get_hole_triple(date), engine=self.engine, variant=variant)
+            solution, all_solutions = solver.complete(
+                placed_pieces, first_solution_only=not request.all_solutions, stats=stats
             )
-            pieces.append(piece)
-            
-        return calendar_tetromino_pb2.PuzzleSolution(solution_pieces=pieces)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        self._record_stats(context, stats)
+
+        solutions = all_solutions if request.all_solutions else [solution] if solution else []
+        return calendar_tetromino_pb2.PuzzleSolutions(
+            solutions=[self._build_placement(solution, request.compact, variant) for solution in solutions]
+        )
+
+    def SampleSolutions(self, request, context):
+        date = request.date.ToDatetime()  # Convert protobuf Timestamp to datetime.datetime
+        variant = self._get_variant(request, context)
+        seed = request.seed if request.HasField("seed") else None
+        return self._sample_solutions(date.year, *get_hole_triple(date), request.count, seed, request.compact,
+                                      variant)
+
+    def _sample_solutions(self, year, month, day, day_of_week, k, seed=None, compact=False, variant=None):
+        # a store holds the solutions in search order, so the same seed
+        # draws the same solutions with or without it
+        store = self.solution_stores.get("" if variant is None else variant.name)
+        count = store.count(month, day, day_of_week) if store is not None else None
+        if count is not None:
+            return build_stored_solutions(store, month, day, day_of_week, compact, variant,
+                                          sample_ranks(count, k, seed))
+
+        solver = self.samplers.get_or_compute(
+            ((month, day, day_of_week), "" if variant is None else variant.name),
+            lambda: CalenderSolver(year, month, day, day_of_week, variant=variant)
+        )
+        return calendar_tetromino_pb2.PuzzleSolutions(
+            solutions=[self._build_placement(solution, compact, variant)
+                       for solution in solver.sample_solutions(k, seed)]
+        )
+
+    def warm_up(self, snapshot=None, days=2):
+        """ Answer today and the following dates once, so their first
+            requests are cache hits and every code path on the way is loaded.
+
+            :param snapshot: An optional Snapshot whose solutions are cached
+                instead of solving the dates it holds.
+            :param days: The number of dates from today on to warm up.
+            :return: The number of dates that had to be solved.
+        """
+        solved = 0
+        today = datetime.now()
+        for offset in range(days):
+            date = today + timedelta(days=offset)
+            triple = get_hole_triple(date)
+            solutions = snapshot.lookup(*triple) if snapshot is not None else None
+            if solutions is None:
+                solved += 1
+                self.cache.get_or_compute(
+                    (triple, "first", False, ""), lambda: self._solve_puzzle(date.year, *triple)
+                )
+                continue
+
+            self.cache.get_or_compute(
+                (triple, "first", False, ""), lambda: self._build_placement(solutions[0] if solutions else [])
+            )
+            self.cache.get_or_compute(
+                (triple, "all", False, ""),
+                lambda: calendar_tetromino_pb2.PuzzleSolutions(
+                    solutions=[self._build_placement(solution) for solution in solutions]
+                )
+            )
+        return solved
+
+    def GetStats(self, request, context):
+        with self._stats_lock:
+            stats = self.search_stats
+            response = calendar_tetromino_pb2.SolverStats(
+                searches=stats.searches,
+                nodes=stats.nodes,
+                backtracks=stats.backtracks,
+                max_depth=stats.max_depth,
+                solutions=stats.solutions,
+                placements=stats.placements,
+                branching_factor=stats.branching_factor,
+                phase_seconds=stats.phases,
+            )
+
+        cache = self.cache.stats()
+        response.cache.CopyFrom(calendar_tetromino_pb2.CacheStats(
+            size=cache["size"],
+            hits=cache["hits"],
+            misses=cache["misses"],
+            coalesced=cache["coalesced"],
+            evictions=cache["evictions"],
+            expirations=cache["expirations"],
+        ))
+        return response
+
+    def _get_variant(self, request, context, dates=None):
+        """ Look up the variant a request asks for, aborting the request if
+            resolve_variant rejects it.
+            INTERNAL USE ONLY.
+
+            :param dates: The dates of the request, see resolve_variant.
+            :return: The Variant, or None for the built-in board.
+        """
+        variant, error = resolve_variant(self.variants, request, dates)
+        if error is not None:
+            context.abort(*error)
+        return variant
+
+    def _new_stats(self):
+        return SearchStats() if self.collect_stats else None
+
+    def _new_cancellation(self, context):
+        """ Create a token that stops a search when the client goes away or
+            DEADLINE_MARGIN before the deadline of its request.
+            INTERNAL USE ONLY.
+        """
+        remaining = context.time_remaining()
+        return CancellationToken.with_timeout(
+            None if remaining is None else max(0.0, remaining - DEADLINE_MARGIN),
+            is_active=context.is_active,
+        )
+
+    def _get_or_compute(self, key, compute, cancel):
+        """ Get a cached response like ResultCache.get_or_compute. A request
+            that waited on the search of another request that was stopped
+            computes the response itself instead of failing with it, and a
+            request whose own token stops while waiting gives up without
+            solutions.
+            INTERNAL USE ONLY.
+
+            :raises SearchCancelled: If the token of this request stopped the
+                search or the wait for it.
+        """
+        def wait(future):
+            while True:
+                try:
+                    return future.result(timeout=WAIT_POLL_INTERVAL)
+                except futures.TimeoutError:
+                    if cancel.check():
+                        raise SearchCancelled(cancel.reason)
+
+        while True:
+            try:
+                return self.cache.get_or_compute(key, compute, wait)
+            except SearchCancelled:
+                if cancel.cancelled:
+                    raise
+
+    def _record_stats(self, context, stats):
+        """ Add the metrics of a request to the totals and send them as
+            trailing metadata. Requests answered without a search, e.g. from
+            the cache, send nothing.
+            INTERNAL USE ONLY.
+        """
+        if stats is None or not stats.searches:
+            return
+
+        with self._stats_lock:
+            self.search_stats.merge(stats)
+        context.set_trailing_metadata((("search-stats", json.dumps(stats.to_dict())),))
+
+    def _get_batch_executor(self):
+        with self._batch_executor_lock:
+            if self._batch_executor is None:
+                self._batch_executor = create_executor(self.batch_workers)
+            return self._batch_executor
+
+    def _build_placement(self, solution, compact=False, variant=None):
+        return build_placement(solution, compact, variant)
+
+
+def resolve_variant(variants, request, dates=None):
+    """ Look up the variant a request asks for.
+
+        :param variants: The hosted variants keyed by name.
+        :param request: A PuzzleRequest or PuzzleBatchRequest.
+        :param dates: The dates the request asks for, defaults to the date
+            field of the request.
+        :return: A (variant, error) pair. variant is None for the built-in
+            board. error is None, or the (status code, details) to abort
+            with if the variant is not hosted, its board is too large for a
+            compact answer or has no cell for a part of a date.
+    """
+    if not request.variant:
+        return None, None
+
+    variant = variants.get(request.variant)
+    if variant is None:
+        return None, (grpc.StatusCode.NOT_FOUND, f"Unknown puzzle variant {request.variant!r}.")
+    if request.compact and variant.rows * variant.cols > 64:
+        return None, (grpc.StatusCode.INVALID_ARGUMENT,
+                      f"The board of {request.variant!r} is too large for the compact encoding.")
+
+    # a variant does not have to label every month, day and weekday
+    if dates is None:
+        dates = [request.date.ToDatetime()] if "date" in request.DESCRIPTOR.fields_by_name else []
+    for month, day, day_of_week in dict.fromkeys(map(get_hole_triple, dates)):
+        for label in (month.name, day, day_of_week.name):
+            if label not in variant.grid_values:
+                return None, (grpc.StatusCode.INVALID_ARGUMENT,
+                              f"The board of {request.variant!r} has no cell labelled {label!r}.")
+    return variant, None
+
+
+def parse_placed_pieces(pieces):
+    """ Convert the Piece messages of a CompletionRequest for CalenderSolver.complete.
+
+        :param pieces: The placed Piece messages.
+        :return: A list of (piece name, cells) pairs.
+        :raises ValueError: If a cell is not a pair of integers.
+    """
+    placed_pieces = []
+    for piece in pieces:
+        try:
+            cells = [(int(cell.row), int(cell.col)) for cell in piece.cells]
+        except ValueError as e:
+            raise ValueError(f"Invalid cell of {piece.tetromino_name!r}: {e}") from e
+        placed_pieces.append((piece.tetromino_name, cells))
+    return placed_pieces
+
+
+def build_placement(solution, compact=False, variant=None):
+    """ Build the PuzzleSolution message of a formatted solution.
+
+        :param solution: A solution as returned by CalenderSolver.solve_exact_cover.
+        :param compact: Fill piece_ids and cell_masks instead of solution_pieces.
+        :param variant: The Variant the solution belongs to, None for the
+            built-in board. Only the compact encoding depends on it.
+        :return: The PuzzleSolution message.
+    """
+    if compact:
+        return build_compact_placement(solution, variant)
+
+    pieces = []
+    transformed_solution = {}
+    
+    for step in solution:
+        cells = []
+        for item in step:
+            if "piece" in item:
+                piece_name = item
+                transformed_solution[piece_name] = []
+            else:
+                row, col = map(int, item.split("_")[1:])
+                cells.append(calendar_tetromino_pb2.Cell(row=str(row), col=str(col)))
+                
+        piece = calendar_tetromino_pb2.Piece(
+            tetromino_name=piece_name,
+            cells=cells
+        )
+        pieces.append(piece)
+        
+    return calendar_tetromino_pb2.PuzzleSolution(solution_pieces=pieces)
+
+
+_compact_columns = {}
+
+
+def _get_compact_columns(variant=None):
+    """ Map every column name to its piece id or cell bit, see PuzzleSolution
+        in the proto for the layout. Cached per variant.
+        INTERNAL USE ONLY.
+    """
+    key = None if variant is None else variant.fingerprint
+    columns = _compact_columns.get(key)
+    if columns is None:
+        index = get_placement_index(variant=variant)
+        cols = CalenderGrid(variant).cols
+
+        columns = {f"piece_{name}": (True, piece_id) for piece_id, name in enumerate(index.piece_names)}
+        columns.update({f"cell_{row}_{col}": (False, 1 << (row * cols + col)) for row, col in index.cells})
+        _compact_columns[key] = columns
+    return columns
+
+
+def build_compact_placement(solution, variant=None):
+    """ Build the compact PuzzleSolution message of a formatted solution.
+
+        :param solution: A solution as returned by CalenderSolver.solve_exact_cover.
+        :param variant: The Variant the solution belongs to, None for the
+            built-in board.
+        :return: The PuzzleSolution message with piece_ids and cell_masks set.
+    """
+    columns = _get_compact_columns(variant)
+    piece_ids = []
+    cell_masks = []
+
+    for step in solution:
+        mask = 0
+        for item in step:
+            is_piece, value = columns[item]
+            if is_piece:
+                piece_ids.append(value)
+            else:
+                mask |= value
+        cell_masks.append(mask)
+
+    return calendar_tetromino_pb2.PuzzleSolution(piece_ids=piece_ids, cell_masks=cell_masks)
+
+
+_stored_placements = {}
+
+
+def _get_stored_placements(index, compact=False, variant=None):
+    """ The Piece message, or the compact (piece id, cell mask) pair, of
+        every placement of an index, built once per variant.
+        INTERNAL USE ONLY.
+    """
+    key = (None if variant is None else variant.fingerprint, compact)
+    placements = _stored_placements.get(key)
+    if placements is None:
+        if compact:
+            columns = _get_compact_columns(variant)
+            placements = [
+                (columns[f"piece_{name}"][1], sum(columns[f"cell_{row}_{col}"][1] for row, col in cells))
+                for name, _, cells in index.metadata
+            ]
+        else:
+            placements = [
+                calendar_tetromino_pb2.Piece(
+                    tetromino_name=f"piece_{name}",
+                    cells=[calendar_tetromino_pb2.Cell(row=str(row), col=str(col)) for row, col in cells]
+                )
+                for name, _, cells in index.metadata
+            ]
+        _stored_placements[key] = placements
+    return placements
+
+
+def build_stored_solutions(store, month, day, day_of_week, compact=False, variant=None, ranks=None):
+    """ Build the PuzzleSolutions message of a triple from a SolutionStore,
+        from prebuilt placements instead of formatted solutions.
+
+        :param store: The SolutionStore of the variant.
+        :param compact: Fill piece_ids and cell_masks instead of solution_pieces.
+        :param variant: The Variant of the store, None for the built-in board.
+        :param ranks: Only the solutions at these positions, see
+            SolutionStore.iter_placements.
+        :return: The PuzzleSolutions message, or None if the store does not
+            hold the triple.
+    """
+    solutions = store.iter_placements(month, day, day_of_week, ranks)
+    if solutions is None:
+        return None
+
+    placements = _get_stored_placements(store.index, compact, variant)
+    if compact:
+        messages = []
+        for solution in solutions:
+            piece_ids, cell_masks = zip(*(placements[placement] for placement in solution))
+            messages.append(calendar_tetromino_pb2.PuzzleSolution(piece_ids=piece_ids, cell_masks=cell_masks))
+    else:
+        messages = [
+            calendar_tetromino_pb2.PuzzleSolution(solution_pieces=[placements[placement] for placement in solution])
+            for solution in solutions
+        ]
+    return calendar_tetromino_pb2.PuzzleSolutions(solutions=messages)
+
+
+def expand_compact_placement(message, variant=None):
+    """ Convert a compact PuzzleSolution message to the solution_pieces form.
+
+        :param message: A PuzzleSolution with piece_ids and cell_masks set.
+        :param variant: The Variant the solution belongs to, None for the
+            built-in board.
+        :return: The equivalent PuzzleSolution with solution_pieces set.
+    """
+    piece_names = get_placement_index(variant=variant).piece_names
+    cols = CalenderGrid(variant).cols
+
+    pieces = []
+    for piece_id, mask in zip(message.piece_ids, message.cell_masks):
+        cells = []
+        while mask:
+            bit = (mask & -mask).bit_length() - 1
+            row, col = divmod(bit, cols)
+            cells.append(calendar_tetromino_pb2.Cell(row=str(row), col=str(col)))
+            mask &= mask - 1
+        pieces.append(calendar_tetromino_pb2.Piece(tetromino_name=f"piece_{piece_names[piece_id]}", cells=cells))
+
+    return calendar_tetromino_pb2.PuzzleSolution(solution_pieces=pieces)
+
+
+def load_hosted_variants(directory=None):
+    """ Load the variants to host and compile their placement indexes, so no
+        request pays for it.
+
+        :param directory: The directory of the definitions, defaults to the
+            SOLVER_VARIANTS_DIR environment variable or the bundled variants.
+        :return: A dict of variant name to Variant.
+    """
+    directory = directory or os.environ.get("SOLVER_VARIANTS_DIR") or DEFAULT_VARIANTS_DIR
+    variants = load_variants(directory)
+    for variant in variants.values():
+        get_placement_index(variant=variant)
+    return variants
+
+
+def load_hosted_stores(variants):
+    """ Map the solution stores of the built-in board and of the variants
+        that have an up-to-date one.
+
+        :param variants: The hosted variants keyed by name.
+        :return: A dict of variant name, "" for the built-in board, to SolutionStore.
+    """
+    stores = {"": load_solution_store()}
+    for name, variant in variants.items():
+        stores[name] = load_solution_store(variant=variant)
+    return {name: store for name, store in stores.items() if store is not None}
+
 
 def serve():
+    cache_size = int(os.environ.get("SOLVER_CACHE_SIZE", 128))
+    cache_ttl = float(os.environ["SOLVER_CACHE_TTL"]) if os.environ.get("SOLVER_CACHE_TTL") else None
+
+    start = time.perf_counter()
+    snapshot = load_snapshot()
+    if snapshot is None:
+        print("🟡 No up-to-date startup snapshot found, building the placements")
+    else:
+        print(f"🟢 Loaded the startup snapshot with the solutions of {len(snapshot)} dates")
+
+    solution_table = load_solution_table()
+    if solution_table is None:
+        print("🟡 No up-to-date solution table found, solving every request live")
+    else:
+        print(f"🟢 Loaded {len(solution_table)} precomputed solutions")
+
+    variants = load_hosted_variants()
+    print(f"🟢 Hosting puzzle variants: {', '.join(variants) or 'none'}")
+    solution_stores = load_hosted_stores(variants)
+    print(f"🟢 Mapped all-solutions stores: {', '.join(name or 'calendar (built-in)' for name in solution_stores) or 'none'}")
+
+    servicer = TetrominoSolverServicer(solution_table, cache_size=cache_size, cache_ttl=cache_ttl, variants=variants, solution_stores=solution_stores)
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    calendar_tetromino_pb2_grpc.add_TetrominoSolverServicer_to_server(TetrominoSolverServicer(), server)
+    calendar_tetromino_pb2_grpc.add_TetrominoSolverServicer_to_server(servicer, server)
+    health = add_health_service(server)
+    ready = threading.Event()
+    if os.environ.get("SOLVER_READINESS_PORT"):
+        start_readiness_endpoint(int(os.environ["SOLVER_READINESS_PORT"]), ready)
+
+    # the gRPC port only opens once today's answers are cached, so no
+    # request and no TCP check reaches a cold process
+    solved = servicer.warm_up(snapshot)
+    set_serving(health)
     server.add_insecure_port("[::]:50051")
-    print("🟢 gRPC server listening at [::]:50051")
     server.start()
+    ready.set()
+    print(f"🟢 gRPC server listening at [::]:50051 after {(time.perf_counter() - start) * 1000:.0f}ms, "
+          f"solved {solved} dates to warm up")
     server.wait_for_termination()
 
 
 if __name__ == "__main__":
-    serve()
-if __name__ == "__main__":
-    serve()
+    if os.environ.get("GRPC_SERVER_MODE") == "aio":
+        from calendar_solver.server.aio_server import main
+        main()
+    else:
+        serve()
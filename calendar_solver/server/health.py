@@ -0,0 +1,92 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import calendar_solver.generated.calendar_tetromino_pb2 as calendar_tetromino_pb2
+
+# the names health checks ask for: "" for the whole server and the fully
+# qualified name of the solver service
+SERVICE_NAMES = ("", calendar_tetromino_pb2.DESCRIPTOR.services_by_name["TetrominoSolver"].full_name)
+
+
+def add_health_service(server):
+    """
+    Add the standard gRPC health service to a server, reporting NOT_SERVING
+    until set_serving is called.
+    :param server: The grpc.Server.
+    :return: The HealthServicer.
+    """
+    # imported here so the solver package does not need it to be installed
+    from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+
+    servicer = health.HealthServicer()
+    for name in SERVICE_NAMES:
+        servicer.set(name, health_pb2.HealthCheckResponse.NOT_SERVING)
+    health_pb2_grpc.add_HealthServicer_to_server(servicer, server)
+    return servicer
+
+
+def set_serving(servicer):
+    """
+    Report every service of the server as SERVING.
+    :param servicer: A HealthServicer of add_health_service.
+    """
+    from grpc_health.v1 import health_pb2
+
+    for name in SERVICE_NAMES:
+        servicer.set(name, health_pb2.HealthCheckResponse.SERVING)
+
+
+async def add_aio_health_service(server):
+    """
+    Add the standard gRPC health service to a grpc.aio server, reporting
+    NOT_SERVING until set_aio_serving is called.
+    :param server: The grpc.aio.Server.
+    :return: The asyncio HealthServicer.
+    """
+    from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+
+    servicer = health.aio.HealthServicer()
+    for name in SERVICE_NAMES:
+        await servicer.set(name, health_pb2.HealthCheckResponse.NOT_SERVING)
+    health_pb2_grpc.add_HealthServicer_to_server(servicer, server)
+    return servicer
+
+
+async def set_aio_serving(servicer):
+    """
+    Report every service of the server as SERVING.
+    :param servicer: A HealthServicer of add_aio_health_service.
+    """
+    from grpc_health.v1 import health_pb2
+
+    for name in SERVICE_NAMES:
+        await servicer.set(name, health_pb2.HealthCheckResponse.SERVING)
+
+
+def start_readiness_endpoint(port: int, ready: threading.Event) -> ThreadingHTTPServer:
+    """
+    Mirror the serving status on plain HTTP, for load balancers that cannot
+    send gRPC health checks. GET /healthz answers 200 once ready is set and
+    503 before.
+    :param port: The port to listen on.
+    :param ready: Set once the server is warmed up.
+    :return: The HTTP server, running in a daemon thread.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/healthz":
+                self.send_error(404)
+                return
+            status, body = (200, b"SERVING\n") if ready.is_set() else (503, b"NOT_SERVING\n")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
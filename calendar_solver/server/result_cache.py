@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class ResultCache():
+    """ Bounded LRU cache with a time to live, safe to share between threads.
+
+        Concurrent misses for the same key are coalesced: the first caller
+        computes the value and every other caller waits for its result
+        instead of starting the same computation again.
+    """
+    def __init__(self, maxsize: int = 128, ttl: float = None, clock=time.monotonic):
+        """ Initialize the cache.
+
+            :param maxsize: Maximum number of entries, the least recently used
+                entry is evicted beyond it.
+            :param ttl: Seconds an entry stays valid, None keeps entries until
+                they are evicted.
+            :param clock: Function returning the current time in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute, wait=None):
+        """ Return the cached value of a key, computing it on a miss.
+
+            :param key: A hashable key.
+            :param compute: Function without arguments returning the value.
+                If it raises, the error is passed to every waiting caller and
+                nothing is cached.
+            :param wait: Optional function called with the Future of the
+                caller computing the value, returning its result. Lets a
+                waiting caller give up before the value is ready, defaults
+                to blocking until it is.
+            :return: The value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or self.clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result() if wait is None else wait(future)
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            self._put(key, value)
+        future.set_result(value)
+        return value
+
+    def _put(self, key, value):
+        """ Store a value, evicting the least recently used entries.
+            Must be called with the lock held.
+            INTERNAL USE ONLY.
+        """
+        expires_at = None if self.ttl is None else self.clock() + self.ttl
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """ Drop every entry, the counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """ Counters to size the cache with.
+
+            :return: A dict of the entry count and the hit, miss, coalesced,
+                eviction and expiration counters.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -32,6 +32,13 @@ def run():
         for piece in solution.solution_pieces:
             print_piece(piece)
 
+    # Call StreamPuzzleSolutions
+    print("\n🧩 StreamPuzzleSolutions (streamed solutions):")
+    for i, solution in enumerate(stub.StreamPuzzleSolutions(request)):
+        print(f"\nSolution #{i + 1}")
+        for piece in solution.solution_pieces:
+            print_piece(piece)
+
 def print_piece(piece):
     cell_list = [(cell.row, cell.col) for cell in piece.cells]
     print(f"{piece.tetromino_name}:  @ {cell_list}")
@@ -0,0 +1,225 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+import calendar_solver.generated.calendar_tetromino_pb2 as calendar_tetromino_pb2
+import calendar_solver.generated.calendar_tetromino_pb2_grpc as calendar_tetromino_pb2_grpc
+import grpc
+from calendar_solver.calendar_solver.batch import create_executor
+from calendar_solver.calendar_solver.variant import load_variants
+from calendar_solver.server.aio_server import AsyncTetrominoSolverServicer
+from google.protobuf.timestamp_pb2 import Timestamp
+
+
+def _timestamp(year, month, day):
+    timestamp = Timestamp()
+    timestamp.FromDatetime(datetime(year, month, day, tzinfo=timezone.utc))
+    return timestamp
+
+
+def _solution_key(solution):
+    return sorted(
+        (piece.tetromino_name, sorted((cell.row, cell.col) for cell in piece.cells))
+        for piece in solution.solution_pieces
+    )
+
+
+def setUpModule():
+    # keep the compiled indexes of the test variants out of the package data
+    global _index_dir, _environ
+    _index_dir = tempfile.TemporaryDirectory()
+    _environ = mock.patch.dict(os.environ, {"SOLVER_INDEX_DIR": _index_dir.name})
+    _environ.start()
+
+
+def tearDownModule():
+    _environ.stop()
+    _index_dir.cleanup()
+
+
+class TestAsyncTetrominoSolverServicer(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = create_executor(1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    async def _start(self, **kwargs):
+        self.server = grpc.aio.server()
+        self.servicer = servicer = AsyncTetrominoSolverServicer(self.executor, **kwargs)
+        calendar_tetromino_pb2_grpc.add_TetrominoSolverServicer_to_server(servicer, self.server)
+        port = self.server.add_insecure_port("localhost:0")
+        await self.server.start()
+
+        self.channel = grpc.aio.insecure_channel(f"localhost:{port}")
+        self.stub = calendar_tetromino_pb2_grpc.TetrominoSolverStub(self.channel)
+        self.request = calendar_tetromino_pb2.PuzzleRequest(date=_timestamp(2025, 4, 25))
+
+    async def asyncTearDown(self):
+        await self.channel.close()
+        await self.server.stop(None)
+
+    async def test_solve_puzzle(self):
+        """
+        Test that a single solution covers every piece.
+        """
+        await self._start()
+        response = await self.stub.SolvePuzzle(self.request)
+        self.assertEqual(len(response.solution_pieces), 10)
+
+    async def test_stream_matches_all_solutions(self):
+        """
+        Test that the streamed solutions and the count match the unary ones.
+        """
+        await self._start()
+        all_solutions = (await self.stub.SolvePuzzleAllSolutions(self.request)).solutions
+        streamed = [solution async for solution in self.stub.StreamPuzzleSolutions(self.request)]
+        count = (await self.stub.CountSolutions(self.request)).count
+
+        self.assertEqual(sorted(map(_solution_key, streamed)), sorted(map(_solution_key, all_solutions)))
+        self.assertEqual(count, len(all_solutions))
+
+    async def test_deadline(self):
+        """
+        Test that a search running into the deadline answers with the
+        solutions found so far.
+        """
+        await self._start(engine="dlx")
+        request = calendar_tetromino_pb2.PuzzleRequest(date=_timestamp(2025, 1, 7))
+        response = await self.stub.SolvePuzzleAllSolutions(request, timeout=1.0)
+
+        self.assertTrue(response.partial)
+        self.assertLess(len(response.solutions), 152)
+
+    async def test_variants(self):
+        """
+        Test that requests run on the variant they select.
+        """
+        await self._start(variants=load_variants())
+        self.request.variant = "calendar_flips"
+        self.assertEqual((await self.stub.CountSolutions(self.request)).count, 709)
+
+        self.request.variant = "hexagon"
+        with self.assertRaises(grpc.RpcError) as error:
+            await self.stub.SolvePuzzle(self.request)
+        self.assertEqual(error.exception.code(), grpc.StatusCode.NOT_FOUND)
+
+    async def test_complete_puzzle(self):
+        """
+        Test that completing the first pieces of a solution finds that solution.
+        """
+        await self._start()
+        solution = await self.stub.SolvePuzzle(self.request)
+        request = calendar_tetromino_pb2.CompletionRequest(
+            date=self.request.date, placed_pieces=solution.solution_pieces[:9]
+        )
+        completion = await self.stub.CompletePuzzle(request)
+        self.assertEqual(_solution_key(completion.solutions[0]), _solution_key(solution))
+
+        request.placed_pieces[0].tetromino_name = "piece_hexagon"
+        with self.assertRaises(grpc.RpcError) as error:
+            await self.stub.CompletePuzzle(request)
+        self.assertEqual(error.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+    async def test_sample_solutions(self):
+        """
+        Test that the same seed draws the same distinct solutions.
+        """
+        await self._start()
+        request = calendar_tetromino_pb2.SampleRequest(date=self.request.date, count=3, seed=5)
+        first = (await self.stub.SampleSolutions(request)).solutions
+        second = (await self.stub.SampleSolutions(request)).solutions
+
+        self.assertEqual(list(map(_solution_key, first)), list(map(_solution_key, second)))
+        self.assertEqual(len(set(map(str, map(_solution_key, first)))), 3)
+
+    async def test_solve_puzzle_batch(self):
+        """
+        Test that a batch returns one solution per date in request order.
+        """
+        await self._start()
+        request = calendar_tetromino_pb2.PuzzleBatchRequest(
+            start_date=_timestamp(2025, 4, 24),
+            end_date=_timestamp(2025, 4, 26),
+        )
+        days = [response.date.ToDatetime().day async for response in self.stub.SolvePuzzleBatch(request)]
+        self.assertEqual(days, [24, 25, 26])
+
+    async def test_batch_uses_heavy_lane(self):
+        """
+        Test that every date of a batch in the pool takes a heavy slot.
+        """
+        await self._start(max_heavy=2)
+        in_flight = []
+        executor = self.servicer.executor
+
+        class CountingExecutor():
+            def submit(self, fn, *args):
+                future = executor.submit(fn, *args)
+                in_flight.append(future)
+                running = sum(not pending.done() for pending in in_flight)
+                self.max_running = max(getattr(self, "max_running", 0), running)
+                return future
+
+        self.servicer.executor = counting = CountingExecutor()
+
+        async def batch(month):
+            request = calendar_tetromino_pb2.PuzzleBatchRequest(
+                start_date=_timestamp(2025, month, 1),
+                end_date=_timestamp(2025, month, 6),
+            )
+            return [response async for response in self.stub.SolvePuzzleBatch(request)]
+
+        batches = await asyncio.gather(batch(4), batch(5))
+        self.assertEqual([len(responses) for responses in batches], [6, 6])
+        self.assertEqual(counting.max_running, 2)
+
+    async def test_batch_shares_heavy_lane(self):
+        """
+        Test that a large batch queues a single date at a time, so a heavy
+        request sent while it runs does not wait for the whole batch.
+        """
+        await self._start(max_heavy=1)
+        request = calendar_tetromino_pb2.PuzzleBatchRequest(
+            start_date=_timestamp(2025, 1, 1),
+            end_date=_timestamp(2025, 4, 10),
+        )
+        received = []
+
+        async def batch():
+            async for response in self.stub.SolvePuzzleBatch(request):
+                received.append(response)
+
+        task = asyncio.ensure_future(batch())
+        while not received:
+            await asyncio.sleep(0.01)
+        self.assertLessEqual(self.servicer._queued, 1)
+
+        count = (await self.stub.CountSolutions(self.request)).count
+        self.assertLess(len(received), 50)
+        await task
+
+        self.assertEqual(count, 5)
+        self.assertEqual(len(received), 100)
+
+    async def test_queue_full(self):
+        """
+        Test that requests beyond the queue depth are rejected.
+        """
+        await self._start(max_concurrency=1, max_heavy=1, max_queue=0)
+        calls = [self.stub.SolvePuzzleAllSolutions(self.request) for _ in range(3)]
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        errors = [result for result in results if isinstance(result, grpc.RpcError)]
+        self.assertTrue(errors)
+        for error in errors:
+            self.assertEqual(error.code(), grpc.StatusCode.RESOURCE_EXHAUSTED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+from calendar_solver.calendar_solver.array_dlx import ArrayDLX
+from calendar_solver.calendar_solver.calendar_solver import CalenderSolver
+from calendar_solver.calendar_solver.util import DayOfWeek, Month
+
+
+def _normalize(solutions):
+    return sorted(sorted(sorted(step) for step in solution) for solution in solutions)
+
+
+def _links(solver):
+    return [list(links) for links in (solver.L, solver.R, solver.U, solver.D, solver.S)]
+
+
+class TestArrayDLX(unittest.TestCase):
+    def setUp(self):
+        columns = [(name, ArrayDLX.PRIMARY) for name in "ABCDEFG"]
+        self.solver = ArrayDLX(columns)
+        rows = [[2, 4, 5], [0, 3, 6], [1, 2, 5], [0, 3], [1, 6], [3, 4, 6]]
+        for i, row in enumerate(rows):
+            self.solver.appendRow(row, i)
+
+    def test_small_problem(self):
+        """
+        Test Knuth's example exact cover problem.
+        """
+        solutions = [sorted(solution) for solution in self.solver.solve()]
+        self.assertEqual(solutions, [[0, 3, 4]])
+        self.assertEqual(self.solver.getRowList(4), ["B", "G"])
+
+    def test_restores_links(self):
+        """
+        Test that a finished or abandoned search leaves the matrix as it was.
+        """
+        links = _links(self.solver)
+        list(self.solver.solve())
+        self.assertEqual(_links(self.solver), links)
+
+        solutions = self.solver.solve()
+        next(solutions)
+        solutions.close()
+        self.assertEqual(_links(self.solver), links)
+
+    def test_use_row_and_exclude_columns(self):
+        """
+        Test that forced rows and excluded columns are undone in reverse order.
+        """
+        links = _links(self.solver)
+        self.solver.useRow(3)
+        self.assertEqual([sorted(s) for s in self.solver.solve()], [[0, 3, 4]])
+        with self.assertRaises(ValueError):
+            self.solver.useRow(1)
+        self.solver.unuseRow(3)
+
+        # without columns A and D, C E F and B G are the only cover of the rest
+        self.solver.excludeColumns([0, 3])
+        self.assertEqual([sorted(s) for s in self.solver.solve()], [[0, 4]])
+        self.solver.includeColumns()
+        self.assertEqual(_links(self.solver), links)
+
+    def test_matches_dlx(self):
+        """
+        Test that both engines find the same solutions, also when the shared
+        solver is reused for another date.
+        """
+        for date in [(2025, Month.APR, 25, DayOfWeek.FRI), (2025, Month.DEC, 31, DayOfWeek.SAT)]:
+            _, dlx_solutions = CalenderSolver(*date, engine="dlx").solve_exact_cover()
+            solver = CalenderSolver(*date, engine="array")
+            first, array_solutions = solver.solve_exact_cover()
+            self.assertEqual(_normalize(dlx_solutions), _normalize(array_solutions))
+            self.assertEqual(solver.solve_exact_cover(first_solution_only=True)[0], first)
+
+
+if __name__ == "__main__":
+    unittest.main()
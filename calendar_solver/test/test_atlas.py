@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from calendar_solver.calendar_solver.atlas import build_atlas, hole_kind
+from calendar_solver.calendar_solver.solution_store import (
+    build_solution_store, load_solution_store)
+from calendar_solver.calendar_solver.util import (DayOfWeek, Month,
+                                                  iter_hole_triples)
+from calendar_solver.calendar_solver.variant import Variant
+
+# a 2 x 4 board left with 5 cells to tile by every date
+VARIANT = Variant(
+    "tiny",
+    [["JAN", "FEB", 1, 2], [3, 4, "SUN", "MON"]],
+    {
+        "domino": {"name": "d", "shape": [[1, 1]]},
+        "corner": {"name": "c", "shape": [[1, 0], [1, 1]]},
+    },
+)
+TRIPLES = [
+    triple for triple in iter_hole_triples()
+    if triple[0] in (Month.JAN, Month.FEB) and triple[1] <= 4 and triple[2] in (DayOfWeek.SUN, DayOfWeek.MON)
+]
+
+
+def setUpModule():
+    # keep the compiled indexes of the test variants out of the package data
+    global _index_dir, _environ
+    _index_dir = tempfile.TemporaryDirectory()
+    _environ = mock.patch.dict(os.environ, {"SOLVER_INDEX_DIR": _index_dir.name})
+    _environ.start()
+
+
+def tearDownModule():
+    _environ.stop()
+    _index_dir.cleanup()
+
+
+class Interrupted(Exception):
+    pass
+
+
+class TestAtlas(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.expected_path = os.path.join(cls.tmpdir.name, "expected.bin")
+        # the board only has cells for TRIPLES, every other date is skipped
+        build_solution_store(cls.expected_path, VARIANT, workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        self.path = os.path.join(self.tmpdir.name, "atlas.bin")
+        self.expected = load_solution_store(self.expected_path, VARIANT)
+
+    def tearDown(self):
+        self.expected.close()
+
+    def assertSameStore(self, path):
+        atlas = load_solution_store(path, VARIANT)
+        try:
+            self.assertEqual(len(atlas), len(TRIPLES))
+            for triple in TRIPLES:
+                self.assertEqual(bytes(atlas.solutions(*triple)), bytes(self.expected.solutions(*triple)), triple)
+        finally:
+            atlas.close()
+
+    def test_hole_kind(self):
+        """
+        Test that cells are classified by the part of a date they show.
+        """
+        self.assertEqual([hole_kind(label) for label in ("JAN", 31, "SAT", "X")],
+                         ["month", "day", "day_of_week", None])
+
+    def test_store_skips_missing_cells(self):
+        """
+        Test that the store builder leaves the dates the board has no cells
+        for unstored.
+        """
+        self.assertEqual(len(self.expected), len(TRIPLES))
+        self.assertIsNone(self.expected.count(Month.MAR, 1, DayOfWeek.SUN))
+        self.assertIsNone(self.expected.count(Month.JAN, 1, DayOfWeek.TUE))
+
+    def test_matches_store(self):
+        """
+        Test that one search stores the same solutions in the same order as
+        a search per date.
+        """
+        total = build_atlas(self.path, VARIANT, workers=1)
+        self.assertEqual(total, sum(self.expected.count(*triple) for triple in TRIPLES))
+        self.assertGreater(total, 0)
+        self.assertFalse(os.path.exists(f"{self.path}.checkpoint"))
+        self.assertSameStore(self.path)
+
+    def test_resume(self):
+        """
+        Test that an interrupted build resumes from its checkpoint.
+        """
+        def interrupt(done, total):
+            if done:
+                raise Interrupted()
+
+        with self.assertRaises(Interrupted):
+            build_atlas(self.path, VARIANT, workers=1, progress=interrupt)
+        checkpoint = f"{self.path}.checkpoint"
+        with open(checkpoint, "a", encoding="utf-8") as f:
+            f.write('{"subtree": 1, "solu')
+
+        progress = []
+        build_atlas(self.path, VARIANT, workers=1, progress=lambda done, total: progress.append(done))
+        self.assertEqual(progress[0], 1)
+        self.assertSameStore(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import datetime
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from calendar_solver.calendar_solver.batch import solve_dates
+from calendar_solver.calendar_solver.util import get_hole_triple
+
+
+class RecordingExecutor():
+    def __init__(self, executor):
+        self.executor = executor
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = self.executor.submit(fn, *args)
+        self.futures.append(future)
+        return future
+
+
+class FirstDateTable():
+    def __init__(self, date):
+        self.triple = get_hole_triple(date)
+
+    def lookup(self, *triple):
+        return [] if triple == self.triple else None
+
+
+class TestSolveDates(unittest.TestCase):
+    def test_close_cancels_pending(self):
+        """
+        Test that abandoning a batch cancels the dates still queued on the executor.
+        """
+        dates = [datetime.date(2025, 1, 1) + datetime.timedelta(days=i) for i in range(8)]
+        release = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # keep the only worker busy so every submitted date stays queued
+            pool.submit(release.wait)
+            executor = RecordingExecutor(pool)
+            results = solve_dates(dates, executor, solution_table=FirstDateTable(dates[0]))
+            self.assertEqual(next(results), (dates[0], []))
+            results.close()
+            release.set()
+        self.assertEqual(len(executor.futures), len(dates) - 1)
+        self.assertTrue(all(future.cancelled() for future in executor.futures))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import json
+import unittest
+
+from calendar_solver.calendar_solver.benchmark import (STAGES,
+                                                       benchmark_placements,
+                                                       compare, run_benchmark,
+                                                       summarize)
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_summarize(self):
+        """
+        Test the distribution of a list of timings.
+        """
+        summary = summarize([float(value) for value in range(1, 101)])
+        self.assertEqual((summary["min"], summary["median"], summary["p99"]), (1.0, 50.5, 99.0))
+
+    def test_run_benchmark(self):
+        """
+        Test that every stage is timed for every triple and the result is JSON.
+        """
+        result = run_benchmark("bitboard", limit=2)
+        json.dumps(result)
+
+        self.assertEqual(result["triples"], 2)
+        self.assertEqual(list(result["stages"]), STAGES)
+        for stage in STAGES:
+            self.assertEqual(result["stages"][stage]["count"], 2, stage)
+        self.assertEqual(set(compare(result, result).values()), {1.0})
+
+    def test_benchmark_placements(self):
+        """
+        Test that both placement index builds are timed.
+        """
+        [result] = benchmark_placements([6], repeat=1)
+        self.assertEqual(result["size"], 6)
+        self.assertGreater(result["placements"], 0)
+        self.assertGreater(result["python"], 0)
+        self.assertGreater(result["vectorized"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from calendar_solver.calendar_solver.bitboard import BitboardDLX
+from calendar_solver.calendar_solver.calendar_solver import CalenderSolver
+from calendar_solver.calendar_solver.util import DayOfWeek, Month
+
+
+def _normalize(solutions):
+    return sorted(sorted(sorted(step) for step in solution) for solution in solutions)
+
+
+class TestBitboardDLX(unittest.TestCase):
+    def test_small_problem(self):
+        """
+        Test Knuth's example exact cover problem.
+        """
+        columns = [(name, BitboardDLX.PRIMARY) for name in "ABCDEFG"]
+        solver = BitboardDLX(columns)
+        rows = [[2, 4, 5], [0, 3, 6], [1, 2, 5], [0, 3], [1, 6], [3, 4, 6]]
+        for i, row in enumerate(rows):
+            solver.appendRow(row, i)
+
+        solutions = [sorted(solution) for solution in solver.solve()]
+        self.assertEqual(solutions, [[0, 3, 4]])
+        self.assertEqual(solver.getRowList(4), ["B", "G"])
+
+    def test_use_row(self):
+        """
+        Test that forced rows are part of every solution.
+        """
+        columns = [(name, BitboardDLX.PRIMARY) for name in "ABCD"]
+        solver = BitboardDLX(columns)
+        for row in [[0, 1], [2, 3], [0], [1], [2], [3]]:
+            solver.appendRow(row)
+
+        self.assertEqual(len(list(solver.solve())), 4)
+        solver.useRow(0)
+        self.assertEqual(sorted(sorted(s) for s in solver.solve()), [[0, 1], [0, 4, 5]])
+        solver.unuseRow(0)
+        self.assertEqual(len(list(solver.solve())), 4)
+
+    def test_unrank(self):
+        """
+        Test that unranking every position gives the solutions in search order.
+        """
+        solver = CalenderSolver(2025, Month.APR, 25, DayOfWeek.FRI, engine="bitboard")
+        exact_cover = solver._create_solver()
+        solutions = list(exact_cover.solve())
+
+        self.assertEqual(exact_cover.count(), len(solutions))
+        self.assertEqual([exact_cover.unrank(rank) for rank in range(len(solutions))], solutions)
+        with self.assertRaises(IndexError):
+            exact_cover.unrank(len(solutions))
+
+    def test_split(self):
+        """
+        Test that searching the subtrees one after the other finds the
+        solutions of a single search in the same order.
+        """
+        solver = CalenderSolver(2025, Month.APR, 25, DayOfWeek.FRI, engine="bitboard")
+        exact_cover = solver._create_solver()
+        solutions = list(exact_cover.solve())
+
+        split_solutions = []
+        for rows in exact_cover.split(2):
+            for row in rows:
+                exact_cover.useRow(row)
+            split_solutions.extend(exact_cover.solve())
+            for row in reversed(rows):
+                exact_cover.unuseRow(row)
+        self.assertEqual(split_solutions, solutions)
+
+    def test_matches_dlx(self):
+        """
+        Test that both engines find the same set of solutions.
+        """
+        date = (2025, Month.APR, 25, DayOfWeek.FRI)
+        _, dlx_solutions = CalenderSolver(*date, engine="dlx").solve_exact_cover()
+        _, bitboard_solutions = CalenderSolver(*date, engine="bitboard").solve_exact_cover()
+        self.assertEqual(_normalize(dlx_solutions), _normalize(bitboard_solutions))
+
+    def test_unknown_engine(self):
+        """
+        Test that an unknown engine is rejected.
+        """
+        with self.assertRaises(ValueError):
+            CalenderSolver(2025, Month.APR, 25, DayOfWeek.FRI, engine="missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from calendar_solver.calendar_solver.calendar_solver import CalenderSolver
+from calendar_solver.calendar_solver.cancellation import (CancellationToken,
+                                                          SearchCancelled)
+from calendar_solver.calendar_solver.engines import ENGINES
+from calendar_solver.calendar_solver.util import DayOfWeek, Month
+
+
+class TestCancellationToken(unittest.TestCase):
+    def test_check_every(self):
+        """
+        Test that the deadline is only looked at every check_every nodes.
+        """
+        now = [0.0]
+        token = CancellationToken.with_timeout(1.0, check_every=4, clock=lambda: now[0])
+        now[0] = 2.0
+        self.assertEqual([token.tick() for _ in range(4)], [False, False, False, True])
+        self.assertEqual(token.reason, CancellationToken.DEADLINE)
+
+    def test_is_active(self):
+        """
+        Test that a client going away cancels the search.
+        """
+        token = CancellationToken(is_active=lambda: False)
+        self.assertTrue(token.check())
+        self.assertEqual(token.reason, CancellationToken.CANCELLED)
+
+
+class TestCancelledSearch(unittest.TestCase):
+    def test_deadline(self):
+        """
+        Test that every engine stops at a passed deadline and can search again.
+        """
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                solver = CalenderSolver(2025, Month.APR, 25, DayOfWeek.FRI, engine=engine)
+                with self.assertRaises(SearchCancelled) as error:
+                    solver.solve_exact_cover(cancel=CancellationToken(deadline=0))
+                self.assertEqual(error.exception.reason, CancellationToken.DEADLINE)
+                self.assertEqual(error.exception.solutions, [])
+
+                _, all_solutions = solver.solve_exact_cover()
+                self.assertEqual(len(all_solutions), 5)
+
+    def test_cancel(self):
+        """
+        Test that cancelling stops the search within a few nodes and keeps
+        the solutions found so far.
+        """
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                solver = CalenderSolver(2025, Month.APR, 25, DayOfWeek.FRI, engine=engine)
+                token = CancellationToken(check_every=1)
+                solutions = []
+                for solution in solver.iter_solutions(cancel=token):
+                    solutions.append(solution)
+                    token.cancel()
+                self.assertEqual(len(solutions), 1)
+                self.assertTrue(token.cancelled)
+
+                first, _ = solver.solve_exact_cover(first_solution_only=True)
+                self.assertEqual(sorted(map(sorted, first)), sorted(map(sorted, solutions[0])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,323 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from concurrent import futures
+from datetime import datetime, timezone
+from unittest import mock
+
+import calendar_solver.generated.calendar_tetromino_pb2 as calendar_tetromino_pb2
+import calendar_solver.generated.calendar_tetromino_pb2_grpc as calendar_tetromino_pb2_grpc
+import grpc
+from calendar_solver.calendar_solver.solution_store import (
+    build_solution_store, load_solution_store)
+from calendar_solver.calendar_solver.util import DayOfWeek, Month
+from calendar_solver.calendar_solver.variant import Variant, load_variants
+from calendar_solver.server.grpc_server import (TetrominoSolverServicer,
+                                                expand_compact_placement)
+from google.protobuf.timestamp_pb2 import Timestamp
+
+
+def _timestamp(year, month, day):
+    timestamp = Timestamp()
+    timestamp.FromDatetime(datetime(year, month, day, tzinfo=timezone.utc))
+    return timestamp
+
+
+def _solution_key(solution):
+    return sorted(
+        (piece.tetromino_name, sorted((cell.row, cell.col) for cell in piece.cells))
+        for piece in solution.solution_pieces
+    )
+
+
+def setUpModule():
+    # keep the compiled indexes of the test variants out of the package data
+    global _index_dir, _environ
+    _index_dir = tempfile.TemporaryDirectory()
+    _environ = mock.patch.dict(os.environ, {"SOLVER_INDEX_DIR": _index_dir.name})
+    _environ.start()
+
+
+def tearDownModule():
+    _environ.stop()
+    _index_dir.cleanup()
+
+
+class TestTetrominoSolverServicer(unittest.TestCase):
+    def setUp(self):
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+        self.servicer = TetrominoSolverServicer(batch_workers=1, variants=load_variants())
+        calendar_tetromino_pb2_grpc.add_TetrominoSolverServicer_to_server(self.servicer, self.server)
+        port = self.server.add_insecure_port("localhost:0")
+        self.server.start()
+
+        self.channel = grpc.insecure_channel(f"localhost:{port}")
+        self.stub = calendar_tetromino_pb2_grpc.TetrominoSolverStub(self.channel)
+
+        self.request = calendar_tetromino_pb2.PuzzleRequest(date=_timestamp(2025, 4, 25))
+
+    def tearDown(self):
+        self.channel.close()
+        self.server.stop(None)
+
+    def test_solve_puzzle(self):
+        """
+        Test that a single solution covers every piece.
+        """
+        response = self.stub.SolvePuzzle(self.request)
+        self.assertEqual(len(response.solution_pieces), 10)
+
+    def test_solve_puzzle_cached(self):
+        """
+        Test that the same date is answered from the cache.
+        """
+        first = self.stub.SolvePuzzle(self.request)
+        second = self.stub.SolvePuzzle(self.request)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.servicer.cache.stats()["hits"], 1)
+        self.assertEqual(self.servicer.cache.stats()["misses"], 1)
+
+    def test_stats(self):
+        """
+        Test that a search sends its metrics and adds them to GetStats.
+        """
+        _, call = self.stub.SolvePuzzleAllSolutions.with_call(self.request)
+        metadata = dict(call.trailing_metadata())
+        search_stats = json.loads(metadata["search-stats"])
+        self.stub.SolvePuzzleAllSolutions(self.request)
+
+        stats = self.stub.GetStats(calendar_tetromino_pb2.StatsRequest())
+        self.assertEqual(stats.nodes, search_stats["nodes"])
+        self.assertEqual(stats.solutions, 5)
+        self.assertEqual(stats.cache.hits, 1)
+        self.assertIn("search", stats.phase_seconds)
+
+    def test_compact_solutions(self):
+        """
+        Test that compact solutions expand to the same solutions.
+        """
+        request = calendar_tetromino_pb2.PuzzleRequest(date=_timestamp(2025, 4, 25), compact=True)
+        compact = self.stub.SolvePuzzleAllSolutions(request).solutions
+        all_solutions = self.stub.SolvePuzzleAllSolutions(self.request).solutions
+
+        for solution in compact:
+            self.assertFalse(solution.solution_pieces)
+            self.assertEqual(len(solution.piece_ids), 10)
+        self.assertEqual(
+            sorted(_solution_key(expand_compact_placement(s)) for s in compact),
+            sorted(_solution_key(s) for s in all_solutions),
+        )
+
+    def test_stream_matches_all_solutions(self):
+        """
+        Test that the streamed solutions are the same as the unary ones.
+        """
+        all_solutions = self.stub.SolvePuzzleAllSolutions(self.request).solutions
+        streamed = list(self.stub.StreamPuzzleSolutions(self.request))
+
+        self.assertEqual(
+            sorted(_solution_key(s) for s in streamed),
+            sorted(_solution_key(s) for s in all_solutions),
+        )
+
+    def test_count_solutions(self):
+        """
+        Test that the count matches the number of solutions.
+        """
+        all_solutions = self.stub.SolvePuzzleAllSolutions(self.request).solutions
+        self.assertEqual(self.stub.CountSolutions(self.request).count, len(all_solutions))
+
+    def test_variants(self):
+        """
+        Test that a request can select a hosted variant and unknown ones are rejected.
+        """
+        request = calendar_tetromino_pb2.PuzzleRequest(date=_timestamp(2025, 4, 25), variant="calendar_flips")
+        self.assertEqual(self.stub.CountSolutions(request).count, 709)
+        self.assertEqual(len(self.stub.SolvePuzzle(request).solution_pieces), 10)
+
+        request.compact = True
+        compact = self.stub.SolvePuzzle(request)
+        self.assertEqual(len(expand_compact_placement(compact, self.servicer.variants["calendar_flips"]).solution_pieces), 10)
+
+        with self.assertRaises(grpc.RpcError) as error:
+            self.stub.SolvePuzzle(calendar_tetromino_pb2.PuzzleRequest(date=_timestamp(2025, 4, 25), variant="hexagon"))
+        self.assertEqual(error.exception.code(), grpc.StatusCode.NOT_FOUND)
+
+    def test_variant_without_date(self):
+        """
+        Test that a date a variant has no cells for is an invalid argument.
+        """
+        self.servicer.variants["corner"] = Variant(
+            "corner",
+            [["JAN", 1, "WED"], ["a", "b", "c"]],
+            {"tromino": {"name": "t", "shape": [[1, 1, 1]]}},
+        )
+        request = calendar_tetromino_pb2.PuzzleRequest(date=_timestamp(2025, 1, 1), variant="corner")
+        self.assertEqual(self.stub.CountSolutions(request).count, 1)
+
+        request.date.CopyFrom(_timestamp(2025, 1, 2))
+        calls = [
+            self.stub.SolvePuzzle, self.stub.SolvePuzzleAllSolutions, self.stub.CountSolutions,
+            lambda request: list(self.stub.StreamPuzzleSolutions(request)),
+            lambda request: self.stub.SampleSolutions(
+                calendar_tetromino_pb2.SampleRequest(date=request.date, count=1, variant="corner")),
+            lambda request: list(self.stub.SolvePuzzleBatch(
+                calendar_tetromino_pb2.PuzzleBatchRequest(dates=[request.date], variant="corner"))),
+        ]
+        for call in calls:
+            with self.assertRaises(grpc.RpcError) as error:
+                call(request)
+            self.assertEqual(error.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+    def test_solution_store(self):
+        """
+        Test that stored solutions are served like searched ones.
+        """
+        expected = self.stub.SolvePuzzleAllSolutions(self.request).solutions
+        expected_compact = self.stub.SolvePuzzleAllSolutions(
+            calendar_tetromino_pb2.PuzzleRequest(date=_timestamp(2025, 4, 25), compact=True)).solutions
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "all_solutions.bin")
+            build_solution_store(path, workers=1, triples=[(Month.APR, 25, DayOfWeek.FRI)])
+            store = load_solution_store(path)
+            servicer = TetrominoSolverServicer(solution_stores={"": store})
+
+            response = servicer._solve_all_solutions(2025, Month.APR, 25, DayOfWeek.FRI)
+            compact = servicer._solve_all_solutions(2025, Month.APR, 25, DayOfWeek.FRI, compact=True)
+            store.close()
+
+        self.assertEqual(sorted(map(_solution_key, response.solutions)), sorted(map(_solution_key, expected)))
+        self.assertEqual(
+            sorted(_solution_key(expand_compact_placement(s)) for s in compact.solutions),
+            sorted(_solution_key(expand_compact_placement(s)) for s in expected_compact),
+        )
+
+    def test_complete_puzzle(self):
+        """
+        Test that completing the first pieces of a solution finds that solution.
+        """
+        solutions = self.stub.SolvePuzzleAllSolutions(self.request).solutions
+        solution = solutions[0]
+        request = calendar_tetromino_pb2.CompletionRequest(
+            date=self.request.date, placed_pieces=solution.solution_pieces[:4], all_solutions=True
+        )
+        completions = self.stub.CompletePuzzle(request).solutions
+        self.assertIn(_solution_key(solution), list(map(_solution_key, completions)))
+        self.assertLessEqual(len(completions), len(solutions))
+
+        request.all_solutions = False
+        self.assertEqual(len(self.stub.CompletePuzzle(request).solutions), 1)
+
+        request.placed_pieces.append(solution.solution_pieces[0])
+        with self.assertRaises(grpc.RpcError) as error:
+            self.stub.CompletePuzzle(request)
+        self.assertEqual(error.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+    def test_sample_solutions(self):
+        """
+        Test that a seed draws the same solutions with and without a solution store.
+        """
+        request = calendar_tetromino_pb2.SampleRequest(date=_timestamp(2025, 4, 25), count=3, seed=11)
+        samples = self.stub.SampleSolutions(request).solutions
+        self.assertEqual(len(samples), 3)
+        self.assertEqual(list(self.stub.SampleSolutions(request).solutions), list(samples))
+
+        request.count = 10
+        self.assertEqual(len(self.stub.SampleSolutions(request).solutions), 5)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "all_solutions.bin")
+            build_solution_store(path, workers=1, triples=[(Month.APR, 25, DayOfWeek.FRI)])
+            store = load_solution_store(path)
+            servicer = TetrominoSolverServicer(solution_stores={"": store})
+            stored = servicer._sample_solutions(2025, Month.APR, 25, DayOfWeek.FRI, 3, seed=11)
+            store.close()
+
+        self.assertEqual(list(map(_solution_key, stored.solutions)), list(map(_solution_key, samples)))
+
+    def test_deadline(self):
+        """
+        Test that a search running into the deadline answers with the
+        solutions found so far and caches nothing.
+        """
+        self.servicer.engine = "dlx"
+        request = calendar_tetromino_pb2.PuzzleRequest(date=_timestamp(2025, 1, 7))
+        response = self.stub.SolvePuzzleAllSolutions(request, timeout=0.5)
+
+        self.assertTrue(response.partial)
+        self.assertLess(len(response.solutions), 152)
+        self.assertEqual(len(self.servicer.cache), 0)
+
+    def test_deadline_while_waiting(self):
+        """
+        Test that a request waiting on the search of another request stops
+        at its own deadline, without solutions.
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        def solve_all_solutions(*args, **kwargs):
+            started.set()
+            release.wait()
+            return calendar_tetromino_pb2.PuzzleSolutions()
+
+        self.servicer._solve_all_solutions = solve_all_solutions
+        leader = self.stub.SolvePuzzleAllSolutions.future(self.request)
+        started.wait()
+        try:
+            response = self.stub.SolvePuzzleAllSolutions(self.request, timeout=0.5)
+            self.assertTrue(response.partial)
+            self.assertEqual(len(response.solutions), 0)
+            self.assertEqual(self.servicer.cache.stats()["coalesced"], 1)
+        finally:
+            release.set()
+        self.assertFalse(leader.result().partial)
+
+    def test_warm_up(self):
+        """
+        Test that warming up caches today's and tomorrow's first solutions.
+        """
+        self.assertEqual(self.servicer.warm_up(), 2)
+        self.assertEqual(len(self.servicer.cache), 2)
+
+        today = datetime.now()
+        request = calendar_tetromino_pb2.PuzzleRequest(date=_timestamp(today.year, today.month, today.day))
+        self.stub.SolvePuzzle(request)
+        self.assertEqual(self.servicer.cache.stats()["hits"], 1)
+
+    def test_solve_puzzle_batch(self):
+        """
+        Test that a batch returns one solution per date in request order.
+        """
+        request = calendar_tetromino_pb2.PuzzleBatchRequest(
+            start_date=_timestamp(2025, 4, 24),
+            end_date=_timestamp(2025, 4, 26),
+            dates=[_timestamp(2025, 4, 25)],
+        )
+        responses = list(self.stub.SolvePuzzleBatch(request))
+
+        days = [response.date.ToDatetime().day for response in responses]
+        self.assertEqual(days, [24, 25, 26, 25])
+        for response in responses:
+            self.assertEqual(len(response.solution.solution_pieces), 10)
+        self.assertEqual(_solution_key(responses[1].solution), _solution_key(responses[3].solution))
+
+    def test_solve_puzzle_batch_invalid_range(self):
+        """
+        Test that a reversed range is rejected.
+        """
+        request = calendar_tetromino_pb2.PuzzleBatchRequest(
+            start_date=_timestamp(2025, 4, 26),
+            end_date=_timestamp(2025, 4, 24),
+        )
+        with self.assertRaises(grpc.RpcError) as error:
+            list(self.stub.SolvePuzzleBatch(request))
+        self.assertEqual(error.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from concurrent import futures
+
+import grpc
+from calendar_solver.server.health import (SERVICE_NAMES, add_health_service,
+                                           set_serving,
+                                           start_readiness_endpoint)
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+
+
+class TestHealth(unittest.TestCase):
+    def setUp(self):
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        self.health = add_health_service(self.server)
+        port = self.server.add_insecure_port("localhost:0")
+        self.server.start()
+
+        self.channel = grpc.insecure_channel(f"localhost:{port}")
+        self.stub = health_pb2_grpc.HealthStub(self.channel)
+
+        self.ready = threading.Event()
+        self.http_server = start_readiness_endpoint(0, self.ready)
+        self.url = f"http://localhost:{self.http_server.server_address[1]}/healthz"
+
+    def tearDown(self):
+        self.http_server.shutdown()
+        self.http_server.server_close()
+        self.channel.close()
+        self.server.stop(None)
+
+    def _statuses(self):
+        return [self.stub.Check(health_pb2.HealthCheckRequest(service=name)).status for name in SERVICE_NAMES]
+
+    def test_serving_after_warm_up(self):
+        """
+        Test that the gRPC health service and the HTTP endpoint only report serving once ready.
+        """
+        self.assertEqual(self._statuses(), [health_pb2.HealthCheckResponse.NOT_SERVING] * 2)
+        with self.assertRaises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(self.url)
+        self.assertEqual(error.exception.code, 503)
+
+        set_serving(self.health)
+        self.ready.set()
+        self.assertEqual(self._statuses(), [health_pb2.HealthCheckResponse.SERVING] * 2)
+        with urllib.request.urlopen(self.url) as response:
+            self.assertEqual(response.status, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from calendar_solver.calendar_solver.calendar_solver import CalenderSolver
+from calendar_solver.calendar_solver.parallel import split_search
+from calendar_solver.calendar_solver.util import DayOfWeek, Month
+
+
+def _normalize(solutions):
+    return sorted(sorted(sorted(step) for step in solution) for solution in solutions)
+
+
+class TestParallelSolve(unittest.TestCase):
+    def setUp(self):
+        self.solver = CalenderSolver(2025, Month.DEC, 31, DayOfWeek.SAT, engine="bitboard")
+
+    def test_split_is_a_partition(self):
+        """
+        Test that no two subtrees share the same prefix rows.
+        """
+        prefixes = split_search(self.solver.columns, self.solver.rows, 2)
+        self.assertEqual(len(prefixes), len(set(tuple(prefix) for prefix in prefixes)))
+        for prefix in prefixes:
+            self.assertEqual(len(prefix), 2)
+
+    def test_matches_serial(self):
+        """
+        Test that the parallel search finds the same solutions as the serial one.
+        """
+        _, serial = self.solver.solve_exact_cover()
+        for split_depth in (1, 2):
+            with self.subTest(split_depth=split_depth):
+                _, parallel = self.solver.solve_exact_cover(workers=2, split_depth=split_depth)
+                self.assertEqual(_normalize(parallel), _normalize(serial))
+
+
+if __name__ == "__main__":
+    unittest.main()
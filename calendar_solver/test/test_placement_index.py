@@ -0,0 +1,157 @@
+import unittest
+
+from calendar_solver.calendar_solver.benchmark import SquareGrid
+from calendar_solver.calendar_solver.calendar_solver import (
+    CalenderGrid, CalenderSolver, create_tetrominos, get_placement_index)
+from calendar_solver.calendar_solver.placement_index import PlacementIndex
+from calendar_solver.calendar_solver.util import DayOfWeek, Month
+
+
+class TestPlacementIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = get_placement_index()
+
+    def test_shared(self):
+        """
+        Test that every solver shares the same index.
+        """
+        solver = CalenderSolver(2025, Month.APR, 25, DayOfWeek.FRI)
+        self.assertIs(solver.placement_index, self.index)
+
+    def test_reserved_cells_are_skipped(self):
+        """
+        Test that no available placement covers a reserved cell.
+        """
+        solver = CalenderSolver(2025, Month.APR, 25, DayOfWeek.FRI)
+        reserved = set(solver.empty_cells)
+
+        self.assertLess(len(solver.rows), len(self.index))
+        for name, _, cells in solver.row_metadata:
+            self.assertTrue(reserved.isdisjoint(cells), name)
+
+    def test_rows_match_metadata(self):
+        """
+        Test that every row covers its piece column and its cells.
+        """
+        for row, (name, _, cells) in zip(self.index.rows, self.index.metadata):
+            expected = [self.index.piece_column[name]] + [self.index.cell_column[cell] for cell in cells]
+            self.assertEqual(row, expected)
+
+    def test_no_duplicate_placements(self):
+        """
+        Test that symmetric pieces do not add the same placement twice.
+        """
+        placements = [(name, frozenset(cells)) for name, _, cells in self.index.metadata]
+        self.assertEqual(len(placements), len(set(placements)))
+
+    def test_vectorized(self):
+        """
+        Test that the numpy build adds the same placements in the same order.
+        """
+        for grid in [CalenderGrid(), SquareGrid(9)]:
+            with self.subTest(rows=grid.rows):
+                expected = PlacementIndex(grid, create_tetrominos(), flips=True)
+                index = PlacementIndex(grid, create_tetrominos(), flips=True, vectorized=True)
+                self.assertEqual(index.rows, expected.rows)
+                self.assertEqual(index.metadata, expected.metadata)
+                self.assertEqual(index.cell_placements, expected.cell_placements)
+
+    def test_flips(self):
+        """
+        Test that mirror images add placements and solutions.
+        """
+        flipped = get_placement_index(flips=True)
+        self.assertGreater(len(flipped), len(self.index))
+
+        solver = CalenderSolver(2025, Month.APR, 25, DayOfWeek.FRI, engine="bitboard", flips=True)
+        _, all_solutions = solver.solve_exact_cover()
+        self.assertEqual(len(all_solutions), solver.count_solutions())
+        self.assertGreater(len(all_solutions), 5)
+
+
+class TestSolveExactCover(unittest.TestCase):
+    def test_solutions_are_unique(self):
+        """
+        Test that every solution is returned once.
+        """
+        _, all_solutions = CalenderSolver(2025, Month.DEC, 31, DayOfWeek.SAT).solve_exact_cover()
+        keys = [frozenset(frozenset(step) for step in solution) for solution in all_solutions]
+        self.assertEqual(len(keys), len(set(keys)))
+
+    def test_no_solution(self):
+        """
+        Test that a date without solutions returns empty results.
+        """
+        solver = CalenderSolver(2025, Month.JAN, 27, DayOfWeek.MON, engine="bitboard")
+        self.assertEqual(solver.solve_exact_cover(), ([], []))
+        self.assertEqual(solver.solve_exact_cover(first_solution_only=True), ([], []))
+
+
+
+class TestSampleSolutions(unittest.TestCase):
+    def test_sample_solutions(self):
+        """
+        Test that samples are distinct solutions and the same seed draws the same ones.
+        """
+        solver = CalenderSolver(2025, Month.DEC, 31, DayOfWeek.SAT, engine="bitboard")
+        _, all_solutions = solver.solve_exact_cover()
+        keys = [frozenset(frozenset(step) for step in solution) for solution in all_solutions]
+
+        samples = solver.sample_solutions(3, seed=7)
+        sample_keys = [frozenset(frozenset(step) for step in solution) for solution in samples]
+        self.assertEqual(len(set(sample_keys)), 3)
+        self.assertTrue(set(sample_keys) <= set(keys))
+        self.assertEqual(solver.sample_solutions(3, seed=7), samples)
+
+        everything = solver.sample_solutions(len(keys) + 10)
+        self.assertEqual(sorted(map(hash, (frozenset(frozenset(step) for step in s) for s in everything))),
+                         sorted(map(hash, keys)))
+
+
+def _placed_pieces(solution, count):
+    """ The first count pieces of a solution as (piece name, cells) pairs. """
+    placed = []
+    for step in sorted(solution, key=sorted)[:count]:
+        name = next(label for label in step if label.startswith("piece_"))
+        cells = [tuple(map(int, label.split("_")[1:])) for label in step if label.startswith("cell_")]
+        placed.append((name, cells))
+    return placed
+
+
+class TestComplete(unittest.TestCase):
+    def setUp(self):
+        self.solver = CalenderSolver(2025, Month.APR, 25, DayOfWeek.FRI, engine="bitboard")
+        _, self.all_solutions = self.solver.solve_exact_cover()
+
+    def test_complete(self):
+        """
+        Test that the completions of a partial solution are the solutions containing it.
+        """
+        for count in (0, 3, 9):
+            placed = _placed_pieces(self.all_solutions[0], count)
+            steps = [{name} | {f"cell_{row}_{col}" for row, col in cells} for name, cells in placed]
+            expected = [s for s in self.all_solutions if all(step in s for step in steps)]
+
+            first, completions = self.solver.complete(placed)
+            self.assertEqual(sorted(map(sorted, map(sorted, completions))), sorted(map(sorted, map(sorted, expected))))
+            self.assertIn(first, completions)
+            self.assertIn(self.solver.complete(placed, first_solution_only=True)[0], expected)
+
+    def test_complete_invalid(self):
+        """
+        Test that unknown pieces, overlaps and cells that are not a placement are rejected.
+        """
+        (name, cells), = _placed_pieces(self.all_solutions[0], 1)
+        invalid = [
+            [("piece_hexagon", cells)],
+            [(name, cells), (name, cells)],
+            [(name, cells[1:])],
+            [(name, [(7, 0)] + cells[1:])],
+        ]
+        for placed in invalid:
+            with self.assertRaises(ValueError):
+                self.solver.complete(placed)
+
+
+if __name__ == "__main__":
+    unittest.main()
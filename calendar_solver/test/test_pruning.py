@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from calendar_solver.calendar_solver.calendar_solver import CalenderSolver
+from calendar_solver.calendar_solver.util import DayOfWeek, Month
+from calendar_solver.calendar_solver.variant import Variant
+
+
+class TestDeadRegionPruner(unittest.TestCase):
+    def setUp(self):
+        self.solver = CalenderSolver(2025, Month.DEC, 31, DayOfWeek.SAT, engine="bitboard", prune=True)
+        self.pruner = self.solver.pruner
+
+    def _mask(self, *cells):
+        mask = 0
+        for cell in cells:
+            mask |= 1 << self.solver.placement_index.cell_column[cell]
+        return mask
+
+    def test_isolated_cell(self):
+        """
+        Test that a single free cell in a corner is dead.
+        """
+        placed = self._mask((0, 1), (1, 0), (1, 1))
+        self.assertTrue(self.pruner.is_dead(placed, placed))
+
+    def test_fillable_pocket(self):
+        """
+        Test that a pocket one remaining piece fits in is kept.
+        """
+        # cells (0, 0) to (0, 3) stay free, the size of lowercase_l
+        placed = self._mask((0, 4), (0, 5), *((1, col) for col in range(4)))
+        self.assertFalse(self.pruner.is_dead(placed, placed))
+
+        # without any piece of four cells left the pocket is dead
+        four_cell_pieces = ("small_L_tetromino", "lowercase_l_tetromino", "small_z_tetromino")
+        for name in four_cell_pieces:
+            placed |= 1 << self.solver.placement_index.piece_column[name]
+        self.assertTrue(self.pruner.is_dead(placed, placed))
+
+    def test_same_solutions(self):
+        """
+        Test that pruning never loses a solution.
+        """
+        for engine in ("dlx", "bitboard"):
+            with self.subTest(engine=engine):
+                plain = CalenderSolver(2025, Month.DEC, 31, DayOfWeek.SAT, engine=engine)
+                pruned = CalenderSolver(2025, Month.DEC, 31, DayOfWeek.SAT, engine=engine, prune=True)
+
+                keys = [sorted(map(sorted, solution)) for solution in plain.solve_exact_cover()[1]]
+                pruned_keys = [sorted(map(sorted, solution)) for solution in pruned.solve_exact_cover()[1]]
+                self.assertEqual(sorted(keys), sorted(pruned_keys))
+
+    def test_pieces_fill_every_size(self):
+        """
+        Test pruning with pieces that can fill a region of any size.
+        """
+        variant = Variant(
+            "small_pieces",
+            [["JAN", 1, "SUN"], ["a", "b", "c"], ["d", "e", "f"]],
+            {
+                "monomino": {"name": "m", "shape": [[1]]},
+                "domino": {"name": "d", "shape": [[1, 1]]},
+                "tromino": {"name": "t", "shape": [[1, 1, 1]]},
+            },
+        )
+        # compile the variant outside of the package data
+        with tempfile.TemporaryDirectory() as index_dir, \
+                mock.patch.dict(os.environ, {"SOLVER_INDEX_DIR": index_dir}):
+            plain = CalenderSolver(2025, Month.JAN, 1, DayOfWeek.SUN, variant=variant)
+            pruned = CalenderSolver(2025, Month.JAN, 1, DayOfWeek.SUN, variant=variant, prune=True)
+
+        keys = [sorted(map(sorted, solution)) for solution in plain.solve_exact_cover()[1]]
+        pruned_keys = [sorted(map(sorted, solution)) for solution in pruned.solve_exact_cover()[1]]
+        self.assertTrue(keys)
+        self.assertEqual(sorted(keys), sorted(pruned_keys))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import threading
+import unittest
+
+from calendar_solver.server.result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    def test_hit_and_eviction(self):
+        """
+        Test that hits skip the computation and the least recently used entry is evicted.
+        """
+        cache = ResultCache(maxsize=2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        self.assertEqual(cache.get_or_compute("a", lambda: None), 1)
+        cache.get_or_compute("c", lambda: 3)
+
+        self.assertEqual(cache.get_or_compute("b", lambda: 4), 4)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 4, 2))
+
+    def test_ttl(self):
+        """
+        Test that expired entries are computed again.
+        """
+        now = [0.0]
+        cache = ResultCache(ttl=10, clock=lambda: now[0])
+        cache.get_or_compute("a", lambda: 1)
+        now[0] = 11.0
+
+        self.assertEqual(cache.get_or_compute("a", lambda: 2), 2)
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_errors_are_not_cached(self):
+        """
+        Test that a failed computation is retried by the next caller.
+        """
+        cache = ResultCache()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_compute("a", fail)
+        self.assertEqual(cache.get_or_compute("a", lambda: 1), 1)
+
+    def test_concurrent_misses_are_coalesced(self):
+        """
+        Test that concurrent misses for a key share a single computation.
+        """
+        cache = ResultCache()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return "value"
+
+        results = []
+        owner = threading.Thread(target=lambda: results.append(cache.get_or_compute("a", compute)))
+        owner.start()
+        started.wait()
+
+        waiters = [threading.Thread(target=lambda: results.append(cache.get_or_compute("a", compute)))
+                   for _ in range(3)]
+        for waiter in waiters:
+            waiter.start()
+        while cache.stats()["coalesced"] < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in [owner] + waiters:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from calendar_solver.calendar_solver.calendar_solver import CalenderSolver
+from calendar_solver.calendar_solver.search_stats import SearchStats
+from calendar_solver.calendar_solver.util import DayOfWeek, Month
+
+
+class TestSearchStats(unittest.TestCase):
+    def test_record_node(self):
+        """
+        Test the node, backtrack and branching counters.
+        """
+        stats = SearchStats()
+        stats.record_node(0, 2)
+        stats.record_node(1, 0)
+        stats.record_node(1, 3)
+
+        self.assertEqual((stats.nodes, stats.backtracks, stats.max_depth), (3, 1, 1))
+        self.assertEqual(stats.branching_factor, [2.0, 1.5])
+
+    def test_merge(self):
+        """
+        Test that merging adds the counters and keeps the deepest depth.
+        """
+        first, second = SearchStats(), SearchStats()
+        first.record_node(0, 1)
+        second.record_node(2, 4)
+        second.add_phase("search", 1.0)
+        first.merge(second)
+
+        self.assertEqual((first.nodes, first.max_depth), (2, 2))
+        self.assertEqual(first.level_nodes, [1, 0, 1])
+        self.assertEqual(first.phases, {"search": 1.0})
+
+    def test_solve_exact_cover(self):
+        """
+        Test that every engine reports its search.
+        """
+        for engine in ("dlx", "bitboard"):
+            with self.subTest(engine=engine):
+                stats = SearchStats()
+                solver = CalenderSolver(2025, Month.APR, 25, DayOfWeek.FRI, engine=engine)
+                _, all_solutions = solver.solve_exact_cover(stats=stats)
+
+                self.assertEqual(stats.solutions, len(all_solutions))
+                self.assertEqual(stats.placements, len(solver.rows))
+                self.assertEqual(stats.max_depth, 9)
+                self.assertGreater(stats.backtracks, 0)
+                self.assertEqual(set(stats.phases), {"build", "construct", "search", "format"})
+
+
+if __name__ == "__main__":
+    unittest.main()
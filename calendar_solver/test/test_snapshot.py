@@ -0,0 +1,59 @@
+import os
+import pickle
+import tempfile
+import unittest
+from datetime import date
+
+from calendar_solver.calendar_solver.calendar_solver import (
+    CalenderSolver, get_placement_index)
+from calendar_solver.calendar_solver.snapshot import (build_snapshot,
+                                                      load_snapshot)
+from calendar_solver.calendar_solver.util import DayOfWeek, Month
+
+
+def _solution_key(solution):
+    return sorted(sorted(step) for step in solution)
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "startup_snapshot.pickle")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_load(self):
+        """
+        Test that a snapshot holds every solution of its dates and shares its placements.
+        """
+        self.assertEqual(build_snapshot(self.path, date(2025, 4, 25), days=2), 2)
+        snapshot = load_snapshot(self.path)
+
+        self.assertIs(get_placement_index(), snapshot.index)
+        self.assertEqual(snapshot.index.rows, CalenderSolver(2025, Month.APR, 25, DayOfWeek.FRI).placement_index.rows)
+
+        first, all_solutions = CalenderSolver(2025, Month.APR, 25, DayOfWeek.FRI, engine="bitboard").solve_exact_cover()
+        solutions = snapshot.lookup(Month.APR, 25, DayOfWeek.FRI)
+        self.assertEqual(solutions, [_solution_key(solution) for solution in all_solutions])
+        self.assertEqual(solutions[0], _solution_key(first))
+        self.assertIsNotNone(snapshot.lookup(Month.APR, 26, DayOfWeek.SAT))
+        self.assertIsNone(snapshot.lookup(Month.APR, 27, DayOfWeek.SUN))
+
+    def test_stale(self):
+        """
+        Test that a missing, corrupt or outdated snapshot is not loaded.
+        """
+        self.assertIsNone(load_snapshot(self.path))
+
+        with open(self.path, "wb") as f:
+            f.write(b"not a snapshot")
+        self.assertIsNone(load_snapshot(self.path))
+
+        with open(self.path, "wb") as f:
+            pickle.dump({"version": 0}, f)
+        self.assertIsNone(load_snapshot(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from calendar_solver.calendar_solver.calendar_solver import (
+    CalenderSolver, get_placement_index)
+from calendar_solver.calendar_solver.solution_store import (
+    SolutionStore, build_solution_store, load_solution_store)
+from calendar_solver.calendar_solver.util import DayOfWeek, Month
+
+TRIPLES = [
+    (Month.APR, 25, DayOfWeek.FRI),
+    (Month.DEC, 31, DayOfWeek.SAT),
+    (Month.JAN, 27, DayOfWeek.MON),
+]
+
+
+def _solution_key(solution):
+    return sorted(sorted(step) for step in solution)
+
+
+class TestSolutionStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmpdir.name, "all_solutions.bin")
+        cls.written = build_solution_store(cls.path, workers=1, triples=TRIPLES)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        self.store = load_solution_store(self.path)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_lookup(self):
+        """
+        Test that the stored solutions are the ones of a live search.
+        """
+        total = 0
+        for triple in TRIPLES:
+            with self.subTest(triple=triple):
+                _, expected = CalenderSolver(2024, *triple).solve_exact_cover()
+                solutions = self.store.lookup(*triple)
+                self.assertEqual(sorted(map(_solution_key, solutions)), sorted(map(_solution_key, expected)))
+                self.assertEqual(self.store.count(*triple), len(expected))
+                total += len(expected)
+        self.assertEqual(self.written, total)
+
+    def test_one_byte_per_piece(self):
+        """
+        Test that a solution takes one byte per piece.
+        """
+        triple = (Month.DEC, 31, DayOfWeek.SAT)
+        self.assertEqual(len(self.store.solutions(*triple)), self.store.count(*triple) * 10)
+
+    def test_not_stored(self):
+        """
+        Test that skipped triples are told apart from triples without solutions.
+        """
+        self.assertEqual(len(self.store), len(TRIPLES))
+        self.assertEqual(self.store.lookup(Month.JAN, 27, DayOfWeek.MON), [])
+        self.assertIsNone(self.store.lookup(Month.MAY, 1, DayOfWeek.SUN))
+        self.assertIsNone(self.store.count(Month.MAY, 1, DayOfWeek.SUN))
+
+    def test_stale_store(self):
+        """
+        Test that a store is not used with a different placement index.
+        """
+        with self.assertRaises(ValueError):
+            SolutionStore(self.path, get_placement_index(flips=True))
+        self.assertIsNone(load_solution_store(os.path.join(self.tmpdir.name, "missing.bin")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+import unittest
+
+from calendar_solver.calendar_solver.solution_table import (
+    TABLE_VERSION, _solve_triple, load_solution_table, puzzle_fingerprint,
+    table_key)
+from calendar_solver.calendar_solver.util import DayOfWeek, Month
+
+
+class TestSolutionTable(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "table.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, table):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(table, f)
+
+    def test_lookup(self):
+        """
+        Test that a solved triple is served from the table.
+        """
+        key, rows = _solve_triple((Month.APR, 25, DayOfWeek.FRI))
+        self._write({"version": TABLE_VERSION, "fingerprint": puzzle_fingerprint(), "solutions": {key: rows}})
+
+        table = load_solution_table(self.path)
+        self.assertEqual(table.lookup(Month.APR, 25, DayOfWeek.FRI), rows)
+        self.assertIsNone(table.lookup(Month.APR, 26, DayOfWeek.SAT))
+        self.assertEqual(len(rows), 10)
+
+    def test_missing_table(self):
+        """
+        Test that a missing table is not loaded.
+        """
+        self.assertIsNone(load_solution_table(self.path))
+
+    def test_stale_table(self):
+        """
+        Test that a table built for another puzzle definition is not loaded.
+        """
+        key = table_key(Month.APR, 25, DayOfWeek.FRI)
+        self._write({"version": TABLE_VERSION, "fingerprint": "stale", "solutions": {key: []}})
+        self.assertIsNone(load_solution_table(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 
-from CalendarTetrominoPuzzle.calendar_solver.calendar_solver.tetromino import (
-    InvalidShapeError, Shape, tetromino)
+from calendar_solver.calendar_solver.tetromino import InvalidShapeError, Shape
+from calendar_solver.calendar_solver.tetromino import Tetromino as tetromino
 
 
 class Testtetromino(unittest.TestCase):
@@ -193,6 +193,66 @@ class Testtetromino(unittest.TestCase):
         expected_shape = [[1, 1], [1, 1], [1, 0]]
         self.assertEqual(self.p_tetromino.shape.shape, expected_shape)
         
+    def test_orientations(self):
+        """
+        Test that symmetric pieces only have their distinct orientations.
+        """
+        expected = {
+            "small_L_tetromino": (4, 8),
+            "symmetrical_L_tetromino": (4, 4),
+            "lowercase_l_tetromino": (2, 2),
+            "small_z_tetromino": (2, 4),
+            "z_tetromino": (2, 4),
+            "t_tetromino": (4, 4),
+        }
+        for name, (rotations, with_flips) in expected.items():
+            with self.subTest(tetromino=name):
+                tetromino = self.tetrominos[name]
+                self.assertEqual(len(tetromino.orientations()), rotations)
+                self.assertEqual(len(tetromino.orientations(flips=True)), with_flips)
+
+                cells = [shape.cells() for shape in tetromino.orientations(flips=True)]
+                self.assertEqual(len(cells), len(set(cells)))
+                self.assertEqual(cells[0], tetromino.shape.cells())
+
+    def test_immutable(self):
+        """
+        Test that shapes and tetrominos cannot be changed by assignment.
+        """
+        small_L_tetromino = self.tetrominos["small_L_tetromino"]
+        with self.assertRaises(AttributeError):
+            small_L_tetromino.shape.width = 3
+        with self.assertRaises(AttributeError):
+            small_L_tetromino.name = "bL"
+        with self.assertRaises(AttributeError):
+            small_L_tetromino.color = "red"
+
+        small_L_tetromino.shape.shape[0][1] = 1
+        self.assertEqual(small_L_tetromino.shape.shape, [[1, 0], [1, 0], [1, 1]])
+
+    def test_rotation_cache(self):
+        """
+        Test that rotations are built once and cycle back to the same shape.
+        """
+        shape = self.tetrominos["t_tetromino"].shape
+        self.assertIs(shape.rotate(), shape.rotate())
+        self.assertIs(shape.rotate().rotate().rotate().rotate(), shape)
+        self.assertEqual(shape.mask, 0b010010111)
+
+    def test_hash(self):
+        """
+        Test that a tetromino keeps its hash and equality when it is rotated.
+        """
+        p_tetromino = self.tetrominos["p_tetromino"]
+        turned = p_tetromino.rotated(90)
+        self.assertEqual(p_tetromino.shape.shape, [[1, 1], [1, 1], [1, 0]])
+        self.assertEqual(turned.shape.shape, [[1, 1, 1], [0, 1, 1]])
+
+        self.assertEqual(turned, p_tetromino)
+        self.assertEqual(hash(turned), hash(p_tetromino))
+        self.assertEqual(len({p_tetromino, turned, self.tetrominos["t_tetromino"]}), 2)
+        self.assertEqual(Shape(2, 1, [[1, 1]]), Shape(2, 1, [[1, 1]]))
+
     def test_invalid_shape(self):
         """
         Test that an invalid shape raises an InvalidShapeError.
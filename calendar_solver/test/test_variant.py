@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from calendar_solver.calendar_solver.calendar_solver import (
+    CalenderGrid, CalenderSolver, get_placement_index)
+from calendar_solver.calendar_solver.util import DayOfWeek, Month
+from calendar_solver.calendar_solver.variant import (Variant, compile_variant,
+                                                     load_variants)
+
+# a 2 x 4 board whose free cells only fit a vertical domino and a tromino
+SMALL_BOARD = [["JAN", 1, "SUN", "a"], ["b", "c", "d", "e"]]
+SMALL_PIECES = {
+    "domino": {"name": "D", "shape": [[1, 1]]},
+    "tromino": {"name": "I", "shape": [[1, 1, 1]]},
+}
+
+
+def setUpModule():
+    # keep the compiled indexes of the test variants out of the package data
+    global _index_dir, _environ
+    _index_dir = tempfile.TemporaryDirectory()
+    _environ = mock.patch.dict(os.environ, {"SOLVER_INDEX_DIR": _index_dir.name})
+    _environ.start()
+
+
+def tearDownModule():
+    _environ.stop()
+    _index_dir.cleanup()
+
+
+class TestVariant(unittest.TestCase):
+    def setUp(self):
+        self.variants = load_variants()
+
+    def test_bundled_calendar(self):
+        """
+        Test that the bundled calendar variant is the built-in board.
+        """
+        variant = self.variants["calendar"]
+        grid = CalenderGrid()
+        self.assertEqual(variant.grid, grid.grid)
+        self.assertEqual(variant.grid_values, grid.grid_values)
+
+        with tempfile.TemporaryDirectory() as index_dir:
+            index = compile_variant(variant, index_dir)
+        self.assertEqual(index.rows, get_placement_index().rows)
+        self.assertEqual(index.metadata, get_placement_index().metadata)
+
+    def test_compiled_index_is_persisted(self):
+        """
+        Test that the index is written once under the fingerprint and loaded afterwards.
+        """
+        variant = self.variants["calendar_flips"]
+        with tempfile.TemporaryDirectory() as index_dir:
+            index = compile_variant(variant, index_dir)
+            path = os.path.join(index_dir, f"{variant.fingerprint}.json")
+            written = os.stat(path).st_mtime_ns
+
+            loaded = compile_variant(variant, index_dir)
+            self.assertEqual(os.stat(path).st_mtime_ns, written)
+        self.assertEqual(loaded.rows, index.rows)
+        self.assertEqual(loaded.cell_placements, index.cell_placements)
+        self.assertEqual(len(index), len(get_placement_index(flips=True)))
+
+    def test_fingerprint(self):
+        """
+        Test that the fingerprint depends on the definition, not the name.
+        """
+        variant = Variant("small", SMALL_BOARD, SMALL_PIECES)
+        self.assertEqual(Variant("renamed", SMALL_BOARD, SMALL_PIECES).fingerprint, variant.fingerprint)
+        self.assertNotEqual(Variant("small", SMALL_BOARD, SMALL_PIECES, flips=True).fingerprint, variant.fingerprint)
+
+    def test_rotations(self):
+        """
+        Test that a variant without rotations only places pieces as drawn.
+        """
+        for rotations, expected in [(True, 1), (False, 0)]:
+            with self.subTest(rotations=rotations):
+                variant = Variant("small", SMALL_BOARD, SMALL_PIECES, rotations=rotations)
+                solver = CalenderSolver(2024, Month.JAN, 1, DayOfWeek.SUN, variant=variant)
+                _, all_solutions = solver.solve_exact_cover()
+                self.assertEqual(len(all_solutions), expected)
+
+        with self.assertRaises(ValueError):
+            CalenderSolver(2024, Month.FEB, 1, DayOfWeek.SUN, variant=variant)
+
+    def test_invalid(self):
+        """
+        Test that invalid definitions are rejected.
+        """
+        with self.assertRaises(ValueError):
+            Variant("ragged", [["JAN", 1], ["SUN"]], SMALL_PIECES)
+        with self.assertRaises(ValueError):
+            Variant("duplicate", [["JAN", 1, "SUN", 1, "a", "b"]], SMALL_PIECES)
+        with self.assertRaises(ValueError):
+            Variant("crowded", [["JAN", 1, "SUN", "a"]], SMALL_PIECES)
+        with self.assertRaises(ValueError):
+            Variant("shape", SMALL_BOARD, {"bad": {"name": "B", "shape": [[1, 1], [1]]}})
+
+
+if __name__ == "__main__":
+    unittest.main()